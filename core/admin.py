@@ -8,7 +8,8 @@ from django.contrib.auth.models import User
 from .models import (
     Category, Word, UserProgress, Quiz, QuizQuestion,
     UserAchievement, UserProfile, LearningPath, LearningPathCategory,
-    LearningStep, UserStepProgress, UserCategoryProgress, GameScore
+    LearningStep, UserStepProgress, UserCategoryProgress, GameScore,
+    UserStats
 )
 
 # Admin sitesini özelleştir
@@ -58,6 +59,8 @@ class WordMasterAdminSite(AdminSite):
                     model['name'] = _('Kullanıcı Kategori İlerlemeleri')
                 elif model['object_name'] == 'GameScore':
                     model['name'] = _('Oyun Skorları')
+                elif model['object_name'] == 'UserStats':
+                    model['name'] = _('Kullanıcı İstatistikleri')
                 elif model['object_name'] == 'User':
                     model['name'] = _('Kullanıcılar')
                 elif model['object_name'] == 'Group':
@@ -257,6 +260,12 @@ class GameScoreAdmin(admin.ModelAdmin):
     search_fields = ('user__username',)
     date_hierarchy = 'date_achieved'
 
+@admin.register(UserStats)
+class UserStatsAdmin(admin.ModelAdmin):
+    list_display = ('user', 'studied_words', 'learned_words', 'mastered_words', 'to_review_words', 'updated_at')
+    search_fields = ('user__username',)
+    readonly_fields = ('studied_words', 'learned_words', 'mastered_words', 'to_review_words', 'updated_at')
+
 # Tüm modelleri özel admin sitesine kaydet
 admin_site.register(Category, CategoryAdmin)
 admin_site.register(Word, WordAdmin)
@@ -271,6 +280,7 @@ admin_site.register(QuizQuestion, QuizQuestionAdmin)
 admin_site.register(UserAchievement, UserAchievementAdmin)
 admin_site.register(UserProfile, UserProfileAdmin)
 admin_site.register(GameScore, GameScoreAdmin)
+admin_site.register(UserStats, UserStatsAdmin)
 
 # Orijinal admin sitesini de güncelle
 admin.site.site_title = _('Word Master Yönetim')
@@ -0,0 +1,21 @@
+from rest_framework.pagination import CursorPagination
+
+
+class OptionalCursorPagination(CursorPagination):
+    """
+    ID sırasına göre imleç tabanlı sayfalama; derin sayfalarda da OFFSET
+    kullanmadığı için hızlı ve kayıt eklenip silinirken kararlıdır.
+
+    Yalnızca ?cursor= veya ?page_size= gönderildiğinde devreye girer;
+    parametresiz istekler eski mobil sürümler için düz liste almaya devam eder.
+    """
+    ordering = 'id'
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
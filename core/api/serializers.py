@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from core.models import Category, Word, UserProfile, UserProgress, LearningPath, LearningStep, UserCategoryProgress, GameScore
+from core.services.progress_sync import MAX_BATCH_SIZE
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -14,19 +15,48 @@ class UserProfileSerializer(serializers.ModelSerializer):
         model = UserProfile
         fields = ['id', 'user', 'avatar', 'bio', 'level', 'experience_points', 'streak_days']
 
+def query_list_param(request, name):
+    """?name=a,b biçimindeki sorgu parametresini kümeye çevirir"""
+    if request is None:
+        return set()
+    return {value.strip() for value in request.query_params.get(name, '').split(',') if value.strip()}
+
+class DynamicFieldsMixin:
+    """
+    Okuma isteklerinde ?fields=id,english ile yalnızca istenen alanları döndürür.
+    expandable_fields içindeki iç içe alanlar sadece ?expand= ile istenirse eklenir.
+    """
+    expandable_fields = {}  # expand adı -> alan adı
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+
+        expand = query_list_param(request, 'expand')
+        for name, field_name in self.expandable_fields.items():
+            if name not in expand:
+                self.fields.pop(field_name, None)
+
+        fields = query_list_param(request, 'fields')
+        if fields and request.method in ('GET', 'HEAD'):
+            fields |= {field_name for name, field_name in self.expandable_fields.items() if name in expand}
+            for field_name in set(self.fields) - fields:
+                self.fields.pop(field_name)
+
 class CategorySerializer(serializers.ModelSerializer):
     class Meta:
         model = Category
-        fields = ['id', 'name', 'description', 'image', 'difficulty_level', 'order']
+        fields = ['id', 'name', 'description', 'image', 'difficulty_level', 'order', 'updated_at']
 
-class WordSerializer(serializers.ModelSerializer):
+class WordSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Word
         fields = ['id', 'english', 'turkish', 'definition', 'example_sentence', 
-                  'pronunciation', 'difficulty_level', 'category', 'image', 'audio']
+                  'pronunciation', 'difficulty_level', 'category', 'image', 'audio', 'updated_at']
 
-class UserProgressSerializer(serializers.ModelSerializer):
+class UserProgressSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     word_detail = WordSerializer(source='word', read_only=True)
+    expandable_fields = {'word': 'word_detail'}
     
     class Meta:
         model = UserProgress
@@ -66,6 +96,18 @@ class UserProgressSerializer(serializers.ModelSerializer):
             # Yeni kayıt oluştur
             return super().create(validated_data)
 
+class ProgressEventSerializer(serializers.Serializer):
+    """Toplu ilerleme senkronizasyonunda tek bir kelime olayı"""
+    word = serializers.IntegerField()
+    proficiency_level = serializers.IntegerField(min_value=0, max_value=5)
+    is_mastered = serializers.BooleanField(default=False)
+    times_reviewed = serializers.IntegerField(min_value=0, required=False)
+    next_review_date = serializers.DateTimeField(required=False, allow_null=True)
+    timestamp = serializers.DateTimeField()
+
+class BulkProgressSerializer(serializers.Serializer):
+    events = ProgressEventSerializer(many=True, allow_empty=False, max_length=MAX_BATCH_SIZE)
+
 class LearningPathSerializer(serializers.ModelSerializer):
     class Meta:
         model = LearningPath
@@ -118,15 +160,12 @@ class UserCategoryProgressSerializer(serializers.ModelSerializer):
             return super().create(validated_data)
 
 class GameScoreSerializer(serializers.ModelSerializer):
-    username = serializers.SerializerMethodField()
+    username = serializers.CharField(source='user.username', read_only=True)
     
     class Meta:
         model = GameScore
         fields = ['id', 'user', 'username', 'game_type', 'best_score', 'date_achieved']
         read_only_fields = ['user', 'date_achieved']
-    
-    def get_username(self, obj):
-        return obj.user.username
 
 class LoginSerializer(serializers.Serializer):
     username = serializers.CharField()
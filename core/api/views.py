@@ -1,5 +1,5 @@
 from rest_framework import viewsets, permissions, status
-from rest_framework.decorators import api_view, permission_classes, throttle_classes
+from rest_framework.decorators import action, api_view, permission_classes, throttle_classes
 from rest_framework.response import Response
 from rest_framework.authtoken.models import Token
 from rest_framework.authtoken.views import ObtainAuthToken
@@ -7,6 +7,8 @@ from rest_framework.views import APIView
 from rest_framework.throttling import UserRateThrottle, AnonRateThrottle
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
+from django.utils.http import parse_etags
+import hashlib
 import re
 import logging
 
@@ -19,8 +21,17 @@ from core.api.serializers import (
     CategorySerializer, WordSerializer, UserSerializer, UserProfileSerializer,
     UserProgressSerializer, LearningPathSerializer, LearningStepSerializer,
     UserCategoryProgressSerializer, LoginSerializer, RegisterSerializer,
-    GameScoreSerializer
+    GameScoreSerializer, BulkProgressSerializer, query_list_param
 )
+from core.api.pagination import OptionalCursorPagination
+from core.services.leaderboard import (
+    DEFAULT_WINDOW, GAME_TYPES as LEADERBOARD_GAME_TYPES, MAX_TOP_N, TOP_N, WINDOWS, get_top_scores, get_user_rank,
+    record_score
+)
+from core.services.progress_sync import apply_progress_events
+from core.services.sync import CursorExpired, changes_since
+from core.services.versions import get_versions, is_shared_cache
+from core.services.stats import progress_state, record_progress_change
 
 logger = logging.getLogger('core')
 
@@ -122,14 +133,89 @@ class LoginView(ObtainAuthToken):
                 'error': 'Kullanıcı adı veya şifre hatalı'
             }, status=status.HTTP_401_UNAUTHORIZED)
 
-class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class ConditionalGetMixin:
+    """
+    Katalog uç noktaları için ETag / If-None-Match desteği.
+
+    ETag, etag_collections sürümlerinden ve istek adresinden türetilir;
+    eşleşirse ana sorgu ve serileştirme çalışmadan 304 döner. Sürümler
+    işçiler arasında paylaşılmayan bir önbellekteyse (locmem) başka bir işçinin
+    yaptığı değişiklik görülmeyeceği için ETag üretilmez.
+    """
+    etag_collections = ()
+
+    def get_etag(self, request):
+        parts = [request.get_full_path(), request.META.get('HTTP_ACCEPT', '')]
+        parts += [str(version) for version in get_versions(*self.etag_collections)]
+        return '"%s"' % hashlib.md5('|'.join(parts).encode('utf-8')).hexdigest()
+
+    def _conditional_response(self, handler, request, *args, **kwargs):
+        if not is_shared_cache():
+            return handler(request, *args, **kwargs)
+
+        etag = self.get_etag(request)
+        if_none_match = parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+        if etag in if_none_match or '*' in if_none_match:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+            response['Cache-Control'] = 'private, no-cache'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional_response(super().retrieve, request, *args, **kwargs)
+
+class DeltaSyncMixin:
+    """
+    ?since=<imleç> verildiğinde listeyi delta senkronizasyon yanıtına çevirir:
+    {cursor, changed, deleted}. İlk senkronizasyon için since=0 gönderilir.
+    """
+    sync_model_name = None
+
+    def get_sync_scope(self):
+        """Listeyi daraltan kategori ID'si (yoksa None); taşınan kayıtlar bu kapsamda silinmiş sayılır"""
+        return None
+
+    def list(self, request, *args, **kwargs):
+        since = request.query_params.get('since')
+        if since is None:
+            return super().list(request, *args, **kwargs)
+
+        try:
+            cursor, changed, deleted = changes_since(self.filter_queryset(self.get_queryset()),
+                                                     self.sync_model_name, since, self.get_sync_scope())
+        except CursorExpired:
+            return Response(
+                {"error": "since imleci çok eski; since=0 ile tam senkronizasyon yapın", "resync": True},
+                status=status.HTTP_410_GONE
+            )
+        except (ValueError, OverflowError, OSError):
+            return Response({"error": "Geçersiz since imleci"}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'cursor': cursor,
+            'changed': self.get_serializer(changed, many=True).data,
+            'deleted': deleted,
+        })
+
+class CategoryViewSet(ConditionalGetMixin, DeltaSyncMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Category.objects.all().order_by('order', 'difficulty_level', 'name')
     serializer_class = CategorySerializer
     permission_classes = [permissions.IsAuthenticated]
+    sync_model_name = 'category'
+    etag_collections = ('category',)
 
-class WordViewSet(viewsets.ReadOnlyModelViewSet):
+class WordViewSet(ConditionalGetMixin, DeltaSyncMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = WordSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OptionalCursorPagination
+    sync_model_name = 'word'
+    etag_collections = ('word',)
     
     def get_queryset(self):
         queryset = Word.objects.all()
@@ -140,6 +226,10 @@ class WordViewSet(viewsets.ReadOnlyModelViewSet):
             queryset = queryset.filter(category_id=category_id)
         
         return queryset
+    
+    def get_sync_scope(self):
+        category_id = self.request.query_params.get('category', None)
+        return int(category_id) if category_id is not None else None
 
 class UserProfileViewSet(viewsets.ModelViewSet):
     serializer_class = UserProfileSerializer
@@ -201,9 +291,14 @@ class UserProfileViewSet(viewsets.ModelViewSet):
 class UserProgressViewSet(viewsets.ModelViewSet):
     serializer_class = UserProgressSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OptionalCursorPagination
     
     def get_queryset(self):
-        return UserProgress.objects.filter(user=self.request.user)
+        queryset = UserProgress.objects.filter(user=self.request.user)
+        # Kelime detayı sadece ?expand=word ile istenirse yüklenir
+        if 'word' in query_list_param(self.request, 'expand'):
+            queryset = queryset.select_related('word')
+        return queryset
     
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -231,13 +326,16 @@ class UserProgressViewSet(viewsets.ModelViewSet):
             # Mevcut ilerleme var mı kontrol et
             try:
                 progress = UserProgress.objects.get(user=request.user, word=word)
+                previous_state = progress_state(progress)
                 serializer = self.get_serializer(progress, data=request.data, partial=True)
             except UserProgress.DoesNotExist:
                 # Yeni ilerleme oluştur
+                previous_state = None
                 serializer = self.get_serializer(data=request.data)
             
             serializer.is_valid(raise_exception=True)
             self.perform_create(serializer)
+            record_progress_change(request.user, previous_state, progress_state(serializer.instance))
             headers = self.get_success_headers(serializer.data)
             return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
             
@@ -260,9 +358,11 @@ class UserProgressViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_403_FORBIDDEN
                 )
                 
+            previous_state = progress_state(instance)
             serializer = self.get_serializer(instance, data=request.data, partial=True)
             serializer.is_valid(raise_exception=True)
             self.perform_update(serializer)
+            record_progress_change(request.user, previous_state, progress_state(serializer.instance))
             
             return Response(serializer.data)
         except Exception as e:
@@ -272,14 +372,32 @@ class UserProgressViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-class LearningPathViewSet(viewsets.ReadOnlyModelViewSet):
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """
+        Çevrimdışı biriken ilerleme olaylarını tek istekte uygular (son yazan kazanır).
+        Yalnızca değişen kayıtları döndürür.
+        """
+        serializer = BulkProgressSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        changed, unknown = apply_progress_events(request.user, serializer.validated_data['events'])
+
+        rows = self.get_queryset().filter(word_id__in=changed)
+        return Response({
+            'changed': self.get_serializer(rows, many=True).data,
+            'unknown_words': unknown,
+        })
+
+class LearningPathViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     queryset = LearningPath.objects.all()
     serializer_class = LearningPathSerializer
     permission_classes = [permissions.IsAuthenticated]
+    etag_collections = ('learning_path',)
 
-class LearningStepViewSet(viewsets.ReadOnlyModelViewSet):
+class LearningStepViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = LearningStepSerializer
     permission_classes = [permissions.IsAuthenticated]
+    etag_collections = ('learning_step',)
     
     def get_queryset(self):
         queryset = LearningStep.objects.all()
@@ -373,56 +491,75 @@ class GameScoreViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
+        queryset = GameScore.objects.select_related('user').order_by('-best_score')
         # Oyun tipine göre filtreleme
         game_type = self.request.query_params.get('game_type', None)
         if game_type:
-            return GameScore.objects.filter(game_type=game_type).order_by('-best_score')[:10]
+            return queryset.filter(game_type=game_type)[:10]
         
         # Tüm oyun skorları
-        return GameScore.objects.all().order_by('-best_score')[:20]
+        return queryset[:20]
     
     def create(self, request, *args, **kwargs):
         """Yeni bir oyun skoru kaydeder veya mevcut skoru günceller"""
+        # Oyun tipi kontrolü
+        game_type = request.data.get('game_type')
+        if not game_type:
+            return Response(
+                {"error": "game_type parametresi gereklidir"}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if game_type not in LEADERBOARD_GAME_TYPES:
+            return Response({"error": "Geçersiz oyun türü"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Skor kontrolü
+        best_score = request.data.get('best_score')
+        if best_score is None:
+            return Response(
+                {"error": "best_score parametresi gereklidir"}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
         try:
-            # Oyun tipi kontrolü
-            game_type = request.data.get('game_type')
-            if not game_type:
-                return Response(
-                    {"error": "game_type parametresi gereklidir"}, 
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            # Skor kontrolü
-            best_score = request.data.get('best_score')
-            if best_score is None:
-                return Response(
-                    {"error": "best_score parametresi gereklidir"}, 
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            try:
-                # Mevcut en yüksek skoru bul
-                game_score = GameScore.objects.get(user=request.user, game_type=game_type)
-                
-                # Yeni skor daha yüksekse güncelle
-                if int(best_score) > game_score.best_score:
-                    game_score.best_score = best_score
-                    game_score.save()
-                    
-                serializer = self.get_serializer(game_score)
-                return Response(serializer.data, status=status.HTTP_200_OK)
-                
-            except GameScore.DoesNotExist:
-                # Yeni skor oluştur
-                serializer = self.get_serializer(data=request.data)
-                serializer.is_valid(raise_exception=True)
-                serializer.save(user=request.user)
-                
-                return Response(serializer.data, status=status.HTTP_201_CREATED)
+            best_score = int(best_score)
+        except (TypeError, ValueError):
+            return Response({"error": "best_score bir tam sayı olmalıdır"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            _, _, created = record_score(request.user, game_type, best_score)
+            game_score = GameScore.objects.select_related('user').get(user=request.user, game_type=game_type)
+            serializer = self.get_serializer(game_score)
+            return Response(serializer.data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
                 
         except Exception as e:
             logger.error(f"Oyun skoru kaydetme hatası: {str(e)}")
             return Response(
                 {"error": f"Oyun skoru kaydedilirken bir hata oluştu: {str(e)}"}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+            )
+    
+    @action(detail=False, methods=['get'])
+    def leaderboard(self, request):
+        """
+        Liderlik tablosu: ?game_type=word_hunt&window=daily|weekly|all_time&limit=10
+        İlk sıralar önbellekten gelir; 'me' kullanıcının kendi sırasıdır.
+        """
+        game_type = request.query_params.get('game_type')
+        if game_type not in LEADERBOARD_GAME_TYPES:
+            return Response({"error": "Geçersiz oyun türü"}, status=status.HTTP_400_BAD_REQUEST)
+        window = request.query_params.get('window', DEFAULT_WINDOW)
+        if window not in WINDOWS:
+            return Response(
+                {"error": f"window şunlardan biri olmalıdır: {', '.join(WINDOWS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            limit = min(max(int(request.query_params.get('limit', TOP_N)), 1), MAX_TOP_N)
+        except ValueError:
+            return Response({"error": "limit bir tam sayı olmalıdır"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'game_type': game_type,
+            'window': window,
+            'top': get_top_scores(game_type, window, limit),
+            'me': get_user_rank(request.user, game_type, window),
+        })
\ No newline at end of file
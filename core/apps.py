@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        # Model sinyallerini kaydet
+        from . import signals  # noqa: F401
+        # Yapılandırma kontrollerini kaydet
+        from . import checks  # noqa: F401
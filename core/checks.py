@@ -0,0 +1,49 @@
+"""
+Yapılandırma kontrolleri (manage.py check ve runserver başlangıcında çalışır).
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.checks import Tags, Warning, register
+
+from core.services.versions import is_shared_cache
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """Sürümlü katalog önbelleği işçiler arasında paylaşılmayan bir arka uçtaysa uyarır"""
+    if settings.DEBUG or is_shared_cache():
+        return []
+    return [
+        Warning(
+            'Varsayılan önbellek süreç içi (locmem); katalog sürümleri işçiler arasında paylaşılmaz.',
+            hint='CACHE_BACKEND=file veya CACHE_BACKEND=redis kullanın.',
+            id='core.W001',
+        )
+    ]
+
+
+@register(Tags.caches)
+def check_ai_job_store(app_configs, **kwargs):
+    """Yapay zeka işleri ve hız sınırı süreç içi önbellekteyse veya kova kilidi atomik değilse uyarır"""
+    if not getattr(settings, 'GEMINI_API_KEY', ''):
+        return []
+    if is_shared_cache():
+        if settings.DEBUG or not isinstance(caches['default'], FileBasedCache):
+            return []
+        return [
+            Warning(
+                'File önbelleğinde cache.add atomik değil; birden fazla işçi süreci yapay zeka '
+                'hız sınırı kovasının kilidini aynı anda alabilir ve limit aşılabilir.',
+                hint='Çok işçili üretim kurulumlarında CACHE_BACKEND=redis kullanın.',
+                id='core.W003',
+            )
+        ]
+    return [
+        Warning(
+            'Yapay zeka iş deposu ve hız sınırı kovası süreç içi önbellekte (locmem); '
+            'başka bir işçiye düşen durum sorguları 404 alır ve limit süreç başına uygulanır.',
+            hint='CACHE_BACKEND=file veya CACHE_BACKEND=redis kullanın.',
+            id='core.W002',
+        )
+    ]
@@ -0,0 +1,38 @@
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import ChatMessage
+from core.services.retention import archive_user_messages, get_archive_dir
+
+
+class Command(BaseCommand):
+    help = ('Eski sohbet mesajlarını kullanıcı bazında sıkıştırılmış JSONL dosyalarına arşivler ve '
+            'her kullanıcının canlı mesaj sayısını sınırlar (periyodik olarak, ör. cron ile çalıştırılır)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=getattr(settings, 'CHAT_RETENTION_DAYS', 30),
+                            help='Bu günden eski mesajlar arşivlenir')
+        parser.add_argument('--keep', type=int, default=getattr(settings, 'CHAT_LIVE_MESSAGE_LIMIT', 500),
+                            help='Kullanıcı başına canlı tabloda tutulacak en fazla mesaj')
+        parser.add_argument('--dir', default=None, help='Arşiv klasörü (varsayılan: settings.CHAT_ARCHIVE_DIR)')
+        parser.add_argument('--dry-run', action='store_true', help='Sadece arşivlenecek mesajları say')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        archive_dir = Path(options['dir']) if options['dir'] else get_archive_dir()
+
+        user_ids = ChatMessage.objects.values_list('user_id', flat=True).distinct().order_by('user_id')
+        users = total = 0
+        for user_id in user_ids.iterator():
+            count = archive_user_messages(user_id, cutoff, options['keep'], archive_dir, options['dry_run'])
+            if count:
+                users += 1
+                total += count
+                self.stdout.write(f"Kullanıcı {user_id}: {count} mesaj")
+
+        action = 'arşivlenecek' if options['dry_run'] else 'arşivlendi'
+        self.stdout.write(self.style.SUCCESS(f'{users} kullanıcıdan {total} mesaj {action} ({archive_dir})'))
@@ -0,0 +1,80 @@
+import asyncio
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from core.management.commands.fake_gemini import FakeGeminiServer, make_handler
+from core.services import ai
+from core.services.chat import CHAT_GENERATION_CONFIG
+
+PROMPT = 'benchmark ' * 200
+
+
+class Command(BaseCommand):
+    help = ('Tek bir işçi sürecinde eşzamanlı sohbet oturumlarını senkron yol (iş parçacığı başına bir istek) '
+            've async akış yolu (tek olay döngüsü) için yerel sahte Gemini sunucusuna karşı karşılaştırır')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sessions', default='10,50,200',
+                            help='Denenecek eşzamanlı oturum sayıları (virgülle ayrılmış)')
+        parser.add_argument('--sync-threads', type=int, default=4,
+                            help='Senkron işçinin iş parçacığı sayısı (ör. gunicorn --threads)')
+        parser.add_argument('--delay', type=float, default=1.0, help='Sahte modelin ilk parçaya kadar gecikmesi (saniye)')
+        parser.add_argument('--chunk-delay', type=float, default=0.02, help='Parçalar arası gecikme (saniye)')
+
+    def handle(self, *args, **options):
+        server = FakeGeminiServer(('127.0.0.1', 0), make_handler(options['delay'], options['chunk_delay']))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f'http://127.0.0.1:{server.server_address[1]}/v1beta'
+
+        self.stdout.write(f"{'oturum':>8} {'yol':>6} {'süre s':>8} {'oturum/s':>10} {'p50 s':>8} {'p95 s':>8}")
+        try:
+            with override_settings(GEMINI_API_KEY='benchmark', GEMINI_API_BASE_URL=base_url,
+                                   AI_RATE_LIMIT=10 ** 9, AI_ASYNC_MAX_CONNECTIONS=10 ** 4):
+                for sessions in sorted(int(size) for size in options['sessions'].split(',')):
+                    self._report(sessions, 'sync', *self._run_sync(sessions, options['sync_threads']))
+                    self._report(sessions, 'async', *asyncio.run(self._run_async(sessions)))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def _run_sync(self, sessions, threads):
+        def session(_):
+            start = time.perf_counter()
+            ai.generate_content(PROMPT, CHAT_GENERATION_CONFIG, max_attempts=1)
+            return time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            # Sıra bekleme süresi de oturum gecikmesine dahil
+            futures = [(time.perf_counter(), executor.submit(session, i)) for i in range(sessions)]
+            latencies = []
+            for submitted, future in futures:
+                future.result()
+                latencies.append(time.perf_counter() - submitted)
+        return time.perf_counter() - start, latencies
+
+    async def _run_async(self, sessions):
+        # ASGI işçisindeki gibi tek olay döngüsündeki tüm oturumlar aynı bağlantı havuzunu paylaşır
+        async with ai.new_async_client() as client:
+            async def session():
+                start = time.perf_counter()
+                async for _ in ai.astream_content(PROMPT, CHAT_GENERATION_CONFIG, max_attempts=1, client=client):
+                    pass
+                return time.perf_counter() - start
+
+            start = time.perf_counter()
+            latencies = await asyncio.gather(*(session() for _ in range(sessions)))
+            return time.perf_counter() - start, latencies
+
+    def _report(self, sessions, path, elapsed, latencies):
+        latencies = sorted(latencies)
+        p95 = latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)]
+        self.stdout.write(
+            f"{sessions:>8} {path:>6} {elapsed:>8.2f} {sessions / elapsed:>10.1f} "
+            f"{statistics.median(latencies):>8.2f} {p95:>8.2f}"
+        )
@@ -0,0 +1,66 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.models import Category, Word
+from core.services.sampling import get_word_ids, invalidate_word_pools, sample_words
+
+
+class Command(BaseCommand):
+    help = 'Rastgele kelime örnekleyicisini ORDER BY RANDOM() ile farklı tablo boyutlarında karşılaştırır'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1000,10000,100000',
+                            help='Ölçüm yapılacak toplam kelime sayıları (virgülle ayrılmış)')
+        parser.add_argument('--count', type=int, default=10, help='Her örneklemede seçilecek kelime sayısı')
+        parser.add_argument('--repeat', type=int, default=20, help='Her ölçümün tekrar sayısı')
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options['sizes'].split(','))
+        count = options['count']
+        repeat = options['repeat']
+
+        self.stdout.write(f"{'kelime':>10} {'order_by(?) ms':>16} {'sampler ms':>12} {'havuz kurulum ms':>18}")
+
+        # Tüm test verisi işlem sonunda geri alınır
+        with transaction.atomic():
+            category = Category.objects.create(name='__benchmark__')
+            total = Word.objects.count()
+
+            for size in sizes:
+                if size > total:
+                    Word.objects.bulk_create(
+                        [
+                            Word(english=f'bench{i}', turkish=f'bench{i}', category=category)
+                            for i in range(total, size)
+                        ],
+                        batch_size=1000
+                    )
+                    total = size
+
+                # bulk_create sinyal tetiklemediği için havuzları elle yenile
+                invalidate_word_pools()
+                started = time.perf_counter()
+                get_word_ids()
+                build_ms = (time.perf_counter() - started) * 1000
+
+                random_ms = self._measure(lambda: list(Word.objects.order_by('?')[:count]), repeat)
+                sampler_ms = self._measure(lambda: sample_words(count), repeat)
+
+                self.stdout.write(f'{total:>10} {random_ms:>16.2f} {sampler_ms:>12.2f} {build_ms:>18.2f}')
+
+            transaction.set_rollback(True)
+
+        invalidate_word_pools()
+        self.stdout.write(self.style.SUCCESS('Ölçüm tamamlandı, test verileri geri alındı.'))
+
+    def _measure(self, func, repeat):
+        """Fonksiyonun medyan çalışma süresini milisaniye cinsinden döndürür"""
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
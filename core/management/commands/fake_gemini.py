@@ -0,0 +1,91 @@
+import json
+import random
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+ENDPOINT_PATTERN = re.compile(r'/models/[^/]+:(generateContent|streamGenerateContent)$')
+
+
+def make_handler(delay=0.5, chunk_delay=0.05, error_rate=0.0, log=None):
+    """Gemini generateContent/streamGenerateContent yanıtlarını taklit eden istek işleyicisi sınıfı üretir"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            time.sleep(delay)
+
+            match = ENDPOINT_PATTERN.search(self.path.split('?')[0])
+            if not match:
+                return self._send(404, {'error': {'code': 404, 'message': 'Model bulunamadı'}})
+            if random.random() < error_rate:
+                return self._send(429, {'error': {'code': 429, 'message': 'Resource exhausted'}})
+
+            prompt = payload.get('contents', [{}])[0].get('parts', [{}])[0].get('text', '')
+            text = f"[CORRECT] Sahte yanıt ({len(prompt)} karakterlik prompt). What else would you like to talk about?"
+            if match.group(1) == 'generateContent':
+                return self._send(200, self._candidate(text))
+
+            # alt=sse: her kelime ayrı bir SSE olayı olarak gönderilir
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Connection', 'close')
+            self.end_headers()
+            for chunk in re.findall(r'\S+\s*', text):
+                self.wfile.write(f"data: {json.dumps(self._candidate(chunk))}\r\n\r\n".encode('utf-8'))
+                self.wfile.flush()
+                time.sleep(chunk_delay)
+            self.close_connection = True
+
+        def _candidate(self, text):
+            return {'candidates': [{'content': {'parts': [{'text': text}], 'role': 'model'}}]}
+
+        def _send(self, status, body):
+            data = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            if log:
+                log(format % args)
+
+    return Handler
+
+
+class FakeGeminiServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # Yük testlerinde eşzamanlı bağlantılar reddedilmesin
+
+
+class Command(BaseCommand):
+    help = ('Gemini generateContent uç noktasını taklit eden yerel bir sunucu başlatır. '
+            'GEMINI_API_BASE_URL=http://127.0.0.1:<port>/v1beta ile birlikte kullanılır')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--port', type=int, default=8765, help='Dinlenecek port')
+        parser.add_argument('--delay', type=float, default=0.5, help='Her yanıttan önceki gecikme (saniye)')
+        parser.add_argument('--chunk-delay', type=float, default=0.05,
+                            help='Akışlı yanıtta parçalar arası gecikme (saniye)')
+        parser.add_argument('--error-rate', type=float, default=0.0,
+                            help='429 döndürülecek isteklerin oranı (0-1), yeniden denemeleri sınamak için')
+
+    def handle(self, *args, **options):
+        handler = make_handler(options['delay'], options['chunk_delay'], options['error_rate'], self.stdout.write)
+        server = FakeGeminiServer(('127.0.0.1', options['port']), handler)
+        self.stdout.write(self.style.SUCCESS(
+            f"Sahte Gemini sunucusu: http://127.0.0.1:{options['port']}/v1beta (durdurmak için CTRL+C)"
+        ))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from core.services.step_templates import DEFAULT_STEPS, categories_without_steps, provision_default_steps
+
+
+class Command(BaseCommand):
+    help = ('Hiç öğrenme adımı olmayan kategorilere varsayılan adımları toplu olarak ekler '
+            '(tekrar çalıştırmak güvenlidir; yeni kategoriler için adımlar otomatik eklenir)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Sadece adımı eksik kategorileri listele')
+
+    def handle(self, *args, **options):
+        categories = list(categories_without_steps())
+        for category in categories:
+            self.stdout.write(f"{category.name} (ID: {category.id})")
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f'{len(categories)} kategoride adım eksik'))
+            return
+
+        count = provision_default_steps(categories)
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(categories)} kategori için {count} adım eklendi ({len(DEFAULT_STEPS)} adım/kategori)'
+        ))
@@ -0,0 +1,25 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.services.leaderboard import prune_periods
+
+
+class Command(BaseCommand):
+    help = ('Geçmiş günlük/haftalık liderlik tablosu satırlarını siler '
+            '(periyodik olarak, ör. cron ile çalıştırılır; tüm zamanlar skorlarına dokunmaz)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=getattr(settings, 'LEADERBOARD_PERIOD_RETENTION_DAYS', 14),
+                            help='Bu günden önce başlayan dönem satırları silinir (en az 7: içinde bulunulan hafta)')
+        parser.add_argument('--dry-run', action='store_true', help='Sadece silinecek satırları say')
+
+    def handle(self, *args, **options):
+        # İçinde bulunulan haftanın satırları hâlâ okunduğu için en az 7 gün saklanır
+        cutoff = timezone.localdate() - timedelta(days=max(options['days'], 7))
+        count = prune_periods(cutoff, options['dry_run'])
+
+        action = 'silinecek' if options['dry_run'] else 'silindi'
+        self.stdout.write(self.style.SUCCESS(f'{count} dönem satırı {action}'))
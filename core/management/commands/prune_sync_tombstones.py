@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.services.sync import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = ('Saklama süresini aşan delta senkronizasyon tombstone kayıtlarını siler '
+            '(periyodik olarak, ör. cron ile çalıştırılır; daha eski imleçler zaten 410 alır)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=getattr(settings, 'SYNC_TOMBSTONE_RETENTION_DAYS', 30),
+                            help='Bu günden eski tombstone kayıtları silinir')
+        parser.add_argument('--dry-run', action='store_true', help='Sadece silinecek kayıtları say')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        count = prune_tombstones(cutoff, options['dry_run'])
+
+        action = 'silinecek' if options['dry_run'] else 'silindi'
+        self.stdout.write(self.style.SUCCESS(f'{count} tombstone {action}'))
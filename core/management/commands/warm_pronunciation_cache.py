@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+from core.models import Word
+from core.services.pronunciation import DEFAULT_LANG, audio_key, audio_path, get_audio, get_backend, normalize_text
+
+
+class Command(BaseCommand):
+    help = 'Tüm kelimelerin (Word.english) telaffuz seslerini önceden oluşturup disk önbelleğine yazar'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lang', default=DEFAULT_LANG, help='Ses dili')
+        parser.add_argument('--slow', action='store_true', help='Yavaş telaffuz sürümünü oluştur')
+        parser.add_argument('--backend', default=None,
+                            help='TTS arka ucu (varsayılan: settings.PRONUNCIATION_TTS_BACKEND)')
+
+    def handle(self, *args, **options):
+        lang = options['lang']
+        slow = options['slow']
+        backend = import_string(options['backend'])() if options['backend'] else get_backend()
+
+        texts = {normalize_text(text) for text in Word.objects.values_list('english', flat=True)}
+        texts.discard('')
+
+        created = cached = failed = 0
+        for text in sorted(texts):
+            if audio_path(audio_key(text, lang, slow)).exists():
+                cached += 1
+                continue
+            try:
+                get_audio(text, lang, slow, backend=backend)
+                created += 1
+            except Exception as e:
+                failed += 1
+                self.stderr.write(f"Ses oluşturulamadı: {text} ({e})")
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Önbellek hazır: {created} yeni, {cached} zaten mevcut, {failed} hatalı'
+        ))
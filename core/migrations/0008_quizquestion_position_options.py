@@ -0,0 +1,44 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:05
+
+from django.db import migrations, models
+
+
+def fill_question_positions(apps, schema_editor):
+    """Mevcut quiz sorularına oluşturulma sırasına göre pozisyon ver"""
+    QuizQuestion = apps.get_model('core', 'QuizQuestion')
+    positions = {}
+    updated = []
+    for question in QuizQuestion.objects.order_by('quiz_id', 'id').only('id', 'quiz_id'):
+        positions[question.quiz_id] = positions.get(question.quiz_id, 0) + 1
+        question.position = positions[question.quiz_id]
+        updated.append(question)
+    QuizQuestion.objects.bulk_update(updated, ['position'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_userstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizquestion',
+            name='position',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='quizquestion',
+            name='options',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.RunPython(fill_question_positions, migrations.RunPython.noop),
+        migrations.AlterModelOptions(
+            name='quizquestion',
+            options={'ordering': ['position']},
+        ),
+        migrations.AlterUniqueTogether(
+            name='quizquestion',
+            unique_together={('quiz', 'position')},
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:03
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_progress_categories(apps, schema_editor):
+    """Mevcut ilerleme kayıtlarına kelimenin kategorisini yaz"""
+    UserProgress = apps.get_model('core', 'UserProgress')
+    Word = apps.get_model('core', 'Word')
+    UserProgress.objects.update(
+        category_id=models.Subquery(Word.objects.filter(pk=models.OuterRef('word_id')).values('category_id')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_chatmessage_retention'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprogress',
+            name='category',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.category'),
+        ),
+        migrations.RunPython(fill_progress_categories, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='userprogress',
+            index=models.Index(fields=['user', 'proficiency_level'], name='progress_user_level_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userprogress',
+            index=models.Index(fields=['user', 'is_mastered'], name='progress_user_mastered_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userprogress',
+            index=models.Index(fields=['user', 'last_reviewed'], name='progress_user_reviewed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userprogress',
+            index=models.Index(fields=['user', 'category', 'proficiency_level'], name='progress_user_cat_level_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:05
+
+from django.db import migrations, models
+
+
+def schedule_existing_progress(apps, schema_editor):
+    """Daha önce çalışılmış kelimeleri son tekrar zamanından itibaren tekrar kuyruğuna al"""
+    UserProgress = apps.get_model('core', 'UserProgress')
+    UserProgress.objects.filter(next_review_date__isnull=True).update(next_review_date=models.F('last_reviewed'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_userprogress_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprogress',
+            name='ease_factor',
+            field=models.FloatField(default=2.5),
+        ),
+        migrations.AddField(
+            model_name='userprogress',
+            name='review_interval',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(schedule_existing_progress, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='userprogress',
+            index=models.Index(fields=['user', 'next_review_date'], name='progress_user_due_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:07
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_userprogress_review_schedule'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userprogress',
+            name='last_reviewed',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:20
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def count_completed_steps(apps, schema_editor):
+    """Mevcut kategori ilerlemelerine tamamlanan adım sayısını yaz"""
+    UserCategoryProgress = apps.get_model('core', 'UserCategoryProgress')
+    UserStepProgress = apps.get_model('core', 'UserStepProgress')
+    completed = UserStepProgress.objects.filter(
+        user_id=models.OuterRef('user_id'),
+        learning_step__category_id=models.OuterRef('category_id'),
+        completed=True,
+    ).order_by().values('user_id').annotate(count=models.Count('id')).values('count')
+    UserCategoryProgress.objects.update(
+        completed_steps=Coalesce(models.Subquery(completed, output_field=models.IntegerField()), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_catalog_delta_sync'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usercategoryprogress',
+            name='completed_steps',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(count_completed_steps, migrations.RunPython.noop),
+    ]
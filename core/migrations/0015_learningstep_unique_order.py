@@ -0,0 +1,32 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:14
+
+from django.db import migrations
+
+
+def renumber_duplicate_steps(apps, schema_editor):
+    """Aynı kategoride aynı sıraya sahip adımları (eşzamanlı oluşturma kalıntıları) sona taşı"""
+    LearningStep = apps.get_model('core', 'LearningStep')
+    last_order = {}
+    seen = set()
+    for step in LearningStep.objects.order_by('category_id', 'order', 'id'):
+        last_order[step.category_id] = max(last_order.get(step.category_id, step.order), step.order)
+        if (step.category_id, step.order) in seen:
+            last_order[step.category_id] += 1
+            step.order = last_order[step.category_id]
+            step.save(update_fields=['order'])
+        seen.add((step.category_id, step.order))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_category_completed_steps'),
+    ]
+
+    operations = [
+        migrations.RunPython(renumber_duplicate_steps, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='learningstep',
+            unique_together={('category', 'order')},
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:16
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('core', '0015_learningstep_unique_order'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameScorePeriod',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('game_type', models.CharField(choices=[('word_hunt', 'Kelime Avı'), ('word_puzzle', 'Kelime Yapbozu'), ('speed_quiz', 'Hızlı Quiz')], max_length=20)),
+                ('period', models.CharField(choices=[('day', 'Günlük'), ('week', 'Haftalık')], max_length=10)),
+                ('period_start', models.DateField()),
+                ('best_score', models.IntegerField(default=0)),
+                ('date_achieved', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='gamescore',
+            index=models.Index(fields=['game_type', '-best_score'], name='gamescore_type_score_idx'),
+        ),
+        migrations.AddField(
+            model_name='gamescoreperiod',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='gamescoreperiod',
+            index=models.Index(fields=['game_type', 'period', 'period_start', '-best_score'], name='gamescore_period_rank_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='gamescoreperiod',
+            unique_together={('user', 'game_type', 'period', 'period_start')},
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_leaderboard'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='synctombstone',
+            name='category_id',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 class Category(models.Model):
     name = models.CharField(max_length=100)
@@ -8,6 +9,7 @@ class Category(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     difficulty_level = models.IntegerField(default=1)  # 1-5 zorluk seviyesi
     order = models.IntegerField(default=0)  # Kategorilerin sıralama düzeni
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # Mobil delta senkronizasyonu için
     # Bu alan eski MongoDB entegrasyonundan kalmıştır, şu anda kullanılmamaktadır
     mongo_id = models.CharField(max_length=24, blank=True, null=True, db_index=True)
     
@@ -34,7 +36,10 @@ class ChatMessage(models.Model):
         return f"{self.user.username} - {self.sender} - {self.timestamp.strftime('%Y-%m-%d %H:%M')}"
     
     class Meta:
-        ordering = ['timestamp']
+        # Varsayılan sıralama yok; geçmiş okumaları (user, timestamp) indeksini kullanır
+        indexes = [
+            models.Index(fields=['user', 'timestamp'], name='chatmessage_user_time_idx'),
+        ]
 
 class ChatPracticeProgress(models.Model):
     ENGLISH_LEVELS = (
@@ -76,10 +81,27 @@ class Word(models.Model):
     image = models.ImageField(upload_to='word_images/', blank=True, null=True)
     audio = models.FileField(upload_to='word_audio/', blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # Mobil delta senkronizasyonu için
     
     def __str__(self):
         return f"{self.english} - {self.turkish}"
 
+class SyncTombstone(models.Model):
+    """Silinen katalog kayıtları; mobil istemci delta senkronizasyonda yerel kopyasından siler"""
+    model_name = models.CharField(max_length=50)  # 'word' veya 'category'
+    object_id = models.IntegerField()
+    # Başka kategoriye taşınan kelimelerde eski kategori; yalnızca o kategorinin senkronizasyonunda silinir
+    category_id = models.IntegerField(null=True, blank=True)
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.model_name} #{self.object_id}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['model_name', 'deleted_at'], name='tombstone_model_time_idx'),
+        ]
+
 class LearningPath(models.Model):
     """Öğrenme yolu - kategorilerin sıralı bir şekilde öğrenilmesi"""
     name = models.CharField(max_length=100)
@@ -127,6 +149,7 @@ class LearningStep(models.Model):
     
     class Meta:
         ordering = ['category', 'order']
+        unique_together = ['category', 'order']
     
     def __str__(self):
         return f"{self.category.name} - {self.name} (Adım: {self.order})"
@@ -152,6 +175,7 @@ class UserCategoryProgress(models.Model):
     category = models.ForeignKey(Category, on_delete=models.CASCADE)
     completed = models.BooleanField(default=False)
     unlocked = models.BooleanField(default=False)
+    completed_steps = models.IntegerField(default=0)  # Tamamlanan adım sayacı (F() ile artırılır)
     score = models.IntegerField(default=0)
     max_score = models.IntegerField(default=100)
     completed_at = models.DateTimeField(null=True, blank=True)
@@ -165,17 +189,54 @@ class UserCategoryProgress(models.Model):
 class UserProgress(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='progress')
     word = models.ForeignKey(Word, on_delete=models.CASCADE, related_name='learners')
+    # Kelimenin kategorisi (Word üzerinden join yapmadan kategori ilerlemesi için denormalize edilmiştir)
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='+', null=True, blank=True, editable=False)
     proficiency_level = models.IntegerField(default=0)  # 0-5 bilme seviyesi
-    last_reviewed = models.DateTimeField(auto_now=True)
+    # save() her kayıtta şimdiki zamana çeker; toplu senkronizasyon istemci zamanını yazar
+    last_reviewed = models.DateTimeField(default=timezone.now, editable=False)
     next_review_date = models.DateTimeField(null=True, blank=True)
+    ease_factor = models.FloatField(default=2.5)  # SM-2 kolaylık katsayısı
+    review_interval = models.IntegerField(default=0)  # Gün cinsinden son tekrar aralığı
     times_reviewed = models.IntegerField(default=0)
     is_mastered = models.BooleanField(default=False)
     
     def __str__(self):
         return f"{self.user.username} - {self.word.english} - Level: {self.proficiency_level}"
     
+    def save(self, *args, **kwargs):
+        # Kategoriyi kelimeden eşitle (kelime zaten yüklüyse ek sorgu yapılmaz)
+        if self.word_id is not None and (self.category_id is None or UserProgress.word.is_cached(self)):
+            self.category_id = self.word.category_id
+        # Yeni kayıtlar hemen tekrar kuyruğuna girer
+        if self.next_review_date is None:
+            self.next_review_date = timezone.now()
+        self.last_reviewed = timezone.now()
+        super().save(*args, **kwargs)
+    
     class Meta:
         unique_together = ['user', 'word']
+        indexes = [
+            models.Index(fields=['user', 'proficiency_level'], name='progress_user_level_idx'),
+            models.Index(fields=['user', 'is_mastered'], name='progress_user_mastered_idx'),
+            models.Index(fields=['user', 'last_reviewed'], name='progress_user_reviewed_idx'),
+            models.Index(fields=['user', 'category', 'proficiency_level'], name='progress_user_cat_level_idx'),
+            models.Index(fields=['user', 'next_review_date'], name='progress_user_due_idx'),
+        ]
+
+class UserStats(models.Model):
+    """Kullanıcının kelime ilerleme özeti (UserProgress'ten türetilen denormalize tablo)"""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='stats')
+    studied_words = models.IntegerField(default=0)  # İlerleme kaydı olan kelimeler
+    learned_words = models.IntegerField(default=0)  # proficiency_level >= 3
+    mastered_words = models.IntegerField(default=0)  # is_mastered
+    to_review_words = models.IntegerField(default=0)  # proficiency_level < 3
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user.username} - Öğrenilen: {self.learned_words}"
+
+    class Meta:
+        verbose_name_plural = "User stats"
 
 class Quiz(models.Model):
     QUIZ_TYPES = (
@@ -201,11 +262,17 @@ class Quiz(models.Model):
 class QuizQuestion(models.Model):
     quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, related_name='questions')
     word = models.ForeignKey(Word, on_delete=models.CASCADE, related_name='quiz_questions')
+    position = models.PositiveIntegerField(default=0)  # Quiz içindeki soru sırası (1'den başlar)
+    options = models.JSONField(default=list, blank=True)  # Quiz oluşturulurken hazırlanan seçenekler
     is_correct = models.BooleanField(default=False)
     user_answer = models.CharField(max_length=200, blank=True, null=True)
     
     def __str__(self):
         return f"Quiz Question - {self.word.english}"
+    
+    class Meta:
+        ordering = ['position']
+        unique_together = ['quiz', 'position']
 
 class UserAchievement(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='achievements')
@@ -244,6 +311,32 @@ class GameScore(models.Model):
     
     class Meta:
         unique_together = ['user', 'game_type']
+        indexes = [
+            models.Index(fields=['game_type', '-best_score'], name='gamescore_type_score_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.get_game_type_display()} - {self.best_score}"
+
+class GameScorePeriod(models.Model):
+    """Günlük/haftalık liderlik tabloları için dönem bazında en yüksek skor (önceden toplanmış)"""
+    PERIODS = (
+        ('day', 'Günlük'),
+        ('week', 'Haftalık'),
+    )
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    game_type = models.CharField(max_length=20, choices=GameScore.GAME_TYPES)
+    period = models.CharField(max_length=10, choices=PERIODS)
+    period_start = models.DateField()
+    best_score = models.IntegerField(default=0)
+    date_achieved = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        unique_together = ['user', 'game_type', 'period', 'period_start']
+        indexes = [
+            models.Index(fields=['game_type', 'period', 'period_start', '-best_score'], name='gamescore_period_rank_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user.username} - {self.game_type} - {self.period} {self.period_start} - {self.best_score}"
@@ -0,0 +1 @@
+# Servis katmanı paket init
\ No newline at end of file
@@ -0,0 +1,382 @@
+"""
+Gemini API istemcisi ve arka plan iş zamanlayıcısı.
+
+- İstek hakları, işçi süreçler arasında paylaşılan önbellekte tutulan bir
+  token kovasından alınır (AI_RATE_WINDOW saniyede AI_RATE_LIMIT hak, sürekli
+  yenilenir). İş kayıtları da aynı önbellekte tutulur; bu yüzden birden fazla
+  işçiyle paylaşımlı bir önbellek gerekir. Kova kilidi yalnızca Redis'te atomik
+  olduğundan çok işçili üretim kurulumları için Redis önerilir (bkz. core.checks).
+- HTTP bağlantıları süreç başına tek bir requests.Session havuzunda tutulur.
+- Yapay zeka çağrıları istek iş parçacığında değil, sınırlı bir kuyruğa sahip
+  iş havuzunda çalışır; görünümler iş kimliği döndürür ve sonuç
+  `get_job` ile sorgulanır.
+- ASGI altında `astream_content` yanıtı httpx ile parça parça akıtır;
+  tek bir olay döngüsü çok sayıda eşzamanlı sohbeti bekletmeden taşır.
+"""
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from requests.adapters import HTTPAdapter
+
+from core.services.locks import cache_lock
+
+logger = logging.getLogger(__name__)
+
+# Sırasıyla denenecek modeller (404 dönen model atlanır)
+ALTERNATIVE_MODELS = [
+    'gemini-1.5-flash-latest',
+    'gemini-1.0-pro-vision-latest',
+    'gemini-1.5-pro-latest',
+]
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+JOB_TIMEOUT = 60 * 10  # İş sonuçları 10 dakika saklanır
+
+
+class QueueFull(Exception):
+    """Yapay zeka iş kuyruğu dolu olduğunda fırlatılır"""
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def is_configured():
+    return bool(_setting('GEMINI_API_KEY', ''))
+
+
+# --- Paylaşımlı token kovası ---
+
+BUCKET_KEY = 'ai:bucket'
+BUCKET_LOCK_KEY = 'ai:bucket:lock'
+BUCKET_LOCK_TIMEOUT = 5  # Kilidi alan süreç çökerse kilit bu kadar saniye sonra düşer
+BUCKET_LOCK_ATTEMPTS = 5
+
+
+def _refill(tokens, updated_at, now, capacity, rate):
+    """Geçen süre boyunca dolan hakları ekler; kova kapasiteyi aşmaz"""
+    return min(capacity, tokens + max(now - updated_at, 0) * rate)
+
+
+def acquire_token():
+    """
+    Kovadan bir istek hakkı almaya çalışır.
+
+    Kova en fazla AI_RATE_LIMIT hak tutar ve AI_RATE_WINDOW saniyede bir
+    tamamen dolacak hızla sürekli yenilenir; böylece pencere sınırlarında iki
+    katı istek geçmez. Hak alındıysa 0, alınamadıysa bir sonraki hak için
+    beklenecek süreyi (saniye) döndürür. Kova durumu paylaşımlı önbellekte kısa
+    bir kilitle (bkz. core.services.locks) güncellenir; kilit yalnızca Redis'te
+    süreçler arasında atomik olduğundan çok işçili kurulumlarda limitin kesin
+    uygulanması için CACHE_BACKEND=redis gerekir.
+    """
+    capacity = _setting('AI_RATE_LIMIT', 20)
+    window = _setting('AI_RATE_WINDOW', 60)
+    rate = capacity / window
+
+    with cache_lock(BUCKET_LOCK_KEY, BUCKET_LOCK_TIMEOUT, attempts=BUCKET_LOCK_ATTEMPTS) as locked:
+        if not locked:
+            # Kilit başka bir süreçte; kısa bir süre sonra tekrar denenir
+            return 0.05
+        now = time.time()
+        tokens, updated_at = cache.get(BUCKET_KEY, (capacity, now))
+        tokens = _refill(tokens, updated_at, now, capacity, rate)
+        if tokens >= 1:
+            tokens -= 1
+            wait = 0
+        else:
+            wait = (1 - tokens) / rate
+        cache.set(BUCKET_KEY, (tokens, now), window * 2)
+        return wait
+
+
+def wait_for_token(max_wait):
+    """En fazla max_wait saniye boyunca hak bekler; hak alındıysa True döndürür"""
+    deadline = time.monotonic() + max_wait
+    while True:
+        wait = acquire_token()
+        if not wait:
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(wait, remaining, 1.0) * random.uniform(0.8, 1.2))
+
+
+# --- Havuzlu HTTP oturumu ---
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Süreç başına paylaşılan, bağlantı havuzlu HTTP oturumunu döndürür"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=_setting('AI_WORKERS', 4) * 2)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
+
+
+def new_async_client():
+    """
+    Bağlantı havuzlu bir httpx istemcisi oluşturur; `async with` ile kullanılıp kapatılmalıdır.
+    WSGI altında her async görünüm yeni bir olay döngüsünde çalıştığı için istemci
+    döngüler arasında paylaşılmaz.
+    """
+    return httpx.AsyncClient(
+        timeout=_setting('AI_REQUEST_TIMEOUT', 30),
+        limits=httpx.Limits(max_connections=_setting('AI_ASYNC_MAX_CONNECTIONS', 200))
+    )
+
+
+def _backoff(attempt):
+    """Jitter'lı üstel bekleme süresi (saniye)"""
+    base = _setting('AI_RETRY_BACKOFF', 1.0)
+    return base * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+
+def _extract_text(data):
+    candidates = data.get('candidates') or []
+    if candidates and candidates[0].get('content'):
+        parts = candidates[0]['content'].get('parts', [])
+        if parts and 'text' in parts[0]:
+            return parts[0]['text']
+    return None
+
+
+def generate_content(prompt, generation_config, max_attempts=3, max_wait=30):
+    """
+    Gemini generateContent çağrısı yapar ve yanıt metnini döndürür.
+
+    Her deneme öncesi kovadan hak alınır (en fazla max_wait saniye beklenir).
+    429/5xx ve bağlantı hataları jitter'lı üstel beklemeyle yeniden denenir,
+    404 dönen model atlanır. Yanıt alınamazsa None döndürür.
+    """
+    api_key = _setting('GEMINI_API_KEY', '')
+    base_url = _setting('GEMINI_API_BASE_URL', 'https://generativelanguage.googleapis.com/v1beta')
+    timeout = _setting('AI_REQUEST_TIMEOUT', 30)
+    payload = {
+        'contents': [{'parts': [{'text': prompt}]}],
+        'generationConfig': generation_config,
+    }
+
+    model_index = 0
+    for attempt in range(max_attempts):
+        if not wait_for_token(max_wait):
+            logger.warning("Yapay zeka istek limiti dolu, istek gönderilmedi")
+            return None
+
+        model = ALTERNATIVE_MODELS[model_index % len(ALTERNATIVE_MODELS)]
+        try:
+            response = get_session().post(
+                f"{base_url}/models/{model}:generateContent",
+                params={'key': api_key},
+                json=payload,
+                timeout=timeout
+            )
+        except requests.RequestException as e:
+            logger.error(f"API isteği başarısız: {str(e)}")
+            response = None
+
+        if response is not None and response.status_code == 200:
+            text = _extract_text(response.json())
+            if text is not None:
+                return text.strip()
+            logger.error(f"API yanıtı geçersiz format: {response.text}")
+        elif response is not None and response.status_code == 404:
+            # Model bulunamadı, beklemeden bir sonraki modele geç
+            logger.warning(f"Model bulunamadı: {model}, bir sonraki model deneniyor...")
+            model_index += 1
+            continue
+        elif response is not None and response.status_code not in RETRY_STATUS_CODES:
+            logger.error(f"API hatası: {response.status_code} - {response.text}")
+            return None
+
+        if attempt + 1 < max_attempts:
+            time.sleep(_backoff(attempt))
+
+    return None
+
+
+async def await_token(max_wait):
+    """wait_for_token'ın olay döngüsünü bloklamayan sürümü"""
+    deadline = time.monotonic() + max_wait
+    while True:
+        wait = await sync_to_async(acquire_token, thread_sensitive=False)()
+        if not wait:
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        await asyncio.sleep(min(wait, remaining, 1.0) * random.uniform(0.8, 1.2))
+
+
+async def astream_content(prompt, generation_config, max_attempts=3, max_wait=30, client=None):
+    """
+    Gemini streamGenerateContent (SSE) çağrısı yapar ve metin parçalarını üretir.
+
+    Yeniden deneme kuralları generate_content ile aynıdır; ancak ilk parça
+    gönderildikten sonra yeniden denenmez. Yanıt alınamazsa hiçbir parça
+    üretmeden biter. client verilmezse çağrı için bir istemci açılır ve akış
+    bitince (veya yarıda bırakılınca) kapatılır; verilen istemciyi çağıran kapatır.
+    """
+    if client is None:
+        async with new_async_client() as client:
+            async for part in _astream_content(client, prompt, generation_config, max_attempts, max_wait):
+                yield part
+        return
+    async for part in _astream_content(client, prompt, generation_config, max_attempts, max_wait):
+        yield part
+
+
+async def _astream_content(client, prompt, generation_config, max_attempts, max_wait):
+    api_key = _setting('GEMINI_API_KEY', '')
+    base_url = _setting('GEMINI_API_BASE_URL', 'https://generativelanguage.googleapis.com/v1beta')
+    payload = {
+        'contents': [{'parts': [{'text': prompt}]}],
+        'generationConfig': generation_config,
+    }
+
+    model_index = 0
+    yielded = False
+    for attempt in range(max_attempts):
+        if not await await_token(max_wait):
+            logger.warning("Yapay zeka istek limiti dolu, istek gönderilmedi")
+            return
+
+        model = ALTERNATIVE_MODELS[model_index % len(ALTERNATIVE_MODELS)]
+        status_code = None
+        body = ''
+        try:
+            async with client.stream(
+                'POST',
+                f"{base_url}/models/{model}:streamGenerateContent",
+                params={'key': api_key, 'alt': 'sse'},
+                json=payload
+            ) as response:
+                status_code = response.status_code
+                if status_code == 200:
+                    async for line in response.aiter_lines():
+                        if not line.startswith('data:'):
+                            continue
+                        try:
+                            data = json.loads(line[5:])
+                        except json.JSONDecodeError:
+                            logger.warning(f"Geçersiz SSE satırı atlandı: {line[:200]}")
+                            continue
+                        text = _extract_text(data)
+                        if text:
+                            yielded = True
+                            yield text
+                    return
+                body = (await response.aread()).decode('utf-8', 'replace')
+        except httpx.HTTPError as e:
+            logger.error(f"API isteği başarısız: {str(e)}")
+            if yielded:
+                # Parçalar gönderilmeye başladıktan sonra yeniden denemek yanıtı tekrarlardı
+                return
+            if status_code == 200:
+                # Akış parça üretmeden koptu; bağlantı hatası gibi yeniden denenir
+                status_code = None
+
+        if status_code == 404:
+            logger.warning(f"Model bulunamadı: {model}, bir sonraki model deneniyor...")
+            model_index += 1
+            continue
+        if status_code is not None and status_code not in RETRY_STATUS_CODES:
+            logger.error(f"API hatası: {status_code} - {body}")
+            return
+
+        if attempt + 1 < max_attempts:
+            await asyncio.sleep(_backoff(attempt))
+
+
+async def agenerate_content(prompt, generation_config, max_attempts=3, max_wait=30):
+    """astream_content parçalarını birleştirir; yanıt yoksa None döndürür"""
+    parts = [part async for part in astream_content(prompt, generation_config, max_attempts, max_wait)]
+    return ''.join(parts).strip() or None
+
+
+# --- Sınırlı iş kuyruğu ---
+
+_executor = None
+_slots = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor, _slots
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _slots = threading.BoundedSemaphore(_setting('AI_QUEUE_SIZE', 32))
+                _executor = ThreadPoolExecutor(
+                    max_workers=_setting('AI_WORKERS', 4),
+                    thread_name_prefix='ai-worker'
+                )
+    return _executor, _slots
+
+
+def _job_key(job_id):
+    return f'ai:job:{job_id}'
+
+
+def _run_job(job_id, owner_id, func, args, slots):
+    try:
+        result = func(*args)
+        cache.set(_job_key(job_id), {'owner': owner_id, 'status': 'done', 'result': result}, JOB_TIMEOUT)
+    except Exception as e:
+        logger.error(f"Yapay zeka işi başarısız: {str(e)}")
+        cache.set(_job_key(job_id), {'owner': owner_id, 'status': 'error', 'error': str(e)}, JOB_TIMEOUT)
+    finally:
+        slots.release()
+        # İş parçacığının açtığı veritabanı bağlantısını bırak
+        close_old_connections()
+
+
+def submit_job(owner_id, func, *args):
+    """
+    func(*args) çağrısını arka plan havuzunda çalıştırır ve iş kimliğini döndürür.
+
+    Bekleyen ve çalışan işlerin toplamı AI_QUEUE_SIZE'ı aşarsa QueueFull
+    fırlatılır; istek iş parçacığı hiçbir durumda beklemez.
+    """
+    executor, slots = _get_executor()
+    if not slots.acquire(blocking=False):
+        raise QueueFull()
+
+    job_id = uuid.uuid4().hex
+    cache.set(_job_key(job_id), {'owner': owner_id, 'status': 'pending'}, JOB_TIMEOUT)
+    try:
+        executor.submit(_run_job, job_id, owner_id, func, args, slots)
+    except RuntimeError:
+        slots.release()
+        cache.delete(_job_key(job_id))
+        raise QueueFull()
+    return job_id
+
+
+def get_job(job_id, owner_id):
+    """İşin durumunu döndürür; iş yoksa veya başka kullanıcıya aitse None"""
+    job = cache.get(_job_key(job_id))
+    if not job or job.get('owner') != owner_id:
+        return None
+    return job
@@ -0,0 +1,84 @@
+"""
+Sayfalarda tekrar tekrar okunan katalog verileri (kategoriler, kelime sayısı,
+öğrenme yolları) için paylaşımlı önbellek.
+
+Girdiler sürümlü anahtarlarla tutulur (bkz. core.services.versions); ilgili
+model kaydedildiğinde veya silindiğinde anahtar değişir ve veri yeniden
+hesaplanır. Kullanıcıya özel ilerleme bilgileri önbelleğe alınmaz.
+"""
+from core.models import Category, LearningPath, LearningPathCategory, LearningStep, Word
+from core.services.versions import get_or_build
+
+
+def get_categories():
+    """İsme göre sıralı tüm kategoriler"""
+    return get_or_build('catalog:categories', ('category',), lambda: list(Category.objects.order_by('name')))
+
+
+def get_categories_by_difficulty():
+    """Zorluk seviyesi, sonra isme göre sıralı kategoriler"""
+    return sorted(get_categories(), key=lambda category: category.difficulty_level)
+
+
+def get_categories_in_order():
+    """Öğrenme panelindeki sıra: order, zorluk seviyesi, isim"""
+    return sorted(get_categories(), key=lambda category: (category.order, category.difficulty_level))
+
+
+def _build_learning_steps():
+    steps = {}
+    for step in LearningStep.objects.order_by('category_id', 'order'):
+        steps.setdefault(step.category_id, []).append(step)
+    return steps
+
+
+def get_learning_steps():
+    """Kategori ID'si -> sıralı öğrenme adımları"""
+    return get_or_build('catalog:learning_steps', ('learning_step',), _build_learning_steps)
+
+
+def get_total_words():
+    return get_or_build('catalog:total_words', ('word',), Word.objects.count)
+
+
+def _build_learning_paths():
+    category_ids = {}
+    for path_id, category_id in LearningPathCategory.objects.order_by('order').values_list('learning_path_id',
+                                                                                          'category_id'):
+        category_ids.setdefault(path_id, []).append(category_id)
+    return [(path, category_ids.get(path.id, [])) for path in LearningPath.objects.order_by('name')]
+
+
+def get_learning_paths():
+    """İsme göre sıralı (öğrenme yolu, [kategori ID'leri]) listesi"""
+    return get_or_build('catalog:learning_paths', ('learning_path', 'learning_path_category'),
+                        _build_learning_paths)
+
+
+def _build_path_successors():
+    successors = {}
+    previous_path_id = previous_category_id = None
+    rows = LearningPathCategory.objects.order_by('learning_path_id', 'order').values_list('learning_path_id',
+                                                                                        'category_id')
+    for path_id, category_id in rows:
+        successors.setdefault(category_id, [])
+        if path_id == previous_path_id:
+            successors[previous_category_id].append(category_id)
+        previous_path_id, previous_category_id = path_id, category_id
+    return successors
+
+
+def get_path_successors(category_id):
+    """
+    Kategoriden sonra gelen kategoriler (her öğrenme yolu için bir sonraki).
+    Kategori hiçbir yolda değilse None, yolun son kategorisiyse boş liste döner.
+    Yol grafiği önbellekte tutulur ve admin düzenlemelerinde yeniden kurulur.
+    """
+    return get_or_build('catalog:path_successors', ('learning_path_category',),
+                        _build_path_successors).get(category_id)
+
+
+def get_next_category_by_difficulty(category):
+    """Zorluk seviyesi daha yüksek ilk kategori"""
+    return next((item for item in get_categories_by_difficulty()
+                 if item.difficulty_level > category.difficulty_level), None)
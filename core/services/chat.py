@@ -0,0 +1,409 @@
+"""
+Yapay zeka sohbet pratiği: prompt oluşturma, yanıt değerlendirme ve ipuçları.
+
+Her kullanıcının sohbet bağlamı (son mesajlar, hazır prompt öneki, ilerleme
+sayaçları) önbellekte tutulur. Mesajlar gönderildikleri anda, değerlendirme
+sayaçları her değerlendirilen turda F() ile veritabanına yazılır; önbellekteki
+bağlam yalnızca bir kopyadır ve düşerse veritabanından yeniden kurulur.
+Aynı kullanıcının çakışan turları bağlamı kullanıcı başına bir kilitle günceller.
+"""
+import hashlib
+import threading
+from collections import OrderedDict, deque
+from functools import lru_cache
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db.models import F
+
+from core.models import ChatMessage, ChatPracticeProgress
+from core.services import ai
+from core.services.locks import cache_lock
+
+UNAVAILABLE_MESSAGE = "Üzgünüm, şu anda yapay zeka servisine erişemiyorum. Lütfen daha sonra tekrar deneyin."
+MISSING_KEY_MESSAGE = "API anahtarı eksik. Lütfen sistem yöneticisiyle iletişime geçin."
+DEFAULT_HINT = "İpucu: Soruyu dikkatlice okuyup, anahtar kelimelere odaklanın."
+
+CORRECT_TAGS = ('[DOĞRU]', '[CORRECT]')
+WRONG_TAGS = ('[YANLIŞ]', '[INCORRECT]')
+TAG_MAX_LENGTH = max(len(tag) for tag in CORRECT_TAGS + WRONG_TAGS)
+
+CHAT_GENERATION_CONFIG = {
+    "temperature": 0.7,
+    "topK": 40,
+    "topP": 0.95,
+    "maxOutputTokens": 1024,
+}
+HINT_GENERATION_CONFIG = {
+    "temperature": 0.7,
+    "maxOutputTokens": 256,
+}
+
+# Sohbet bağlamı önbelleği
+HISTORY_SIZE = 6  # Bağlamda tutulan son mesaj sayısı
+STATE_TIMEOUT = 60 * 30  # Kullanılmayan bağlam 30 dakika sonra düşer
+
+HINT_CACHE_SIZE = 2048  # Süreç başına saklanan en fazla ipucu
+
+
+@lru_cache(maxsize=None)
+def build_prompt_prefix(english_level, practice_mode):
+    """
+    Prompt'un seviye ve moda bağlı sabit kısmını oluşturur.
+    Yalnızca 6 seviye x 2 mod olduğu için sonuç süreç içinde önbelleğe alınır.
+    """
+    # Seviye açıklamaları
+    level_descriptions = {
+        'A1': 'başlangıç - temel kelimeler ve basit cümleler',
+        'A2': 'temel - günlük konuşmalar ve basit ifadeler',
+        'B1': 'orta - günlük konuşma ve genel konular',
+        'B2': 'orta-üst - akıcı konuşma ve soyut konular',
+        'C1': 'ileri - karmaşık konular ve akademik dil',
+        'C2': 'profesyonel - anadil seviyesine yakın akıcılık'
+    }
+    
+    # Kelime modu için örnek kelimeler (seviyeye göre)
+    example_words = {
+        'A1': ['cat', 'dog', 'house', 'book', 'friend', 'school', 'water', 'food'],
+        'A2': ['weather', 'hobby', 'holiday', 'travel', 'restaurant', 'shopping', 'email'],
+        'B1': ['environment', 'experience', 'technology', 'culture', 'education'],
+        'B2': ['controversy', 'perspective', 'sustainability', 'innovation', 'consequence'],
+        'C1': ['ambiguity', 'phenomenon', 'paradigm', 'discourse', 'ideology'],
+        'C2': ['nuance', 'dichotomy', 'juxtaposition', 'quintessential', 'idiosyncrasy']
+    }
+    
+    # Kullanıcı cevabını değerlendirmek için ek prompt
+    evaluation_prompt = "kelime" if practice_mode == 'kelime' else "konuşma"
+    eval_prompts = {
+        "kelime": "Kullanıcının cevabı doğru mu değerlendir. Kelimenin SADECE Türkçe anlamını sorduğunda, kullanıcı sadece Türkçe anlamını yazmışsa kabul et, cümle kurmasını ASLA isteme. Örneğin \"cat\" için \"kedi\" cevabı yeterlidir. Cevabın başında [DOĞRU] veya [YANLIŞ] etiketi kullan, ardından açıklama yap. Doğru cevaptan sonra MUTLAKA YENİ BİR KELİME sor, aynı kelime üzerinde durmaya devam etme.",
+        "konuşma": "Kullanıcının İngilizce cevabını değerlendir. Değerlendirmeni İNGİLİZCE olarak yap. Cevabın başında [CORRECT] veya [INCORRECT] etiketi kullan, ardından varsa hataları düzelt. Sonra konuşmaya İNGİLİZCE olarak devam et ve yeni bir soru sor. Kullanıcı konuşmayı bitirmek isterse o zaman Türkçe konuş."
+    }
+    
+    # Prompt oluştur
+    return f"""Sen profesyonel bir İngilizce öğretmeni ve dil arkadaşısın. Kullanıcı Türk ve İngilizce pratik yapmak istiyor.
+
+Kullanıcının İngilizce seviyesi: {english_level} ({level_descriptions.get(english_level, 'orta seviye')}).
+Uygulama modu: {practice_mode}.
+
+ÇOK ÖNEMLİ KURALLAR:
+
+1. Eğer mod "kelime" ise:
+   - İngilizce seviyeye uygun bir kelime seç. İşte {english_level} seviyesi için örnek kelimeler: {', '.join(example_words.get(english_level, example_words['B1'])[:5])}
+   - Kullanıcıya kelimenin Türkçesini sor (örnek: "What is the meaning of 'cat' in Turkish?")
+   - Kullanıcı sadece Türkçe anlamını yazdıysa (örn. "kedi") bu cevabı kabul et ve DOĞRU olarak değerlendir.
+   - ASLA kullanıcıdan cümle kurmasını isteme, sadece kelimenin anlamını sor.
+   - Doğruysa tebrik et ve HEMEN YENİ BİR KELİME sor. Aynı kelime üzerinde durmaya devam etme.
+   - Yanlışsa doğru cevabı açıkla ve yeni bir kelime sor.
+   - Her seferinde farklı kelimeler kullan, tekrar etme.
+   - Çok kısa ve öz cevaplar ver.
+
+2. Eğer mod "konuşma" ise:
+   - Seviyeye uygun günlük bir konuşma sorusu sor (İNGİLİZCE olarak).
+   - Kullanıcının verdiği İngilizce cevabı İNGİLİZCE olarak değerlendir. Değerlendirmen kısa olsun (maksimum 2 cümle).
+   - Değerlendirmeden sonra konuşmaya İNGİLİZCE olarak devam et ve yeni bir soru sor.
+   - KESİNLİKLE ŞART: Eğer kullanıcı sana bir soru sorarsa (örneğin "What about you?", "And you?", "What is your favorite color?", "peki ya sen?", "sen ne düşünüyorsun?", "senin favori rengin ne?"), MUTLAKA bu soruya İNGİLİZCE olarak cevap ver. Soruyu ASLA görmezden gelme.
+   - Kullanıcı senin favori rengin, hayvanın, yemeğin, vb. sorduğunda kesinlikle bir cevap ver. Örneğin "My favorite color is blue." gibi.
+   - Her seferinde farklı konular sor, tekrar etme.
+   - Gerçek bir konuşma gibi akıcı bir diyalog kur, sadece soru soran bir robot gibi davranma.
+   - Kullanıcı "konuşmayı bitir", "görüşürüz", "bye" gibi ifadeler kullanırsa, o zaman Türkçe konuşmaya geç ve vedalaş.
+
+{eval_prompts[evaluation_prompt]}
+
+"""
+
+
+def build_prompt(user_message, prompt_prefix):
+    """Hazır prompt önekine kullanıcının mesajını ekler"""
+    return f"""{prompt_prefix}Şimdi kullanıcının şu mesajına yanıt ver: "{user_message}"
+Cevabın 50 kelimeden az olsun."""
+
+
+class ConversationState:
+    """
+    Kullanıcının sohbet bağlamı: son mesajlar penceresi, hazır prompt öneki,
+    ilerleme sayaçları.
+    """
+
+    def __init__(self, user_id, progress, recent_messages):
+        self.user_id = user_id
+        self.progress_id = progress.id
+        self.english_level = progress.english_level
+        self.practice_mode = progress.practice_mode
+        self.prompt_prefix = build_prompt_prefix(progress.english_level, progress.practice_mode)
+        self.correct_answers = progress.correct_answers
+        self.total_attempts = progress.total_attempts
+        self.streak = progress.streak
+        self.history = deque(
+            ({'role': 'user' if sender == 'user' else 'model', 'content': text} for sender, text in recent_messages),
+            maxlen=HISTORY_SIZE
+        )
+        self.last_ai_message = next(
+            (text for sender, text in reversed(recent_messages) if sender == 'ai'), None
+        )
+
+    def add_message(self, sender, text):
+        """Mesajı gönderildiği anın zaman damgasıyla hemen kaydeder ve bağlama ekler"""
+        ChatMessage.objects.create(user_id=self.user_id, sender=sender, text=text)
+        self.history.append({'role': 'user' if sender == 'user' else 'model', 'content': text})
+        if sender == 'ai':
+            self.last_ai_message = text
+
+    def record_evaluation(self, ai_response):
+        """Yanıttaki [DOĞRU]/[YANLIŞ] etiketine göre ilerleme sayaçlarını veritabanında artırır"""
+        is_correct = any(tag in ai_response for tag in CORRECT_TAGS)
+        is_wrong = any(tag in ai_response for tag in WRONG_TAGS)
+        if not (is_correct or is_wrong):
+            return
+        
+        progress = ChatPracticeProgress.objects.filter(pk=self.progress_id)
+        progress.update(
+            total_attempts=F('total_attempts') + 1,
+            correct_answers=F('correct_answers') + int(is_correct)
+        )
+        # Çakışan turların artışları da görünsün diye güncel değerler okunur
+        counters = progress.values('correct_answers', 'total_attempts', 'streak').first()
+        if counters:
+            self.correct_answers = counters['correct_answers']
+            self.total_attempts = counters['total_attempts']
+            self.streak = counters['streak']
+
+    def progress_payload(self):
+        return {
+            'correct_answers': self.correct_answers,
+            'total_attempts': self.total_attempts,
+            'streak': self.streak
+        }
+
+
+def _state_key(user_id):
+    return f'chat:state:{user_id}'
+
+
+def load_conversation(user_id):
+    """Sohbet bağlamını önbellekten getirir; yoksa veritabanından bir kez oluşturur"""
+    state = cache.get(_state_key(user_id))
+    if state is not None:
+        return state
+    
+    progress, created = ChatPracticeProgress.objects.get_or_create(
+        user_id=user_id,
+        defaults={
+            'english_level': 'B1',
+            'practice_mode': 'konuşma'
+        }
+    )
+    recent_messages = list(
+        ChatMessage.objects.filter(user_id=user_id).order_by('-timestamp', '-id').values_list('sender', 'text')[:HISTORY_SIZE]
+    )
+    return ConversationState(user_id, progress, recent_messages[::-1])
+
+
+def save_conversation(state):
+    """Bağlamı önbelleğe yazar"""
+    cache.set(_state_key(state.user_id), state, STATE_TIMEOUT)
+
+
+def reset_conversation(user_id):
+    """Bağlamı önbellekten siler (ör. ayarlar değiştiğinde); sonraki okuma veritabanından kurulur"""
+    cache.delete(_state_key(user_id))
+
+
+def update_conversation(user_id, update):
+    """
+    Bağlamı kullanıcı başına kilit altında okur, update(state) uygular ve geri yazar.
+    Kilit alınamazsa değişiklik (veritabanına zaten yazılmış olduğu için) önbelleğe
+    yazılmaz; bağlam silinir ve bir sonraki okumada veritabanından kurulur.
+    """
+    with cache_lock(f'chat:lock:{user_id}') as locked:
+        state = load_conversation(user_id)
+        result = update(state)
+        if locked:
+            save_conversation(state)
+        else:
+            reset_conversation(user_id)
+    return state, result
+
+
+def add_ai_message(user_id, text):
+    """Yapay zekanın kendiliğinden gönderdiği mesajı (ör. karşılama) kaydeder ve bağlama ekler"""
+    state, _ = update_conversation(user_id, lambda state: state.add_message('ai', text))
+    return state
+
+
+def get_ai_response(user_message, conversation_history, prompt_prefix):
+    """Yapay zeka API'sinden yanıt al"""
+    # API anahtarı kontrolü
+    if not ai.is_configured():
+        return MISSING_KEY_MESSAGE
+    
+    response = ai.generate_content(build_prompt(user_message, prompt_prefix), CHAT_GENERATION_CONFIG)
+    return response or UNAVAILABLE_MESSAGE
+
+
+def strip_evaluation_tags(text):
+    """Değerlendirme etiketlerini yanıttan kaldırır"""
+    for tag in CORRECT_TAGS + WRONG_TAGS:
+        text = text.replace(tag, '')
+    return text
+
+
+def start_chat_turn(user_id, user_message):
+    """Kullanıcı mesajını bağlama ekler ve güncel bağlamı döndürür"""
+    state, _ = update_conversation(user_id, lambda state: state.add_message('user', user_message))
+    return state
+
+
+def finish_chat_turn(user_id, ai_response):
+    """Yapay zeka yanıtını bağlama ekler, değerlendirmeyi işler ve ilerlemeyi döndürür"""
+    def update(state):
+        state.add_message('ai', ai_response)
+        state.record_evaluation(ai_response)
+    
+    state, _ = update_conversation(user_id, update)
+    return state.progress_payload()
+
+
+def complete_chat_turn(user_id, user_message, conversation_history, prompt_prefix):
+    """
+    Bir sohbet turunu tamamlar: yapay zeka yanıtını alır, bağlama ekler ve
+    ilerlemeyi günceller. Arka plan işi olarak çalışır; sonucu JSON'a
+    çevrilebilir bir sözlük olarak döndürür.
+    """
+    ai_response = get_ai_response(user_message, conversation_history, prompt_prefix)
+    return {
+        'response': strip_evaluation_tags(ai_response),
+        'progress': finish_chat_turn(user_id, ai_response)
+    }
+
+
+def _sendable_length(visible):
+    """Sonda yarım kalmış olabilecek bir etiketi göndermemek için güvenli uzunluğu döndürür"""
+    start = visible.rfind('[', max(len(visible) - TAG_MAX_LENGTH, 0))
+    if start != -1 and ']' not in visible[start:]:
+        return start
+    return len(visible)
+
+
+async def astream_chat_turn(user_id, user_message):
+    """
+    Bir sohbet turunu ASGI altında akışlı olarak yürütür.
+
+    ('delta', metin) olaylarını yanıt geldikçe, en sonda da ('done', ilerleme)
+    olayını üretir. Değerlendirme etiketleri istemciye gönderilmez; yanıt ve
+    ilerleme akış bittiğinde bağlama eklenir.
+    """
+    state = await sync_to_async(start_chat_turn)(user_id, user_message)
+    
+    full_text = ''
+    sent = 0
+    if ai.is_configured():
+        async for chunk in ai.astream_content(build_prompt(user_message, state.prompt_prefix), CHAT_GENERATION_CONFIG):
+            full_text += chunk
+            visible = strip_evaluation_tags(full_text).lstrip()
+            end = _sendable_length(visible)
+            if end > sent:
+                yield 'delta', visible[sent:end]
+                sent = end
+        full_text = full_text.strip() or UNAVAILABLE_MESSAGE
+    else:
+        full_text = MISSING_KEY_MESSAGE
+    
+    visible = strip_evaluation_tags(full_text).lstrip()
+    if len(visible) > sent:
+        yield 'delta', visible[sent:]
+    
+    yield 'done', await sync_to_async(finish_chat_turn)(user_id, full_text)
+
+
+class HintCache:
+    """Süreç içi, boyutu sınırlı (LRU) ipucu önbelleği; isabet/ıskalama sayaçlarını tutar"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            hint = self._data.get(key)
+            if hint is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return hint
+
+    def set(self, key, hint):
+        with self._lock:
+            self._data[key] = hint
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                # En uzun süredir kullanılmayan ipucunu çıkar
+                self._data.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+hint_cache = HintCache(HINT_CACHE_SIZE)
+
+
+def hint_key(last_message, english_level, practice_mode):
+    """(son AI mesajı, seviye, mod) için normalize edilmiş özet anahtar üretir"""
+    normalized = ' '.join(strip_evaluation_tags(last_message).lower().split())
+    raw = f'{english_level}\x00{practice_mode}\x00{normalized}'
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def generate_hint(last_message, english_level, practice_mode):
+    """Son mesaja göre ipucu oluştur; aynı soru için daha önce üretilen ipucu önbellekten döner"""
+    if not ai.is_configured():
+        return "İpucu oluşturulamadı. API anahtarı eksik."
+    
+    key = hint_key(last_message, english_level, practice_mode)
+    hint = hint_cache.get(key)
+    if hint is not None:
+        return hint
+    
+    # İpucu istek iş parçacığında üretilir: tek deneme, kova boşsa beklemeden varsayılan ipucu
+    hint = ai.generate_content(_hint_prompt(last_message), HINT_GENERATION_CONFIG, max_attempts=1, max_wait=0)
+    if not hint:
+        return DEFAULT_HINT
+    hint_cache.set(key, hint)
+    return hint
+
+
+async def agenerate_hint(last_message, english_level, practice_mode):
+    """generate_hint'in async HTTP istemcisi kullanan sürümü"""
+    if not ai.is_configured():
+        return "İpucu oluşturulamadı. API anahtarı eksik."
+    
+    key = hint_key(last_message, english_level, practice_mode)
+    hint = hint_cache.get(key)
+    if hint is not None:
+        return hint
+    
+    hint = await ai.agenerate_content(_hint_prompt(last_message), HINT_GENERATION_CONFIG, max_attempts=1, max_wait=0)
+    if not hint:
+        return DEFAULT_HINT
+    hint_cache.set(key, hint)
+    return hint
+
+
+def _hint_prompt(last_message):
+    return f"""Son sorduğum soru şu: "{last_message}"
+    
+Bu soru için kullanıcıya yardımcı olacak kısa bir ipucu ver. İpucu 1-2 cümle olsun ve çok fazla bilgi vermesin, sadece yönlendirici olsun. Cevabı direkt söyleme.
+
+İpucu şöyle başlamalı: "İpucu: "
+"""
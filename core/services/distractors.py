@@ -0,0 +1,104 @@
+"""
+Çoktan seçmeli sorular için sabit yanlış seçenek (çeldirici) havuzları.
+
+Her kelimenin çeldiricileri bir kez seçilir ve kategori sürümüyle anahtarlanmış
+olarak önbelleğe yazılır. Aynı kelime tekrar sorulduğunda ek sorgu gerekmez ve
+sayfa yenilendiğinde aynı seçenekler gösterilir. Kategorideki bir kelime
+değiştiğinde kategori sürümü artırılarak havuz yenilenir; başka kategoriye
+taşınan kelimede hem eski hem yeni kategori yenilenir (bkz. core.signals).
+Kategorisi yetmediği için başka kategorilerden çeldirici ödünç alan kelimelerin
+havuzları ayrıca genel kelime havuzu sürümüyle anahtarlanır; herhangi bir
+kelime değiştiğinde veya silindiğinde onlar da yenilenir.
+"""
+import time
+
+from django.core.cache import cache
+
+from core.models import Word
+from core.services.sampling import get_pool_version, get_word_ids, sample_word_ids
+
+DISTRACTOR_COUNT = 3
+# Sinyal dışı toplu güncellemeler (queryset.update) için güvenlik sınırı
+DISTRACTOR_TIMEOUT = 60 * 60 * 24
+
+
+def _version_key(category_id):
+    return f'distractor_version:{category_id}'
+
+
+def invalidate_category_distractors(*category_ids):
+    """Kategorilerdeki tüm kelimelerin çeldirici havuzunu geçersiz kılar"""
+    now = time.time_ns()
+    cache.set_many({_version_key(category_id): now for category_id in category_ids if category_id is not None}, None)
+
+
+def _get_category_versions(category_ids):
+    """Kategori sürümlerini tek önbellek çağrısıyla döndürür, eksik olanları başlatır"""
+    keys = {category_id: _version_key(category_id) for category_id in category_ids}
+    found = cache.get_many(keys.values())
+
+    versions = {}
+    for category_id, key in keys.items():
+        if key not in found:
+            cache.add(key, time.time_ns(), None)
+            found[key] = cache.get(key)
+        versions[category_id] = found[key]
+    return versions
+
+
+def _choose_distractor_ids(word, count):
+    """Önce aynı kategoriden, yetmezse tüm kelimelerden çeldirici ID'leri seçer"""
+    ids = sample_word_ids(count, category=word.category_id, exclude_ids=[word.id])
+    if len(ids) < count:
+        ids += sample_word_ids(count - len(ids), exclude_ids=[word.id, *ids])
+    return ids
+
+
+def get_distractors(words, count=DISTRACTOR_COUNT):
+    """
+    Her kelime için sabit çeldirici listesini döndürür.
+
+    Dönüş değeri {kelime_id: [{'id', 'english', 'turkish'}, ...]} şeklindedir.
+    Önbellekte olmayan kelimelerin çeldiricileri tek bir sorguyla getirilir.
+    """
+    words = list(words)
+    if not words:
+        return {}
+
+    category_ids = {word.category_id for word in words}
+    versions = _get_category_versions(category_ids)
+    # Kendi kategorisinden yeterli çeldirici çıkmayan kelimeler tüm kelimelerden ödünç alır
+    pool_version = get_pool_version()
+    for category_id in category_ids:
+        if len(get_word_ids(category_id)) <= count:
+            versions[category_id] = f'{versions[category_id]}.{pool_version}'
+    keys = {
+        word.id: f'distractors:{word.category_id}:{versions[word.category_id]}:{count}:{word.id}'
+        for word in words
+    }
+    cached = cache.get_many(keys.values())
+
+    result = {}
+    missing = []
+    for word in words:
+        if keys[word.id] in cached:
+            result[word.id] = cached[keys[word.id]]
+        else:
+            missing.append(word)
+
+    if missing:
+        chosen = {word.id: _choose_distractor_ids(word, count) for word in missing}
+        all_ids = {word_id for ids in chosen.values() for word_id in ids}
+        rows = {
+            row['id']: row
+            for row in Word.objects.filter(id__in=all_ids).values('id', 'english', 'turkish')
+        }
+
+        to_cache = {}
+        for word in missing:
+            options = [rows[word_id] for word_id in chosen[word.id] if word_id in rows]
+            result[word.id] = options
+            to_cache[keys[word.id]] = options
+        cache.set_many(to_cache, DISTRACTOR_TIMEOUT)
+
+    return result
@@ -0,0 +1,120 @@
+"""
+Öğrenme adımı alıştırmalarının (kelime listesi ve çoktan seçmeli seçenekler)
+hazırlanması.
+
+Her (kategori, adım tipi, kelime sayısı, tohum) için alıştırma bir kez
+hesaplanır ve kelime kataloğu sürümüyle anahtarlanmış kompakt satırlar olarak
+önbelleğe yazılır. Görünüm yalnızca rastgele bir tohum seçer; kategori ne kadar
+büyük olursa olsun bir önbellek okuması ve satırların sözlüğe açılması yeterlidir.
+"""
+import random
+
+from core.models import Word
+from core.services.sampling import get_word_ids
+from core.services.versions import get_or_build
+
+# Her adım için dönüşümlü gösterilen farklı alıştırma sayısı
+EXERCISE_SEEDS = 8
+DEFAULT_WORD_COUNT = 10
+OPTION_COUNT = 4
+OPTION_STEP_TYPES = ('multiple_choice', 'final_quiz')
+
+# Kategoride hiç kelime yoksa gösterilen yedek kelimeler: (anahtar kelimeler, [(ingilizce, türkçe), ...])
+FALLBACK_WORDS = (
+    (('yiyecek', 'food'), [
+        ("apple", "elma"), ("bread", "ekmek"), ("water", "su"),
+        ("milk", "süt"), ("coffee", "kahve"), ("tea", "çay"),
+        ("egg", "yumurta"), ("cheese", "peynir"), ("meat", "et"),
+        ("chicken", "tavuk"), ("fish", "balık"), ("rice", "pirinç"),
+    ]),
+    (('hayvan', 'animal'), [
+        ("dog", "köpek"), ("cat", "kedi"), ("bird", "kuş"),
+        ("fish", "balık"), ("rabbit", "tavşan"), ("horse", "at"),
+        ("cow", "inek"), ("pig", "domuz"), ("sheep", "koyun"),
+        ("lion", "aslan"), ("tiger", "kaplan"), ("elephant", "fil"),
+    ]),
+)
+GENERAL_FALLBACK_WORDS = [
+    ("hello", "merhaba"), ("goodbye", "hoşçakal"), ("yes", "evet"),
+    ("no", "hayır"), ("thank you", "teşekkür ederim"), ("please", "lütfen"),
+    ("good", "iyi"), ("bad", "kötü"), ("big", "büyük"),
+    ("small", "küçük"), ("today", "bugün"), ("tomorrow", "yarın"),
+]
+
+FIELDS = ('id', 'english', 'turkish', 'definition', 'example_sentence', 'options')
+
+
+def _fallback_rows(category):
+    name = category.name.lower()
+    pairs = next((pairs for keywords, pairs in FALLBACK_WORDS if any(keyword in name for keyword in keywords)),
+                 GENERAL_FALLBACK_WORDS)
+    return [(f"manual_{i}", english, turkish, "", "") for i, (english, turkish) in enumerate(pairs)]
+
+
+def _word_rows(category, step_type, word_count, rng):
+    ids = get_word_ids(category)
+    if not ids:
+        return _fallback_rows(category)
+    if step_type != 'final_quiz' and len(ids) > word_count:
+        ids = rng.sample(ids, word_count)
+
+    words = Word.objects.in_bulk(ids)
+    return [
+        (str(word.id), word.english, word.turkish, word.definition or "", word.example_sentence or "")
+        for word in (words.get(word_id) for word_id in ids) if word is not None
+    ]
+
+
+def _options(index, rows, rng):
+    """
+    Doğru cevap ve diğer kelimelerden seçilen en fazla 3 yanlış seçenek.
+    Seçenek indeksleri doğrudan örneklenir; final quiz'de bile satır başına maliyet sabittir.
+    """
+    row = rows[index]
+    options = [row[2]]
+    if len(rows) >= OPTION_COUNT:
+        # Satırın kendisi de çıkabileceği için bir fazla indeks örneklenir
+        for other_index in rng.sample(range(len(rows)), OPTION_COUNT):
+            other = rows[other_index]
+            if len(options) == OPTION_COUNT or other_index == index or other[1] == row[1]:
+                continue
+            if other[2] and other[2] not in options:
+                options.append(other[2])
+    while len(options) < OPTION_COUNT:
+        options.append(f"Seçenek {len(options)}")
+    rng.shuffle(options)
+    return options
+
+
+def build_exercise(category, step_type, word_count, seed):
+    """Alıştırmayı kompakt satırlar (FIELDS sırasıyla demetler) olarak hesaplar; aynı tohum aynı sonucu verir"""
+    if step_type == 'treasure':
+        return []
+
+    rng = random.Random(f"{category.id}:{step_type}:{word_count}:{seed}")
+    rows = _word_rows(category, step_type, word_count, rng)
+    if step_type in OPTION_STEP_TYPES:
+        return [row + (_options(index, rows, rng),) for index, row in enumerate(rows)]
+    return [row + (None,) for row in rows]
+
+
+def get_exercise(category, step, seed=None):
+    """
+    Adımın alıştırma kelimelerini şablonların beklediği sözlükler olarak döndürür.
+    Tohum verilmezse EXERCISE_SEEDS varyasyonundan biri rastgele seçilir.
+    """
+    if seed is None:
+        seed = random.randrange(EXERCISE_SEEDS)
+    word_count = step.word_count if step.word_count > 0 else DEFAULT_WORD_COUNT
+
+    rows = get_or_build('exercise', ('word',),
+                        lambda: build_exercise(category, step.step_type, word_count, seed),
+                        category.id, step.step_type, word_count, seed)
+
+    words = []
+    for row in rows:
+        word = dict(zip(FIELDS, row))
+        if word['options'] is None:
+            del word['options']
+        words.append(word)
+    return words
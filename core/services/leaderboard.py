@@ -0,0 +1,140 @@
+"""
+Oyun liderlik tabloları.
+
+Tüm zamanlar tablosu GameScore'dan, günlük ve haftalık tablolar skor
+kaydedilirken güncellenen GameScorePeriod satırlarından okunur. İlk N sıra
+oyun tipi sürümüyle anahtarlanmış olarak önbellekte tutulur; kullanıcının
+kendi sırası (oyun tipi, dönem, -skor) indeksinde aralık sayımıyla bulunur.
+Geçmiş dönem satırları manage.py prune_leaderboard_periods ile silinir.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from core.models import GameScore, GameScorePeriod
+from core.services.versions import bump_versions, get_or_build
+
+GAME_TYPES = tuple(game_type for game_type, _ in GameScore.GAME_TYPES)
+# API penceresi -> GameScorePeriod.period (tüm zamanlar GameScore'dan okunur)
+WINDOWS = {'daily': 'day', 'weekly': 'week', 'all_time': None}
+DEFAULT_WINDOW = 'all_time'
+TOP_N = 10
+MAX_TOP_N = 100
+LEADERBOARD_TIMEOUT = 60 * 10
+
+
+def _collection(game_type):
+    return f'leaderboard:{game_type}'
+
+
+def period_starts(now=None):
+    """(dönem, başlangıç günü) çiftleri; haftalar pazartesi başlar"""
+    today = timezone.localdate(now or timezone.now())
+    return [('day', today), ('week', today - timedelta(days=today.weekday()))]
+
+
+def _ranked_scores(game_type, window, now=None):
+    period = WINDOWS[window]
+    if period is None:
+        return GameScore.objects.filter(game_type=game_type)
+    start = dict(period_starts(now))[period]
+    return GameScorePeriod.objects.filter(game_type=game_type, period=period, period_start=start)
+
+
+def _raise_best_score(model, lookup, score, now):
+    """
+    Satırın en yüksek skorunu koşullu UPDATE ile score'a çıkarır, satır yoksa oluşturur.
+    (rekor kırıldı mı, satır oluşturuldu mu) döndürür.
+    """
+    rows = model.objects.filter(**lookup)
+    if rows.filter(best_score__lt=score).update(best_score=score, date_achieved=now):
+        return True, False
+    try:
+        with transaction.atomic():
+            model.objects.create(best_score=score, date_achieved=now, **lookup)
+        return False, True
+    except IntegrityError:
+        # Aynı anda gelen ilk skor satırı oluşturdu; bu skoru onun üzerine uygula
+        return bool(rows.filter(best_score__lt=score).update(best_score=score, date_achieved=now)), False
+
+
+@transaction.atomic
+def record_score(user, game_type, score):
+    """
+    Skoru tüm zamanlar, günlük ve haftalık en yüksek skorlara uygular.
+    (en yüksek skor, rekor kırıldı mı, ilk skor mu) döndürür.
+    """
+    now = timezone.now()
+    improved, created = _raise_best_score(GameScore, {'user': user, 'game_type': game_type}, score, now)
+    best_score = score
+    if not (improved or created):
+        best_score = GameScore.objects.filter(user=user, game_type=game_type).values_list(
+            'best_score', flat=True
+        ).first()
+
+    changed = improved or created
+    for period, start in period_starts(now):
+        lookup = {'user': user, 'game_type': game_type, 'period': period, 'period_start': start}
+        changed = any(_raise_best_score(GameScorePeriod, lookup, score, now)) or changed
+
+    if changed:
+        transaction.on_commit(lambda: bump_versions(_collection(game_type)))
+    return best_score, improved, created
+
+
+def prune_periods(cutoff=None, dry_run=False):
+    """
+    Başlangıcı cutoff gününden önceki dönem satırlarını siler; silinen (veya silinecek)
+    satır sayısını döndürür. Yalnızca içinde bulunulan gün ve hafta okunur.
+    """
+    if cutoff is None:
+        cutoff = timezone.localdate() - timedelta(days=getattr(settings, 'LEADERBOARD_PERIOD_RETENTION_DAYS', 14))
+    rows = GameScorePeriod.objects.filter(period_start__lt=cutoff)
+    if dry_run:
+        return rows.count()
+    return rows.delete()[0]
+
+
+def _build_top_scores(game_type, window, limit):
+    rows = (
+        _ranked_scores(game_type, window)
+        .select_related('user')
+        .order_by('-best_score', 'date_achieved')[:limit]
+    )
+    top = []
+    for position, row in enumerate(rows):
+        # Eşit skorlar aynı sırayı paylaşır (1, 2, 2, 4...)
+        rank = top[-1]['rank'] if top and top[-1]['best_score'] == row.best_score else position + 1
+        top.append({
+            'rank': rank,
+            'user_id': row.user_id,
+            'username': row.user.username,
+            'best_score': row.best_score,
+            'date_achieved': row.date_achieved,
+        })
+    return top
+
+
+def get_top_scores(game_type, window=DEFAULT_WINDOW, limit=TOP_N):
+    """Önbellekten ilk `limit` sırayı döndürür; skor rekoru kırıldığında yenilenir"""
+    period_key = dict(period_starts()).get(WINDOWS[window], 'all')
+    return get_or_build('leaderboard', (_collection(game_type),),
+                        lambda: _build_top_scores(game_type, window, limit),
+                        game_type, window, period_key, limit, timeout=LEADERBOARD_TIMEOUT)
+
+
+def get_user_rank(user, game_type, window=DEFAULT_WINDOW):
+    """
+    Kullanıcının {'rank', 'best_score'} bilgisini döndürür; bu dönemde skoru yoksa None.
+    Sıra, daha yüksek skorların indeks üzerinde sayılmasıyla bulunur.
+    """
+    scores = _ranked_scores(game_type, window)
+    best_score = scores.filter(user=user).values_list('best_score', flat=True).first()
+    if best_score is None:
+        return None
+    return {
+        'rank': scores.filter(best_score__gt=best_score).count() + 1,
+        'best_score': best_score,
+    }
@@ -0,0 +1,169 @@
+"""
+Öğrenme paneli ilerleme durumu.
+
+UserCategoryProgress / UserStepProgress satırı olmayan kategori ve adımlar
+varsayılan durumdadır (tamamlanmamış, puan 0); bu yüzden okuma sayfaları hiç
+satır oluşturmaz. Satırlar yalnızca gerçek bir durum değişikliğinde
+(adım tamamlama, kilit açma) yazılır.
+
+Kategori kilidi panel sırasına göre türetilir: ilk kategori ve bir önceki
+kategorisi tamamlanmış kategoriler açıktır; tamamlama akışlarının açıkça
+açtığı kategoriler (unlocked=True) de açık sayılır.
+"""
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from core.models import UserCategoryProgress, UserStepProgress
+from core.services.catalog import get_categories_in_order, get_learning_steps
+
+
+def get_category_states(user, category_ids=None):
+    """Kategori ID'si -> UserCategoryProgress; satırı olmayan kategoriler sözlükte yer almaz"""
+    queryset = UserCategoryProgress.objects.filter(user=user)
+    if category_ids is not None:
+        queryset = queryset.filter(category_id__in=category_ids)
+    return {state.category_id: state for state in queryset}
+
+
+def get_step_states(user, step_ids=None):
+    """Adım ID'si -> UserStepProgress; satırı olmayan adımlar sözlükte yer almaz"""
+    queryset = UserStepProgress.objects.filter(user=user)
+    if step_ids is not None:
+        queryset = queryset.filter(learning_step_id__in=step_ids)
+    return {state.learning_step_id: state for state in queryset}
+
+
+def category_state(user, category, states):
+    """Kaydedilmemiş varsayılan nesneyle birlikte kategorinin durumu"""
+    return states.get(category.id) or UserCategoryProgress(user=user, category=category)
+
+
+def step_state(user, step, states):
+    return states.get(step.id) or UserStepProgress(user=user, learning_step=step)
+
+
+def _is_unlocked(state, previous_state, is_first):
+    if is_first or state.unlocked or state.completed:
+        return True
+    return previous_state is not None and previous_state.completed
+
+
+def get_category_access(user, category):
+    """Tek bir kategori için (kilit açık mı, durum) döndürür; en fazla bir sorgu çalışır"""
+    categories = get_categories_in_order()
+    index = next((i for i, item in enumerate(categories) if item.id == category.id), None)
+    previous = categories[index - 1] if index else None
+
+    states = get_category_states(user, [category.id] + ([previous.id] if previous else []))
+    state = category_state(user, category, states)
+    if index is None:
+        return state.unlocked or state.completed, state
+    return _is_unlocked(state, states.get(previous.id) if previous else None, index == 0), state
+
+
+def unlock_categories(user, category_ids):
+    """Kategorilerin kilidini kalıcı olarak açar; yalnızca kilitli/eksik satırlar yazılır"""
+    if not category_ids:
+        return
+    UserCategoryProgress.objects.filter(user=user, category_id__in=category_ids, unlocked=False).update(unlocked=True)
+    UserCategoryProgress.objects.bulk_create(
+        [UserCategoryProgress(user=user, category_id=category_id, unlocked=True) for category_id in category_ids],
+        ignore_conflicts=True,
+    )
+
+
+@transaction.atomic
+def complete_step(user, step, score=None, max_score=None):
+    """
+    Adımı tamamlanmış olarak işaretler ve kategori bu adımla tamamlandıysa True döndürür.
+
+    Adım ilk kez tamamlandığında kategorinin tamamlanan adım sayacı F() ile
+    artırılır; adım sayısı önbellekteki katalogdan gelir. Sorgu sayısı kategori
+    ve yol büyüklüğünden bağımsızdır.
+    """
+    now = timezone.now()
+    values = {key: value for key, value in (('score', score), ('max_score', max_score)) if value is not None}
+
+    steps = UserStepProgress.objects.filter(user=user, learning_step=step)
+    first_time = steps.filter(completed=False).update(completed=True, completed_at=now, **values)
+    if not first_time:
+        _, first_time = UserStepProgress.objects.get_or_create(
+            user=user, learning_step=step, defaults={'completed': True, 'completed_at': now, **values}
+        )
+        if not first_time and values:
+            steps.update(**values)
+    if not first_time:
+        return False
+
+    progress = UserCategoryProgress.objects.filter(user=user, category_id=step.category_id)
+    if not progress.update(completed_steps=F('completed_steps') + 1):
+        _, created = UserCategoryProgress.objects.get_or_create(
+            user=user, category_id=step.category_id, defaults={'completed_steps': 1, 'unlocked': True}
+        )
+        if not created:
+            progress.update(completed_steps=F('completed_steps') + 1)
+
+    total_steps = len(get_learning_steps().get(step.category_id, []))
+    return bool(progress.filter(completed=False, completed_steps__gte=total_steps).update(
+        completed=True, completed_at=now
+    ))
+
+
+def raise_category_score(user, category_id, score):
+    """Kategori puanını düşürmeden en az score'a çıkarır ve güncel puanı döndürür"""
+    progress = UserCategoryProgress.objects.filter(user=user, category_id=category_id)
+    if not progress.update(score=Greatest(F('score'), score)):
+        _, created = UserCategoryProgress.objects.get_or_create(
+            user=user, category_id=category_id, defaults={'score': score, 'unlocked': True}
+        )
+        if created:
+            return score
+        progress.update(score=Greatest(F('score'), score))
+    return progress.values_list('score', flat=True).first()
+
+
+def build_step_list(user, steps, states):
+    """Adımların durumunu sırayla hesaplar; bir adım, önceki adım tamamlanınca açılır"""
+    items = []
+    previous_completed = True
+    for step in steps:
+        state = step_state(user, step, states)
+        items.append((step, state, not previous_completed))
+        previous_completed = state.completed
+    return items
+
+
+def build_learning_panel(user):
+    """
+    Paneldeki tüm kategorilerin ve adımlarının durumunu döndürür.
+    Katalog önbellekten gelir; kullanıcı için yalnızca iki toplu sorgu çalışır.
+    """
+    categories = get_categories_in_order()
+    steps_by_category = get_learning_steps()
+    category_states = get_category_states(user)
+    step_states = get_step_states(user)
+
+    panel = []
+    previous_state = None
+    for index, category in enumerate(categories):
+        state = category_state(user, category, category_states)
+        steps = [
+            {
+                'id': step.id,
+                'name': step.name,
+                'type': step.step_type,
+                'completed': progress.completed,
+                'locked': locked,
+            }
+            for step, progress, locked in build_step_list(user, steps_by_category.get(category.id, []), step_states)
+        ]
+        panel.append({
+            'category': category,
+            'is_locked': not _is_unlocked(state, previous_state, index == 0),
+            'steps': steps,
+            'progress': state,
+        })
+        previous_state = state
+    return panel
@@ -0,0 +1,34 @@
+"""
+Paylaşımlı önbellek üzerinde kısa süreli kilitler.
+
+Kilit, benzersiz bir belirteçle cache.add ile alınır ve yalnızca belirteç hâlâ
+bizimse silinir; süresi dolup başka bir sürecin aldığı kilit serbest bırakılmaz.
+cache.add Redis ve locmem'de atomiktir; file arka ucunda (has_key + set) iki
+süreç nadiren aynı anda kilidi alabilir, bu yüzden çok işçili kurulumlarda
+Redis önerilir.
+"""
+import time
+import uuid
+from contextlib import contextmanager
+
+from django.core.cache import cache
+
+
+@contextmanager
+def cache_lock(key, timeout=5, attempts=50, delay=0.01):
+    """
+    Kilidi almaya çalışır ve alınıp alınamadığını (bool) verir.
+    Kilit alınamazsa blok yine çalışır; çağıran kod buna göre davranmalıdır.
+    """
+    token = uuid.uuid4().hex
+    acquired = False
+    for _ in range(attempts):
+        if cache.add(key, token, timeout):
+            acquired = True
+            break
+        time.sleep(delay)
+    try:
+        yield acquired
+    finally:
+        if acquired and cache.get(key) == token:
+            cache.delete(key)
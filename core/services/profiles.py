@@ -0,0 +1,39 @@
+"""
+Kullanıcı profili (deneyim puanı ve seviye) güncellemeleri.
+"""
+from django.db.models import F
+from django.utils import timezone
+
+from core.models import UserAchievement, UserProfile
+
+
+def add_experience_points(user, points):
+    """
+    Deneyim puanını F() ifadesiyle ekler ve gerekiyorsa seviye atlatır.
+
+    Seviye artışı, okunan seviyeye koşullu bir UPDATE ile yapıldığı için aynı
+    anda gelen iki istek aynı seviye atlamasını iki kez uygulayamaz.
+    Seviye atlandıysa yeni seviyeyi, aksi halde None döndürür.
+    """
+    updated = UserProfile.objects.filter(user=user).update(
+        experience_points=F('experience_points') + points,
+        last_activity=timezone.now()
+    )
+    if not updated:
+        return None
+
+    profile = UserProfile.objects.only('id', 'level', 'experience_points').get(user=user)
+    if profile.experience_points < profile.level * 100:
+        return None
+
+    leveled_up = UserProfile.objects.filter(pk=profile.pk, level=profile.level).update(level=F('level') + 1)
+    if not leveled_up:
+        return None
+
+    new_level = profile.level + 1
+    UserAchievement.objects.create(
+        user=user,
+        title=f"Seviye {new_level}'e Ulaştın!",
+        description=f"Tebrikler! Seviye {new_level}'e yükseldin."
+    )
+    return new_level
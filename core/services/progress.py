@@ -0,0 +1,59 @@
+"""
+Kullanıcı ilerleme istatistiklerini toplu sorgularla hesaplayan yardımcılar.
+"""
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from core.models import Category, UserProgress
+
+# Bir kelimenin "öğrenilmiş" sayılması için gereken minimum seviye
+LEARNED_LEVEL = 3
+
+
+def calculate_percentage(learned, total):
+    """Öğrenilen / toplam oranını tam sayı yüzde olarak döndürür"""
+    return int((learned / total * 100) if total > 0 else 0)
+
+
+def annotate_category_progress(categories, user):
+    """
+    Kategori sorgusuna (QuerySet) toplam ve öğrenilen kelime sayılarını ekler.
+
+    Öğrenilen kelimeler kullanıcıya göre filtrelenmiş ilişkili bir alt sorgu
+    ile sayıldığı için tüm tablo tek bir SQL ifadesiyle hesaplanır.
+    """
+    learned_subquery = UserProgress.objects.filter(
+        user=user,
+        category=OuterRef('pk'),
+        proficiency_level__gte=LEARNED_LEVEL
+    ).order_by().values('category').annotate(
+        count=Count('id')
+    ).values('count')
+
+    return categories.annotate(
+        total_words=Count('words', distinct=True),
+        learned_words=Coalesce(
+            Subquery(learned_subquery, output_field=IntegerField()),
+            Value(0)
+        )
+    )
+
+
+def get_category_progress(user, categories=None):
+    """
+    Her kategori için {'category', 'learned', 'total', 'percentage'} listesini döndürür.
+
+    Kategori başına ayrı COUNT sorguları yerine tek bir gruplanmış sorgu kullanır.
+    """
+    if categories is None:
+        categories = Category.objects.all()
+
+    return [
+        {
+            'category': category,
+            'learned': category.learned_words,
+            'total': category.total_words,
+            'percentage': calculate_percentage(category.learned_words, category.total_words)
+        }
+        for category in annotate_category_progress(categories, user)
+    ]
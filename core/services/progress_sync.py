@@ -0,0 +1,78 @@
+"""
+Mobil istemcinin çevrimdışı biriktirdiği kelime ilerleme olaylarını toplu uygular.
+
+Çakışmalar "son yazan kazanır" kuralıyla çözülür: bir olay, kaydın
+last_reviewed zamanından daha yeni bir istemci zamanı taşıyorsa uygulanır.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import UserProgress, Word
+from core.services.srs import DEFAULT_EASE
+from core.services.stats import progress_state, record_progress_changes
+
+MAX_BATCH_SIZE = 500
+
+SYNC_FIELDS = ('proficiency_level', 'is_mastered', 'times_reviewed', 'next_review_date')
+
+
+@transaction.atomic
+def apply_progress_events(user, events):
+    """
+    Olayları tek transaction içinde uygular ve (değişen kelime ID'leri, bilinmeyen kelime ID'leri) döndürür.
+
+    Her olay: word, proficiency_level, is_mastered, timestamp ve isteğe bağlı
+    times_reviewed / next_review_date. Aynı kelime için yalnızca en yeni olay
+    dikkate alınır; gelecekteki istemci zamanları sunucu zamanına çekilir.
+    """
+    now = timezone.now()
+    latest = {}
+    for event in events:
+        timestamp = min(event['timestamp'], now)
+        current = latest.get(event['word'])
+        if current is None or timestamp >= current[0]:
+            latest[event['word']] = (timestamp, event)
+
+    categories = dict(Word.objects.filter(id__in=latest).values_list('id', 'category_id'))
+    unknown = [word_id for word_id in latest if word_id not in categories]
+    existing = {
+        progress.word_id: progress
+        for progress in UserProgress.objects.select_for_update().filter(user=user, word_id__in=categories)
+    }
+
+    rows = []
+    changes = []
+    for word_id, (timestamp, event) in latest.items():
+        if word_id not in categories:
+            continue
+        previous = existing.get(word_id)
+        if previous is not None and previous.last_reviewed >= timestamp:
+            continue  # Sunucudaki kayıt daha yeni
+
+        row = UserProgress(
+            user=user,
+            word_id=word_id,
+            category_id=categories[word_id],
+            proficiency_level=event['proficiency_level'],
+            is_mastered=event['is_mastered'],
+            times_reviewed=event.get('times_reviewed', previous.times_reviewed if previous else 0),
+            next_review_date=event.get('next_review_date') or (previous.next_review_date if previous else timestamp),
+            ease_factor=previous.ease_factor if previous else DEFAULT_EASE,
+            review_interval=previous.review_interval if previous else 0,
+            last_reviewed=timestamp,
+        )
+        if previous is not None and all(getattr(row, field) == getattr(previous, field) for field in SYNC_FIELDS):
+            continue  # Değişiklik yok
+        rows.append(row)
+        changes.append((progress_state(previous), progress_state(row)))
+
+    if rows:
+        UserProgress.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['user', 'word'],
+            update_fields=['category', 'last_reviewed', *SYNC_FIELDS],
+        )
+        record_progress_changes(user, changes)
+
+    return [row.word_id for row in rows], unknown
@@ -0,0 +1,90 @@
+"""
+Telaffuz ses dosyaları için içerik adresli disk önbelleği ve TTS arka uçları.
+
+Ses dosyaları (metin, dil, yavaş) üçlüsünün özetiyle adlandırılır; aynı kelime
+bir kez sentezlenir ve sonraki isteklerde doğrudan diskten sunulur.
+"""
+import hashlib
+import io
+import os
+import re
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+DEFAULT_LANG = 'en'
+MAX_TEXT_LENGTH = 200
+LANG_PATTERN = re.compile(r'^[a-z]{2,3}(-[A-Za-z]{2,4})?$')
+
+
+class GTTSBackend:
+    """Google Text-to-Speech ile MP3 üreten varsayılan arka uç"""
+
+    def synthesize(self, text, lang, slow):
+        from gtts import gTTS
+
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=lang, slow=slow).write_to_fp(buffer)
+        return buffer.getvalue()
+
+
+class StubBackend:
+    """Ağ erişimi olmadan çalışan, metne göre sabit içerik üreten arka uç (test ve çevrimdışı kullanım için)"""
+
+    def synthesize(self, text, lang, slow):
+        # Sessiz bir MPEG çerçeve başlığı + ayırt edici içerik
+        return b'\xff\xfb\x90\x00' + f'{lang}:{int(slow)}:{text}'.encode('utf-8')
+
+
+def get_backend():
+    """settings.PRONUNCIATION_TTS_BACKEND ile seçilen TTS arka ucunu döndürür"""
+    backend_path = getattr(settings, 'PRONUNCIATION_TTS_BACKEND', 'core.services.pronunciation.GTTSBackend')
+    return import_string(backend_path)()
+
+
+def get_cache_dir():
+    return Path(getattr(settings, 'PRONUNCIATION_CACHE_DIR', Path(settings.MEDIA_ROOT) / 'pronunciation'))
+
+
+def normalize_text(text):
+    """Boşlukları sadeleştirir; aynı kelimenin farklı yazımları aynı anahtara düşer"""
+    return ' '.join(text.split())
+
+
+def audio_key(text, lang=DEFAULT_LANG, slow=False):
+    """(metin, dil, yavaş) için içerik adresli anahtar (aynı zamanda ETag) üretir"""
+    raw = f'{lang}\x00{int(bool(slow))}\x00{normalize_text(text)}'
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def audio_path(key):
+    return get_cache_dir() / key[:2] / f'{key}.mp3'
+
+
+def get_audio(text, lang=DEFAULT_LANG, slow=False, backend=None):
+    """
+    Ses dosyasının önbellekteki yolunu ve anahtarını döndürür.
+
+    Dosya yoksa TTS arka ucuyla sentezlenir ve geçici dosyadan atomik olarak
+    yerine taşınır; yarım yazılmış bir dosya hiçbir zaman sunulmaz.
+    """
+    text = normalize_text(text)
+    key = audio_key(text, lang, slow)
+    path = audio_path(key)
+    if path.exists():
+        return path, key
+
+    audio_data = (backend or get_backend()).synthesize(text, lang, slow)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as temp_file:
+            temp_file.write(audio_data)
+        os.replace(temp_name, path)
+    except BaseException:
+        if os.path.exists(temp_name):
+            os.unlink(temp_name)
+        raise
+    return path, key
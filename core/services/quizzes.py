@@ -0,0 +1,153 @@
+"""
+Quiz oluşturma, soru erişimi ve cevap kaydı yardımcıları.
+"""
+import random
+
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Greatest, Least
+from django.utils import timezone
+
+from core.models import Quiz, QuizQuestion, UserProgress
+from core.services.distractors import get_distractors
+from core.services.profiles import add_experience_points
+from core.services.srs import DEFAULT_EASE, next_schedule, quality_for_answer
+from core.services.stats import progress_state, record_progress_change
+
+MAX_PROFICIENCY_LEVEL = 5
+
+
+def _word_option(word):
+    return {'id': word.id, 'english': word.english, 'turkish': word.turkish}
+
+
+def build_question_options(quiz, words):
+    """Çoktan seçmeli quizler için her kelimenin karıştırılmış seçeneklerini döndürür"""
+    if quiz.quiz_type != 'multiple_choice':
+        return {}
+
+    distractors = get_distractors(words)
+    options = {}
+    for word in words:
+        word_options = [_word_option(word)] + distractors.get(word.id, [])
+        random.shuffle(word_options)
+        options[word.id] = word_options
+    return options
+
+
+def create_quiz_questions(quiz, words):
+    """Quiz sorularını sıra numarası ve hazır seçenekleriyle tek seferde ekler"""
+    words = list(words)
+    options = build_question_options(quiz, words)
+
+    return QuizQuestion.objects.bulk_create([
+        QuizQuestion(
+            quiz=quiz,
+            word=word,
+            position=position,
+            options=options.get(word.id, [])
+        )
+        for position, word in enumerate(words, start=1)
+    ])
+
+
+def get_quiz_question(quiz, position):
+    """(quiz, position) indeksinden tek bir soruyu kelimesiyle birlikte getirir"""
+    return QuizQuestion.objects.select_related('word').filter(quiz=quiz, position=position).first()
+
+
+def check_answer(quiz, question, user_answer):
+    """Kullanıcı cevabının doğru olup olmadığını döndürür"""
+    if quiz.quiz_type == 'multiple_choice':
+        # Çoktan seçmeli soru için cevap kontrolü
+        selected_word_id = int(user_answer) if user_answer.isdigit() else 0
+        return selected_word_id == question.word_id
+    elif quiz.quiz_type == 'writing':
+        # Yazma sorusu için cevap kontrolü
+        return user_answer.lower().strip() == question.word.turkish.lower().strip()
+    return False
+
+
+def _update_word_progress(user, word, is_correct):
+    """
+    Kelimenin bilme seviyesini cevaba göre F() ifadeleriyle bir artırır veya azaltır
+    ve bir sonraki tekrar zamanını SM-2 ile planlar
+    """
+    now = timezone.now()
+    quality = quality_for_answer(is_correct)
+    ease_factor, interval, next_review = next_schedule(DEFAULT_EASE, 0, quality, now)
+    progress, created = UserProgress.objects.select_for_update().get_or_create(
+        user=user,
+        word=word,
+        defaults={
+            'proficiency_level': 1 if is_correct else 0,
+            'ease_factor': ease_factor,
+            'review_interval': interval,
+            'next_review_date': next_review
+        }
+    )
+    if created:
+        record_progress_change(user, None, progress_state(progress))
+        return
+
+    previous_state = progress_state(progress)
+    if is_correct:
+        # Doğru cevap: seviyeyi artır (maksimum 5)
+        level = Least(F('proficiency_level') + 1, Value(MAX_PROFICIENCY_LEVEL))
+        is_mastered = Case(
+            When(proficiency_level__gte=MAX_PROFICIENCY_LEVEL - 1, then=Value(True)),
+            default=Value(False)
+        )
+        new_level = min(progress.proficiency_level + 1, MAX_PROFICIENCY_LEVEL)
+    else:
+        # Yanlış cevap: seviyeyi azalt (minimum 0)
+        level = Greatest(F('proficiency_level') - 1, Value(0))
+        is_mastered = Value(False)
+        new_level = max(progress.proficiency_level - 1, 0)
+
+    # Satır kilitli olduğu için okunan katsayı ve aralık güncel
+    ease_factor, interval, next_review = next_schedule(progress.ease_factor, progress.review_interval, quality, now)
+    UserProgress.objects.filter(pk=progress.pk).update(
+        proficiency_level=level,
+        is_mastered=is_mastered,
+        times_reviewed=F('times_reviewed') + 1,
+        last_reviewed=now,
+        ease_factor=ease_factor,
+        review_interval=interval,
+        next_review_date=next_review
+    )
+    record_progress_change(user, previous_state, (new_level, new_level >= MAX_PROFICIENCY_LEVEL))
+
+
+def _complete_quiz(user, quiz):
+    """Quiz'i tamamlar ve puana göre deneyim puanı ekler; sadece bir kez uygulanır"""
+    if not Quiz.objects.filter(pk=quiz.pk, completed=False).update(completed=True):
+        return
+    score = Quiz.objects.filter(pk=quiz.pk).values_list('score', flat=True).get()
+    add_experience_points(user, score * 10)
+
+
+@transaction.atomic
+def answer_quiz_question(user, quiz, question, user_answer):
+    """
+    Bir quiz sorusunun cevabını tek bir işlem içinde kaydeder.
+
+    Her soru yalnızca ilk cevapta puanlanır; tekrar gönderilen cevaplar (çift
+    tıklama, yenileme) hiçbir sayacı değiştirmez. Son sorunun cevabıyla quiz
+    tamamlanır. Cevap bu çağrıda kaydedildiyse True döndürür.
+    """
+    is_correct = check_answer(quiz, question, user_answer)
+
+    recorded = QuizQuestion.objects.filter(pk=question.pk, user_answer__isnull=True).update(
+        user_answer=user_answer[:200],
+        is_correct=is_correct
+    )
+    if recorded:
+        if is_correct:
+            Quiz.objects.filter(pk=quiz.pk).update(score=F('score') + 1)
+        _update_word_progress(user, question.word, is_correct)
+
+    if question.position == quiz.max_score:
+        _complete_quiz(user, quiz)
+
+    return bool(recorded)
@@ -0,0 +1,82 @@
+"""
+Sohbet mesajı saklama politikası: eski mesajları sıkıştırılmış JSONL
+dosyalarına arşivleyip canlı tablodan siler.
+"""
+import gzip
+import json
+import os
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import ChatMessage
+
+ARCHIVE_CHUNK_SIZE = 2000
+
+
+def get_archive_dir():
+    return Path(getattr(settings, 'CHAT_ARCHIVE_DIR', Path(settings.BASE_DIR) / 'chat_archive'))
+
+
+def archive_cutoff(user_id, cutoff, keep):
+    """
+    Kullanıcı için arşivlenecek mesajların üst zaman sınırını döndürür.
+
+    cutoff'tan eski mesajlar ve en yeni `keep` mesajın dışında kalanlar
+    arşivlenir; arşivlenecek mesaj yoksa None döndürür.
+    """
+    boundary = (
+        ChatMessage.objects.filter(user_id=user_id)
+        .order_by('-timestamp', '-id')
+        .values_list('timestamp', flat=True)[keep - 1:keep]
+        .first()
+    ) if keep else None
+    if boundary is not None and boundary > cutoff:
+        cutoff = boundary
+    if not ChatMessage.objects.filter(user_id=user_id, timestamp__lt=cutoff).exists():
+        return None
+    return cutoff
+
+
+def archive_user_messages(user_id, cutoff, keep, archive_dir=None, dry_run=False):
+    """
+    Kullanıcının eski mesajlarını <arşiv>/<user_id>/<zaman>-<ek>.jsonl.gz dosyasına
+    yazar ve ardından canlı tablodan siler. Dosya diske yazılmadan hiçbir satır
+    silinmez. Arşivlenen mesaj sayısını döndürür.
+    """
+    cutoff = archive_cutoff(user_id, cutoff, keep)
+    if cutoff is None:
+        return 0
+
+    messages = ChatMessage.objects.filter(user_id=user_id, timestamp__lt=cutoff)
+    if dry_run:
+        return messages.count()
+
+    user_dir = (archive_dir or get_archive_dir()) / str(user_id)
+    user_dir.mkdir(parents=True, exist_ok=True)
+    # Aynı saniyede (veya eşzamanlı) çalışan iki arşivleme birbirinin dosyasının üzerine yazmasın
+    path = user_dir / f"{timezone.now().strftime('%Y%m%d%H%M%S%f')}-{uuid.uuid4().hex[:8]}.jsonl.gz"
+    temp_path = path.with_suffix('.tmp')
+
+    count = 0
+    max_id = 0
+    with gzip.open(temp_path, 'wt', encoding='utf-8') as archive:
+        rows = messages.order_by('timestamp', 'id').values_list('id', 'sender', 'text', 'timestamp')
+        for message_id, sender, text, timestamp in rows.iterator(chunk_size=ARCHIVE_CHUNK_SIZE):
+            archive.write(json.dumps({
+                'id': message_id,
+                'sender': sender,
+                'text': text,
+                'timestamp': timestamp.isoformat(),
+            }, ensure_ascii=False) + '\n')
+            count += 1
+            max_id = max(max_id, message_id)
+    os.replace(temp_path, path)
+
+    # Sadece dosyaya yazılan satırları sil
+    with transaction.atomic():
+        messages.filter(id__lte=max_id).delete()
+    return count
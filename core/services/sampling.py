@@ -0,0 +1,87 @@
+"""
+Rastgele kelime örnekleme.
+
+ORDER BY RANDOM() her istekte tüm Word tablosunu sıralar. Bunun yerine her
+filtre kombinasyonu (kategori, maksimum uzunluk) için kelime ID listesi süreç
+belleğinde tutulur ve örnekleme bu liste üzerinden yapılır; veritabanına
+sadece seçilen ID'ler için tek bir birincil anahtar sorgusu gider.
+
+Listeler, Word değiştiğinde artırılan paylaşımlı bir sürüm anahtarıyla
+geçersiz kılınır (bkz. core.signals).
+"""
+import random
+import time
+
+from django.core.cache import cache
+from django.db.models.functions import Length
+
+from core.models import Word
+
+WORD_POOL_VERSION_KEY = 'word_pool_version'
+
+# (kategori_id, max_uzunluk) -> (sürüm, [kelime_id, ...])
+_word_pools = {}
+
+
+def get_pool_version():
+    """Kelime havuzlarının güncel sürümünü döndürür"""
+    version = cache.get(WORD_POOL_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        cache.add(WORD_POOL_VERSION_KEY, version, None)
+        version = cache.get(WORD_POOL_VERSION_KEY, version)
+    return version
+
+
+def invalidate_word_pools():
+    """Tüm süreçlerdeki kelime ID havuzlarını geçersiz kılar"""
+    cache.set(WORD_POOL_VERSION_KEY, time.time_ns(), None)
+
+
+def _category_key(category):
+    if category is None:
+        return None
+    return getattr(category, 'pk', category)
+
+
+def get_word_ids(category=None, max_length=None):
+    """Filtreye uyan kelime ID'lerinin önbelleğe alınmış listesini döndürür"""
+    key = (_category_key(category), max_length)
+    version = get_pool_version()
+
+    cached = _word_pools.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    queryset = Word.objects.order_by()
+    if key[0] is not None:
+        queryset = queryset.filter(category_id=key[0])
+    if max_length is not None:
+        queryset = queryset.alias(english_length=Length('english')).filter(english_length__lte=max_length)
+
+    ids = list(queryset.values_list('id', flat=True))
+    _word_pools[key] = (version, ids)
+    return ids
+
+
+def sample_word_ids(count, category=None, max_length=None, exclude_ids=()):
+    """Filtreye uyan kelimelerden en fazla count adet rastgele ID seçer"""
+    ids = get_word_ids(category, max_length)
+    exclude_ids = set(exclude_ids)
+    if count <= 0 or not ids:
+        return []
+
+    sample_size = min(len(ids), count + len(exclude_ids))
+    picked = [word_id for word_id in random.sample(ids, sample_size) if word_id not in exclude_ids]
+    return picked[:count]
+
+
+def sample_words(count, category=None, max_length=None, exclude_ids=()):
+    """Filtreye uyan kelimelerden en fazla count adet rastgele Word nesnesi döndürür"""
+    ids = sample_word_ids(count, category, max_length, exclude_ids)
+    if not ids:
+        return []
+
+    words = Word.objects.select_related('category').in_bulk(ids)
+    # Havuz ile veritabanı arasında silinen kelimeler atlanır
+    return [words[word_id] for word_id in ids if word_id in words]
@@ -0,0 +1,74 @@
+"""
+SM-2 tabanlı aralıklı tekrar zamanlayıcısı ve "tekrar zamanı gelmiş" kuyruğu.
+"""
+from datetime import timedelta
+
+from django.utils import timezone
+
+from core.models import UserProgress, Word
+from core.services.sampling import sample_word_ids
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+
+# Quiz cevapları 0-5 SM-2 kalite ölçeğine çevrilir
+CORRECT_QUALITY = 4
+WRONG_QUALITY = 1
+
+
+def quality_for_answer(is_correct):
+    return CORRECT_QUALITY if is_correct else WRONG_QUALITY
+
+
+def next_schedule(ease_factor, interval, quality, now=None):
+    """
+    SM-2 adımı: (yeni kolaylık katsayısı, yeni aralık (gün), sonraki tekrar zamanı) döndürür.
+
+    Kalite 3'ün altındaysa aralık 1 güne döner; aksi halde 1, 6, aralık x katsayı
+    şeklinde büyür. Katsayı her cevapta kaliteye göre güncellenir ve 1.3'ün altına inmez.
+    """
+    now = now or timezone.now()
+    ease_factor = max(MIN_EASE, ease_factor + (0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)))
+
+    if quality < 3:
+        interval = 1
+    elif interval <= 0:
+        interval = 1
+    elif interval == 1:
+        interval = 6
+    else:
+        interval = round(interval * ease_factor)
+
+    return ease_factor, interval, now + timedelta(days=interval)
+
+
+def due_progress(user, category=None, now=None):
+    """
+    Tekrar zamanı gelmiş ilerleme kayıtları, en gecikmiş olan önce.
+    (user, next_review_date) indeksinde aralık taraması olarak çalışır.
+    """
+    queryset = UserProgress.objects.filter(user=user, next_review_date__lte=now or timezone.now())
+    if category is not None:
+        queryset = queryset.filter(category=category)
+    return queryset.order_by('next_review_date')
+
+
+def build_review_session(user, category=None, size=10):
+    """
+    Quiz için kelime listesi oluşturur: önce tekrar zamanı gelmiş kelimeler,
+    sonra hiç çalışılmamış kelimeler, gerekirse diğer kelimeler.
+    Kullanıcının tüm geçmişi okunmaz; her adım indeksli sınırlı bir sorgudur.
+    """
+    chosen = list(due_progress(user, category).values_list('word_id', flat=True)[:size])
+
+    if len(chosen) < size:
+        # Rastgele adaylardan ilerleme kaydı olanları tek sorguda ele
+        candidates = sample_word_ids((size - len(chosen)) * 3, category=category, exclude_ids=chosen)
+        studied = set(UserProgress.objects.filter(user=user, word_id__in=candidates).values_list('word_id', flat=True))
+        chosen += [word_id for word_id in candidates if word_id not in studied][:size - len(chosen)]
+
+    if len(chosen) < size:
+        chosen += sample_word_ids(size - len(chosen), category=category, exclude_ids=chosen)
+
+    words = Word.objects.select_related('category').in_bulk(chosen)
+    return [words[word_id] for word_id in chosen if word_id in words]
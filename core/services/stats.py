@@ -0,0 +1,83 @@
+"""
+UserStats özet tablosunun bakımı.
+
+İlerleme yazan her kod yolu, değişiklikten önceki ve sonraki durumu
+record_progress_change() ile bildirir; özet satırı F() ifadeleriyle artımlı
+olarak güncellenir. Satır henüz yoksa ilk okumada UserProgress'ten yeniden
+hesaplanır.
+"""
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from core.models import UserProgress, UserStats
+from core.services.progress import LEARNED_LEVEL
+
+STAT_FIELDS = ('studied_words', 'learned_words', 'mastered_words', 'to_review_words')
+
+
+def progress_state(progress):
+    """Bir UserProgress kaydının özet için önemli durumunu (seviye, ustalık) döndürür"""
+    if progress is None:
+        return None
+    return (progress.proficiency_level, progress.is_mastered)
+
+
+def _stat_flags(state):
+    """Durumun her özet alanına katkısını (0/1) döndürür"""
+    if state is None:
+        return dict.fromkeys(STAT_FIELDS, 0)
+    level, mastered = state
+    return {
+        'studied_words': 1,
+        'learned_words': int(level >= LEARNED_LEVEL),
+        'mastered_words': int(bool(mastered)),
+        'to_review_words': int(level < LEARNED_LEVEL),
+    }
+
+
+def record_progress_change(user, previous, current):
+    """
+    Bir ilerleme kaydının durum değişikliğini özet satırına uygular.
+
+    previous/current, progress_state() çıktısıdır; yeni kayıt için previous,
+    silinen kayıt için current None olur. user, kullanıcı veya ID'si olabilir.
+    """
+    record_progress_changes(user, [(previous, current)])
+
+
+def record_progress_changes(user, changes):
+    """Birden çok (previous, current) değişikliğini tek bir UPDATE ile özet satırına uygular"""
+    deltas = dict.fromkeys(STAT_FIELDS, 0)
+    for previous, current in changes:
+        before = _stat_flags(previous)
+        after = _stat_flags(current)
+        for field in STAT_FIELDS:
+            deltas[field] += after[field] - before[field]
+    # Azaltmalar sıfırın altına inmez (ör. özet satırı silmeden önce yeniden hesaplandıysa)
+    updates = {
+        field: F(field) + delta if delta > 0 else Greatest(F(field) + delta, 0)
+        for field, delta in deltas.items() if delta
+    }
+    if updates:
+        UserStats.objects.filter(user=user).update(updated_at=timezone.now(), **updates)
+
+
+def rebuild_user_stats(user):
+    """Özet satırını UserProgress tablosundan tek bir toplama sorgusuyla yeniden hesaplar"""
+    totals = UserProgress.objects.filter(user=user).aggregate(
+        studied_words=Count('id'),
+        learned_words=Count('id', filter=Q(proficiency_level__gte=LEARNED_LEVEL)),
+        mastered_words=Count('id', filter=Q(is_mastered=True)),
+        to_review_words=Count('id', filter=Q(proficiency_level__lt=LEARNED_LEVEL)),
+    )
+    stats, _ = UserStats.objects.update_or_create(user=user, defaults=totals)
+    return stats
+
+
+def get_user_stats(user):
+    """Kullanıcının özet satırını döndürür, yoksa oluşturur"""
+    try:
+        return UserStats.objects.get(user=user)
+    except UserStats.DoesNotExist:
+        return rebuild_user_stats(user)
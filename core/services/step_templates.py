@@ -0,0 +1,58 @@
+"""
+Kategoriler için varsayılan öğrenme adımlarının oluşturulması.
+
+Adımlar istek sırasında değil, kategori oluşturulduğunda (bkz. core.signals)
+veya manage.py provision_learning_steps ile toplu olarak eklenir.
+(category, order) benzersiz olduğu için aynı anda çalışan iki ekleme yinelenen
+adım oluşturamaz.
+"""
+from core.models import Category, LearningStep
+from core.services.versions import bump_versions
+
+# (sıra, adım tipi, isim şablonu, açıklama, kelime sayısı, maksimum hata)
+DEFAULT_STEPS = (
+    (0, 'matching', "{name} Kelimelerini Öğren",
+     "Bu adımda kelimeleri ve anlamlarını eşleştirerek öğreneceksiniz.", 10, 3),
+    (1, 'writing', "{name} Yazma Alıştırması",
+     "Bu adımda Türkçe kelimelerin İngilizce karşılıklarını yazacaksınız.", 10, 3),
+    (2, 'multiple_choice', "{name} Çoktan Seçmeli Quiz",
+     "Bu adımda öğrendiğiniz kelimelerin anlamlarını çoktan seçmeli sorularla pekiştirin.", 10, 3),
+    (3, 'final_quiz', "{name} Final Quiz",
+     "Bu adımda öğrendiğiniz tüm kelimelerin final sınavını yapacaksınız. 3 yanlış hakkınız var!", 0, 3),
+    (4, 'treasure', "{name} Hazinesi",
+     "Bu kategoriyi tamamlayarak bir hazine kazandınız!", 0, 3),
+)
+
+
+def build_default_steps(category):
+    return [
+        LearningStep(
+            category=category,
+            name=name.format(name=category.name),
+            description=description,
+            step_type=step_type,
+            order=order,
+            word_count=word_count,
+            max_mistakes=max_mistakes,
+        )
+        for order, step_type, name, description, word_count, max_mistakes in DEFAULT_STEPS
+    ]
+
+
+def categories_without_steps():
+    return Category.objects.filter(learning_steps__isnull=True)
+
+
+def provision_default_steps(categories=None):
+    """
+    Hiç adımı olmayan kategorilere varsayılan adımları tek bir toplu INSERT ile ekler.
+    Tekrar çalıştırmak güvenlidir; eklenmeye çalışılan adım sayısını döndürür.
+    """
+    if categories is None:
+        categories = categories_without_steps()
+    steps = [step for category in categories for step in build_default_steps(category)]
+    if steps:
+        LearningStep.objects.bulk_create(steps, ignore_conflicts=True)
+        # bulk_create sinyal göndermez; adım kataloğunun önbelleğini elle yenile
+        bump_versions('learning_step')
+    return len(steps)
@@ -0,0 +1,84 @@
+"""
+Mobil istemci için katalog (kelime/kategori) delta senkronizasyonu.
+
+İstemci son aldığı imleci ?since= ile gönderir; yanıtta yalnızca o andan
+sonra değişen kayıtlar ve silinen kayıtların ID'leri (tombstone) döner.
+Kategoriye göre senkronize edilen kelimelerde, kategoriden taşınan kelimeler
+de o kategori için silinmiş sayılır. Tombstone'lar SYNC_TOMBSTONE_RETENTION_DAYS
+gün saklanır; daha eski bir imleç CursorExpired ile tam senkronizasyona döner.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from core.models import SyncTombstone
+
+# Yazma sırasında henüz commit edilmemiş kayıtlar kaçmasın diye imleç biraz geriden başlatılır.
+# Aynı kaydın iki kez gelmesi zararsızdır; istemci ID'ye göre üzerine yazar.
+CURSOR_OVERLAP = timedelta(seconds=5)
+
+
+class CursorExpired(Exception):
+    """İmleç tombstone saklama süresinden eski; istemci since=0 ile baştan senkronize olmalı"""
+
+
+def tombstone_cutoff(now=None):
+    """Bu andan eski tombstone'lar silinebilir"""
+    return (now or timezone.now()) - timedelta(days=getattr(settings, 'SYNC_TOMBSTONE_RETENTION_DAYS', 30))
+
+
+def encode_cursor(moment):
+    """Zamanı mikro saniye cinsinden opak bir imlece çevirir"""
+    return str(int(moment.timestamp() * 1_000_000))
+
+
+def decode_cursor(value):
+    """İmleci zamana çevirir; '0' ilk senkronizasyon anlamına gelir. Geçersizse ValueError"""
+    micros = int(value)
+    if micros < 0:
+        raise ValueError(value)
+    return datetime.fromtimestamp(micros / 1_000_000, tz=dt_timezone.utc)
+
+
+def changes_since(queryset, model_name, since, scope=None):
+    """
+    (yeni imleç, değişen kayıtlar, silinen ID'ler) döndürür.
+
+    scope verilirse (kelimeler için kategori ID'si) o kategoriden taşınan
+    kayıtlar da silinen ID'lere eklenir. Yeni imleç sorgudan önce alınır; bu
+    sırada yapılan yazmalar bir sonraki senkronizasyonda tekrar gelir.
+    """
+    now = timezone.now()
+    cursor = encode_cursor(now)
+    start = decode_cursor(since)
+    if start.timestamp() <= 0:
+        return cursor, queryset, []
+    if start < tombstone_cutoff(now):
+        raise CursorExpired(since)
+
+    start -= CURSOR_OVERLAP
+    changed = queryset.filter(updated_at__gte=start)
+    tombstones = SyncTombstone.objects.filter(model_name=model_name, deleted_at__gte=start)
+    if scope is None:
+        tombstones = tombstones.filter(category_id__isnull=True)
+    else:
+        tombstones = tombstones.filter(Q(category_id__isnull=True) | Q(category_id=scope))
+    deleted = set(tombstones.values_list('object_id', flat=True))
+    if deleted:
+        # Taşınıp geri gelen kayıt hem değişmiş hem silinmiş görünmesin
+        deleted -= set(changed.filter(pk__in=deleted).values_list('pk', flat=True))
+    return cursor, changed, sorted(deleted)
+
+
+def record_tombstone(model_name, object_id, category_id=None):
+    SyncTombstone.objects.create(model_name=model_name, object_id=object_id, category_id=category_id)
+
+
+def prune_tombstones(cutoff=None, dry_run=False):
+    """Saklama süresini aşan tombstone'ları siler; silinen (veya silinecek) sayıyı döndürür"""
+    tombstones = SyncTombstone.objects.filter(deleted_at__lt=cutoff or tombstone_cutoff())
+    if dry_run:
+        return tombstones.count()
+    return tombstones.delete()[0]
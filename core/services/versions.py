@@ -0,0 +1,70 @@
+"""
+Katalog koleksiyonları (kelimeler, kategoriler, öğrenme yolları, adımlar) için
+sürüm belirteçleri.
+
+Her koleksiyonun sürümü paylaşımlı önbellekte tutulur ve ilgili model
+değiştiğinde artırılır (bkz. core.signals). ETag'ler ve sürümlü önbellek
+anahtarları bu belirteçlerden türetilir; böylece geçerliliği kontrol etmek
+için veritabanına gitmek gerekmez.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+VERSION_KEY_PREFIX = 'collection_version:'
+
+
+def is_shared_cache():
+    """Varsayılan önbellek tüm işçi süreçler tarafından görülüyorsa True (locmem/dummy değilse)"""
+    return not isinstance(caches['default'], (LocMemCache, DummyCache))
+
+
+def _version_key(collection):
+    return f'{VERSION_KEY_PREFIX}{collection}'
+
+
+def get_versions(*collections):
+    """Koleksiyonların güncel sürümlerini (verilen sırayla) tek önbellek turunda döndürür"""
+    keys = [_version_key(collection) for collection in collections]
+    versions = cache.get_many(keys)
+
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        now = time.time_ns()
+        for key in missing:
+            cache.add(key, now, None)
+        versions.update(cache.get_many(missing))
+    return [versions.get(key, 0) for key in keys]
+
+
+def get_version(collection):
+    return get_versions(collection)[0]
+
+
+def bump_versions(*collections):
+    """Koleksiyonların sürümünü artırarak tüm süreçlerdeki türetilmiş verileri geçersiz kılar"""
+    now = time.time_ns()
+    cache.set_many({_version_key(collection): now for collection in collections}, None)
+
+
+def versioned_key(name, collections, *parts):
+    """
+    Koleksiyon sürümlerini içeren önbellek anahtarı üretir, ör. 'home:word=17.category=42:tr'.
+    Koleksiyonlardan biri değiştiğinde anahtar da değişir; eski kayıtlar süresi dolunca düşer.
+    """
+    versions = get_versions(*collections)
+    stamp = '.'.join(f'{collection}={version}' for collection, version in zip(collections, versions))
+    return ':'.join([name, stamp, *map(str, parts)])
+
+
+def get_or_build(name, collections, builder, *parts, timeout=None):
+    """Sürümlü anahtar altında builder() sonucunu önbellekten döndürür, yoksa hesaplayıp yazar"""
+    key = versioned_key(name, collections, *parts)
+    value = cache.get(key)
+    if value is None:
+        value = builder()
+        cache.set(key, value, timeout or getattr(settings, 'CATALOG_CACHE_TIMEOUT', 3600))
+    return value
@@ -0,0 +1,102 @@
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import (
+    Category, LearningPath, LearningPathCategory, LearningStep, UserCategoryProgress, UserProgress, UserStepProgress,
+    Word
+)
+from .services.distractors import invalidate_category_distractors
+from .services.sampling import invalidate_word_pools
+from .services.stats import progress_state, record_progress_change
+from .services.step_templates import provision_default_steps
+from .services.sync import record_tombstone
+from .services.versions import bump_versions
+
+
+@receiver([post_save, post_delete], sender=Word)
+def word_changed(sender, instance, **kwargs):
+    """
+    Kelime eklendiğinde, değiştiğinde veya silindiğinde örnekleme ve çeldirici havuzlarını yenile.
+    Başka kategoriye taşınan kelime eski kategorinin çeldiricilerinden de çıkmalı.
+    """
+    invalidate_word_pools()
+    invalidate_category_distractors(instance.category_id, getattr(instance, '_previous_category_id', None))
+
+
+@receiver(pre_save, sender=Word)
+def remember_word_category(sender, instance, **kwargs):
+    """Kaydetmeden önce kelimenin veritabanındaki kategorisini sakla (taşınma tespiti için)"""
+    instance._previous_category_id = (
+        Word.objects.filter(pk=instance.pk).values_list('category_id', flat=True).first() if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=Word)
+def word_category_changed(sender, instance, created, **kwargs):
+    """
+    Kelimenin kategorisi değiştiyse ilerleme kayıtlarındaki denormalize kategoriyi güncelle
+    ve eski kategorinin delta senkronizasyonu için tombstone bırak.
+    """
+    previous_category_id = getattr(instance, '_previous_category_id', None)
+    if created or previous_category_id is None or previous_category_id == instance.category_id:
+        return
+    UserProgress.objects.filter(word=instance).exclude(category_id=instance.category_id).update(
+        category_id=instance.category_id
+    )
+    record_tombstone('word', instance.pk, category_id=previous_category_id)
+
+
+@receiver(post_delete, sender=UserProgress)
+def progress_deleted(sender, instance, **kwargs):
+    """Silinen ilerleme kaydının (API veya kelime silinmesiyle) katkısını özet satırından düş"""
+    record_progress_change(instance.user_id, progress_state(instance), None)
+
+
+@receiver(post_delete, sender=UserStepProgress)
+def step_progress_deleted(sender, instance, **kwargs):
+    """
+    Silinen tamamlanmış adımı (doğrudan veya adım silinmesiyle) kategorinin tamamlanan
+    adım sayacından düş; aksi halde adım tekrar tamamlandığında sayaç iki kez artar.
+    """
+    if instance.completed:
+        # Adım silinmesinde ilerleme satırları adımdan önce silinir; kategori alt sorguyla bulunur
+        category_ids = LearningStep.objects.filter(pk=instance.learning_step_id).values('category_id')
+        UserCategoryProgress.objects.filter(user_id=instance.user_id, category_id__in=category_ids).update(
+            completed_steps=Greatest(F('completed_steps') - 1, 0)
+        )
+
+
+@receiver(post_save, sender=Category)
+def category_created(sender, instance, created, raw=False, **kwargs):
+    """Yeni kategoriye varsayılan öğrenme adımlarını ekle (fixture yüklemelerinde atlanır)"""
+    if created and not raw:
+        provision_default_steps([instance])
+
+
+@receiver(post_delete, sender=Word)
+@receiver(post_delete, sender=Category)
+def catalog_deleted(sender, instance, **kwargs):
+    """Silinen kelime/kategori için mobil delta senkronizasyonuna tombstone bırak"""
+    record_tombstone(sender._meta.model_name, instance.pk)
+
+
+# Model -> ETag/önbellek sürümü artırılacak katalog koleksiyonları
+CATALOG_COLLECTIONS = {
+    Word: ('word',),
+    Category: ('category',),
+    LearningPath: ('learning_path',),
+    LearningStep: ('learning_step',),
+    LearningPathCategory: ('learning_path_category',),
+}
+
+
+def catalog_changed(sender, **kwargs):
+    """Katalog modeli değiştiğinde ilgili koleksiyon sürümlerini artır"""
+    bump_versions(*CATALOG_COLLECTIONS[sender])
+
+
+for catalog_model in CATALOG_COLLECTIONS:
+    post_save.connect(catalog_changed, sender=catalog_model)
+    post_delete.connect(catalog_changed, sender=catalog_model)
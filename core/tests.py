@@ -1,3 +1,66 @@
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.db.models import Count
 from django.test import TestCase
+from django.utils import timezone
+
+from core.models import Category, ChatMessage, UserProgress, Word
+from core.services.progress import LEARNED_LEVEL, annotate_category_progress
+
+
+class ProgressQueryPlanTests(TestCase):
+    """Panel ve kategori sayfalarındaki UserProgress sorgularının beklenen indeksleri kullandığını doğrular"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('plan', password='pw12345678')
+        cls.category = Category.objects.create(name='Plan')
+        word = Word.objects.create(english='cat', turkish='kedi', category=cls.category)
+        UserProgress.objects.create(user=cls.user, word=word, proficiency_level=LEARNED_LEVEL)
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, f"{index_name} kullanılmıyor:\n{plan}")
+
+    def test_learned_words_use_user_level_index(self):
+        progress = UserProgress.objects.filter(user=self.user, proficiency_level__gte=LEARNED_LEVEL)
+        self.assertUsesIndex(progress.values('id'), 'progress_user_level_idx')
+
+    def test_mastered_words_use_user_mastered_index(self):
+        progress = UserProgress.objects.filter(user=self.user, is_mastered=True)
+        self.assertUsesIndex(progress.values('id'), 'progress_user_mastered_idx')
+
+    def test_recent_activity_uses_user_reviewed_index(self):
+        progress = (
+            UserProgress.objects.filter(user=self.user, last_reviewed__gte=timezone.now() - timedelta(days=7))
+            .values('last_reviewed__date').annotate(count=Count('id'))
+        )
+        self.assertUsesIndex(progress, 'progress_user_reviewed_idx')
+
+    def test_category_progress_uses_user_category_level_index(self):
+        progress = UserProgress.objects.filter(
+            user=self.user, category=self.category, proficiency_level__gte=LEARNED_LEVEL
+        )
+        self.assertUsesIndex(progress.values('id'), 'progress_user_cat_level_idx')
+
+    def test_category_list_subquery_uses_user_category_level_index(self):
+        self.assertUsesIndex(annotate_category_progress(Category.objects.all(), self.user),
+                             'progress_user_cat_level_idx')
+
+
+class ChatPracticeApiTests(TestCase):
+    """Async sohbet API'sinin veritabanına yazan eylemleri"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('chat', password='pw12345678')
+
+    async def test_initial_message_is_saved(self):
+        await sync_to_async(self.async_client.force_login)(self.user)
+        response = await self.async_client.get('/chat-practice/api/', {'action': 'initial_message'})
 
-# Create your tests here.
+        self.assertEqual(response.status_code, 200)
+        message = response.json()['message']
+        self.assertTrue(await ChatMessage.objects.filter(user=self.user, sender='ai', text=message).aexists())
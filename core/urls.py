@@ -8,7 +8,8 @@ from .views import (
     quiz_categories, game_menu, word_guess_game, word_hunt_game, word_puzzle_game, 
     speed_quiz_game, update_game_score, account_lockout,
     # ChatPractice için yeni view'lar
-    chat_practice, chat_practice_send_message, chat_practice_settings, chat_practice_api
+    chat_practice, chat_practice_send_message, chat_practice_settings, chat_practice_api,
+    chat_practice_stream
 )
 
 urlpatterns = [
@@ -59,6 +60,7 @@ urlpatterns = [
     # ChatPractice için URL'ler
     path('chat-practice/', chat_practice, name='chat_practice'),
     path('chat-practice/send-message/', chat_practice_send_message, name='chat_practice_send_message'),
+    path('chat-practice/stream/', chat_practice_stream, name='chat_practice_stream'),
     path('chat-practice/settings/', chat_practice_settings, name='chat_practice_settings'),
     path('chat-practice/api/', chat_practice_api, name='chat_practice_api'),
 ] 
\ No newline at end of file
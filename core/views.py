@@ -5,45 +5,54 @@ from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from django.contrib import messages
 from django.utils import timezone
 from datetime import timedelta
-from django.db.models import Q, Count, Sum, Avg
+from django.db.models import Q, Count, Sum, Avg, Prefetch
 import random
 from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
 import logging
-from django.http import HttpResponse, JsonResponse, Http404
-import tempfile
-import os
-from gtts import gTTS
+from django.http import FileResponse, HttpResponse, JsonResponse, Http404, StreamingHttpResponse
+import re
 import json
 from django.conf import settings
 from django.urls import path
-import requests
-import time
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
+from django.contrib.auth.views import redirect_to_login
+from functools import wraps
+from asgiref.sync import sync_to_async
 
 logger = logging.getLogger(__name__)
 
 from .models import (
-    Category, Word, UserProgress, Quiz, QuizQuestion, 
+    Category, Word, UserProgress, Quiz,
     UserAchievement, UserProfile, LearningPath, LearningPathCategory,
-    LearningStep, UserStepProgress, UserCategoryProgress, GameScore,
-    ChatMessage, ChatPracticeProgress
+    LearningStep, UserCategoryProgress, GameScore,
+    ChatPracticeProgress
 )
-
-# Google API anahtarını çevre değişkeninden al
-GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY', '')
-
-# API için endpoint ve model adı
-MODEL_NAME = 'gemini-1.5-flash-latest'  # Varsayılan model
-ALTERNATIVE_MODELS = [
-    'gemini-1.5-flash-latest',
-    'gemini-1.0-pro-vision-latest',
-    'gemini-1.5-pro-latest',
-]
-
-# İstek limitleri için değişkenler
-last_request_time = 0
-REQUEST_THROTTLE_MS = 3000  # 3 saniye
+from .services.ai import QueueFull, get_job, submit_job
+from .services.chat import (
+    add_ai_message, agenerate_hint, astream_chat_turn, complete_chat_turn, hint_cache, load_conversation,
+    reset_conversation, start_chat_turn
+)
+from .services.catalog import (
+    get_categories, get_categories_by_difficulty, get_learning_paths, get_learning_steps,
+    get_next_category_by_difficulty, get_path_successors, get_total_words
+)
+from .services.distractors import get_distractors
+from .services.exercises import get_exercise
+from .services.learning import (
+    build_learning_panel, build_step_list, category_state, complete_step, get_category_access, get_category_states,
+    get_step_states, raise_category_score, unlock_categories
+)
+from .services.leaderboard import record_score
+from .services.profiles import add_experience_points
+from .services.progress import annotate_category_progress, calculate_percentage, get_category_progress
+from .services.pronunciation import (
+    DEFAULT_LANG, LANG_PATTERN, MAX_TEXT_LENGTH, audio_key, audio_path, get_audio, normalize_text
+)
+from .services.quizzes import answer_quiz_question, create_quiz_questions, get_quiz_question
+from .services.sampling import get_word_ids, sample_words
+from .services.srs import build_review_session
+from .services.stats import get_user_stats, progress_state, record_progress_change
 
 def home(request):
     """Ana sayfa görünümü"""
@@ -60,22 +69,17 @@ def home(request):
             messages.success(request, 'Mesajınız başarıyla gönderildi. En kısa sürede size dönüş yapacağız.')
             return redirect('home')
     
-        # SQLite veritabanından kategorileri al
-        categories = Category.objects.all().order_by('name')
-        
-        # Toplam kelime sayısını hesapla
-        total_words = Word.objects.count()
+        # Kategoriler ve toplam kelime sayısı paylaşımlı önbellekten gelir
+        categories = get_categories()
+        total_words = get_total_words()
         
         # Eğer kullanıcı giriş yapmışsa, ilerleme bilgilerini göster
         user_progress = None
         learned_words_count = 0
         
         if request.user.is_authenticated:
-            # Öğrenilen kelime sayısını hesapla (proficiency_level >= 3 olanlar)
-            learned_words_count = UserProgress.objects.filter(
-                user=request.user, 
-                proficiency_level__gte=3
-            ).count()
+            # Öğrenilen kelime sayısını özet tablodan al (proficiency_level >= 3 olanlar)
+            learned_words_count = get_user_stats(request.user).learned_words
             
             # Son 7 günlük ilerleme
             last_week_progress = UserProgress.objects.filter(
@@ -172,36 +176,16 @@ def user_logout(request):
 def category_list(request):
     """Kategori listesi görünümü"""
     try:
-        # SQLite veritabanından kategorileri al
-        categories = Category.objects.all().order_by('name')
+        # Kategoriler paylaşımlı önbellekten gelir
+        categories = get_categories()
         
         # Kategorilere göre ilerleme durumunu hesapla
         category_progress = []
         
         if request.user.is_authenticated:
-            # Her kategori için ilerleme hesapla
-            for category in categories:
-                # Kategorideki kelimeleri al
-                words = Word.objects.filter(category=category)
-                total_words = words.count()
-                
-                # Öğrenilen kelime sayısını hesapla (proficiency_level >= 3 olanlar)
-                learned_words = UserProgress.objects.filter(
-                    user=request.user,
-                    word__category=category,
-                    proficiency_level__gte=3
-                ).count()
-                
-                # Yüzde hesapla
-                percentage = int((learned_words / total_words * 100) if total_words > 0 else 0)
-                
-                # Kategori ilerlemesi
-                category_progress.append({
-                    'category': category,
-                    'learned': learned_words,
-                    'total': total_words,
-                    'percentage': percentage
-                })
+            # Tüm kategorilerin ilerlemesini tek sorguda hesapla; önbellekteki liste
+            # annotate edilemediği için aynı sıralamayla bir QuerySet verilir
+            category_progress = get_category_progress(request.user, Category.objects.order_by('name'))
         
         return render(request, 'core/category_list.html', {
             'categories': categories,
@@ -226,9 +210,6 @@ def category_detail(request, category_id):
         # Temel sorgu
         words_query = Word.objects.filter(category=category)
         
-        # Sorgu sonucunu logla
-        logger.info(f"Kategori: {category.name} için {words_query.count()} kelime bulundu")
-        
         # Arama filtresi
         if search:
             words_query = words_query.filter(
@@ -245,43 +226,34 @@ def category_detail(request, category_id):
             total_words = words_query.count()
             learned_words = UserProgress.objects.filter(
                 user=request.user,
-                word__category=category,
+                category=category,
                 proficiency_level__gte=3
             ).count()
             
-            percentage = int((learned_words / total_words * 100) if total_words > 0 else 0)
-            
             progress = {
                 'learned': learned_words,
                 'total': total_words,
-                'percentage': percentage
+                'percentage': calculate_percentage(learned_words, total_words)
             }
             
-            # Her kelime için kullanıcının ilerleme bilgisini getir
-            user_progress = UserProgress.objects.filter(user=request.user)
-            
             # Proficiency filtresini uygula
             if proficiency:
-                # Önce kullanıcının ilerleme kaydı olan kelimeleri filtrele
-                progress_word_ids = user_progress.filter(
-                    proficiency_level=int(proficiency)
-                ).values_list('word_id', flat=True)
-                
-                # Sonra bu kelime ID'lerine göre filtrele
-                words_query = words_query.filter(id__in=progress_word_ids)
+                words_query = words_query.filter(
+                    learners__user=request.user,
+                    learners__proficiency_level=int(proficiency)
+                )
             
-            # Kelimelere ilerleme bilgisini ekle
-            words_with_progress = []
-            for word in words_query:
-                word_progress = user_progress.filter(word=word).first()
-                word.user_progress = word_progress
-                words_with_progress.append(word)
+            # Sadece sayfadaki kelimeler için kullanıcının ilerleme kayıtlarını tek sorguda getir
+            words_query = words_query.prefetch_related(Prefetch(
+                'learners',
+                queryset=UserProgress.objects.filter(user=request.user),
+                to_attr='user_progress_list'
+            ))
         else:
-            words_with_progress = list(words_query)
             progress = None
         
-        # Sayfalama
-        paginator = Paginator(words_with_progress, 12)  # Her sayfada 12 kelime
+        # Sayfalama (veritabanı seviyesinde LIMIT/OFFSET)
+        paginator = Paginator(words_query, 12)  # Her sayfada 12 kelime
         page_number = request.GET.get('page', 1)
         
         try:
@@ -291,6 +263,12 @@ def category_detail(request, category_id):
         except EmptyPage:
             words = paginator.page(paginator.num_pages)
         
+        # Sayfadaki kelimelere ilerleme bilgisini ekle
+        words.object_list = list(words.object_list)
+        for word in words.object_list:
+            user_progress_list = getattr(word, 'user_progress_list', [])
+            word.user_progress = user_progress_list[0] if user_progress_list else None
+        
         context = {
             'category': category,
             'words': words,
@@ -352,7 +330,7 @@ def original_category_detail(request, category_id):
                 total_words = words_query.count()
                 learned_words = UserProgress.objects.filter(
                     user=request.user,
-                    word__category=category,
+                    category=category,
                     proficiency_level__gte=3
                 ).count()
                 
@@ -427,11 +405,11 @@ def word_detail(request, word_id):
             word=word,
             defaults={'proficiency_level': 0}
         )
+        if created:
+            record_progress_change(request.user, None, progress_state(progress))
     
         # İlgili kelimeler (aynı kategoriden)
-        related_words = Word.objects.filter(
-            category=word.category
-        ).exclude(id=word.id).order_by('?')[:5]
+        related_words = sample_words(5, category=word.category_id, exclude_ids=[word.id])
     
         context = {
             'word': word,
@@ -462,12 +440,16 @@ def update_progress(request, word_id):
                     defaults={'proficiency_level': new_level}
                 )
                 
-                if not created:
+                if created:
+                    record_progress_change(request.user, None, progress_state(progress))
+                else:
+                    previous_state = progress_state(progress)
                     progress.proficiency_level = new_level
                     progress.times_reviewed += 1
                     if new_level >= 5:
                         progress.is_mastered = True
                     progress.save()
+                    record_progress_change(request.user, previous_state, progress_state(progress))
                 
                 # Kullanıcının deneyim puanlarını güncelle
                 if hasattr(request.user, 'profile'):
@@ -530,39 +512,13 @@ def quiz_start(request, category_id=None, quiz_type='multiple_choice'):
         
         # Kullanıcının çalışması gereken kelimeleri belirle
         if request.user.is_authenticated:
-            # Kullanıcının daha önce gördüğü ama henüz tam öğrenmediği kelimeler
-            progress_words = UserProgress.objects.filter(
-                user=request.user,
-                proficiency_level__lt=5,  # Henüz tam öğrenilmemiş
-                word__in=words
-            ).values_list('word_id', flat=True)
-            
-            # Öncelikle çalışılması gereken kelimeler
-            quiz_words = Word.objects.filter(id__in=progress_words)
-            
-            # Yeterli kelime yoksa, hiç çalışılmamış kelimelerden de ekle
-            if quiz_words.count() < 10:
-                not_studied_words = words.exclude(id__in=UserProgress.objects.filter(
-                    user=request.user
-                ).values_list('word_id', flat=True))
-                
-                # Hala yeterli kelime yoksa, tüm kelimelerden rastgele seç
-                if (quiz_words.count() + not_studied_words.count()) < 10:
-                    available_words = list(quiz_words) + list(not_studied_words)
-                    # Eksik kalan kısmı rastgele kelimelerle doldur
-                    additional_words = list(words.exclude(id__in=[w.id for w in available_words]))
-                    remaining = min(10 - len(available_words), len(additional_words))
-                    if remaining > 0:
-                        available_words += random.sample(additional_words, remaining)
-                    quiz_words = available_words[:10]
-                else:
-                    # Öğrenilmemiş kelimelerden rastgele seç ve ekle
-                    additional_count = min(10 - quiz_words.count(), not_studied_words.count())
-                    additional_words = list(not_studied_words.order_by('?')[:additional_count])
-                    quiz_words = list(quiz_words) + additional_words
+            # Önce tekrar zamanı gelmiş kelimeler, sonra hiç çalışılmamış kelimeler
+            quiz_words = build_review_session(request.user, category=category, size=10)
         else:
             # Giriş yapmamış kullanıcılar için rastgele kelimeler
-            quiz_words = list(words.order_by('?')[:10])
+            quiz_words = sample_words(10, category=category)
+        
+        quiz_words = list(quiz_words)
         
         # Quiz nesnesi oluştur
         quiz = Quiz.objects.create(
@@ -572,12 +528,8 @@ def quiz_start(request, category_id=None, quiz_type='multiple_choice'):
             max_score=len(quiz_words)
         )
         
-        # Quiz soruları oluştur
-        for word in quiz_words:
-            QuizQuestion.objects.create(
-                quiz=quiz,
-                word=word
-            )
+        # Quiz sorularını seçenekleriyle birlikte toplu oluştur
+        create_quiz_questions(quiz, quiz_words)
         
         return redirect('quiz_question', quiz_id=quiz.id, question_number=1)
     except Exception as e:
@@ -599,28 +551,24 @@ def quiz_start_category(request, category_id):
             messages.error(request, "Quiz oluşturmak için yeterli kelime yok. En az 4 kelime gerekiyor.")
             return redirect('dashboard')
         
+        # Önce tekrar zamanı gelmiş, sonra yeni kelimeler - en fazla 10 kelime
+        quiz_words = build_review_session(request.user, category=category, size=10)
+        
+        # Quiz sorusu eklenebilecek mi kontrol et
+        if not quiz_words:
+            messages.error(request, "Quiz soruları oluşturulamadı. Lütfen daha sonra tekrar deneyin.")
+            return redirect('dashboard')
+        
         # Quiz oluştur
         quiz = Quiz.objects.create(
             user=request.user,
             category=category,
             quiz_type='multiple_choice',  # Quiz tipini belirt
-            max_score=min(words.count(), 10)  # En fazla 10 soru
+            max_score=len(quiz_words)  # En fazla 10 soru
         )
         
-        # Soruları oluştur - en fazla 10 kelime
-        quiz_words = list(words.order_by('?')[:10])
-        
-        for word in quiz_words:
-            QuizQuestion.objects.create(
-                quiz=quiz,
-                word=word
-            )
-        
-        # Quiz sorusu eklenebildi mi kontrol et
-        if quiz.questions.count() == 0:
-            quiz.delete()
-            messages.error(request, "Quiz soruları oluşturulamadı. Lütfen daha sonra tekrar deneyin.")
-            return redirect('dashboard')
+        # Soruları seçenekleriyle birlikte toplu oluştur
+        create_quiz_questions(quiz, quiz_words)
         
         # İlk soruya yönlendir
         return redirect('quiz_question', quiz_id=quiz.id, question_number=1)
@@ -650,7 +598,7 @@ def quiz_question(request, quiz_id, question_number):
         question_number = 1
     
     # Soru numarası geçerli aralıkta değilse düzelt
-    total_questions = quiz.questions.count()
+    total_questions = quiz.max_score
     
     if total_questions == 0:
         messages.error(request, "Bu quiz için soru bulunmuyor.")
@@ -663,33 +611,25 @@ def quiz_question(request, quiz_id, question_number):
         question_number = total_questions
         return redirect('quiz_question', quiz_id=quiz.id, question_number=question_number)
     
-    # Soru nesnesini getir (0 tabanlı indeks için -1)
-    try:
-        question = quiz.questions.all()[question_number - 1]
-    except IndexError:
+    # Soru nesnesini (quiz, position) indeksinden getir
+    question = get_quiz_question(quiz, question_number)
+    if question is None:
         messages.error(request, "Quiz sorusu bulunamadı. Lütfen daha sonra tekrar deneyin.")
         return redirect('dashboard')
     
     # Quiz tipine göre yanıt seçenekleri hazırla
-    options = []
-    if quiz.quiz_type == 'multiple_choice':
+    options = list(question.options)
+    if quiz.quiz_type == 'multiple_choice' and not options:
+        # Seçenekleri önceden hazırlanmamış eski sorular için
         # Doğru cevap
         correct_word = question.word
-        options.append(correct_word)
+        options.append({'id': correct_word.id, 'english': correct_word.english, 'turkish': correct_word.turkish})
         
-        # Diğer yanlış seçenekler (aynı kategoriden)
-        category_words = Word.objects.filter(category=correct_word.category).exclude(id=correct_word.id)
+        # Önceden seçilmiş yanlış seçenekler (aynı kategoriden, yetmezse diğer kategorilerden)
+        options.extend(get_distractors([correct_word])[correct_word.id])
         
-        # Kategori kelimeleri yeterli değilse, diğer kategorilerden ekle
-        if category_words.count() < 3:
-            other_words = Word.objects.exclude(category=correct_word.category).exclude(id=correct_word.id)
-            wrong_options = list(category_words) + list(other_words.order_by('?')[:3-category_words.count()])
-        else:
-            wrong_options = list(category_words.order_by('?')[:3])
-        
-        options.extend(wrong_options)
-        # Seçenekleri karıştır
-        random.shuffle(options)
+        # Seçenekleri karıştır (sayfa yenilendiğinde aynı sıra korunur)
+        random.Random(question.id).shuffle(options)
     
     context = {
         'quiz': quiz,
@@ -713,75 +653,19 @@ def quiz_answer(request, quiz_id, question_number):
     if quiz.user != request.user:
         return redirect('home')
     
-    # Soru nesnesini getir
-    total_questions = quiz.questions.count()
-    if 1 <= question_number <= total_questions:
-        question = quiz.questions.all()[question_number - 1]
-        
-        # Kullanıcı cevabını al
-        user_answer = request.POST.get('answer', '')
-        question.user_answer = user_answer
-        
-        # Cevabı kontrol et
-        is_correct = False
-        if quiz.quiz_type == 'multiple_choice':
-            # Çoktan seçmeli soru için cevap kontrolü
-            selected_word_id = int(user_answer) if user_answer.isdigit() else 0
-            is_correct = (selected_word_id == question.word.id)
-        elif quiz.quiz_type == 'writing':
-            # Yazma sorusu için cevap kontrolü
-            is_correct = user_answer.lower().strip() == question.word.turkish.lower().strip()
-        
-        # Sonucu kaydet
-        question.is_correct = is_correct
-        question.save()
-        
-        if is_correct:
-            quiz.score += 1
-            quiz.save()
-        
-        # İlerleme kaydını güncelle
-        progress, created = UserProgress.objects.get_or_create(
-            user=request.user,
-            word=question.word,
-            defaults={'proficiency_level': 1 if is_correct else 0}
-        )
-        
-        if not created:
-            # Doğru cevap verildiyse ilerleme seviyesini artır (maksimum 5)
-            if is_correct and progress.proficiency_level < 5:
-                progress.proficiency_level += 1
-            # Yanlış cevap verildiyse ilerleme seviyesini azalt (minimum 0)
-            elif not is_correct and progress.proficiency_level > 0:
-                progress.proficiency_level -= 1
-            
-            progress.times_reviewed += 1
-            progress.is_mastered = (progress.proficiency_level >= 5)
-            progress.save()
+    # Tamamlanmış quiz'e gelen tekrar gönderimleri sonuç sayfasına yönlendir
+    if quiz.completed:
+        return redirect('quiz_result', quiz_id=quiz.id)
+    
+    # Soru nesnesini (quiz, position) indeksinden getir
+    total_questions = quiz.max_score
+    question = get_quiz_question(quiz, question_number) if 1 <= question_number <= total_questions else None
+    if question is not None:
+        # Cevabı, skoru, kelime ilerlemesini ve (son soruysa) deneyim puanını tek işlemde kaydet
+        answer_quiz_question(request.user, quiz, question, request.POST.get('answer', ''))
         
-        # Son soruya geldiyse quiz'i tamamla
+        # Son soruya geldiyse sonuç sayfasına git
         if question_number == total_questions:
-            quiz.completed = True
-            quiz.save()
-            
-            # Kullanıcı profilini güncelle
-            if hasattr(request.user, 'profile'):
-                profile = request.user.profile
-                # Quiz puanına göre deneyim puanı ekle
-                profile.experience_points += quiz.score * 10
-                
-                # Seviye kontrolü
-                if profile.experience_points >= profile.level * 100:
-                    profile.level += 1
-                    # Seviye yükseltme başarısı ekle
-                    UserAchievement.objects.create(
-                        user=request.user,
-                        title=f"Seviye {profile.level}'e Ulaştın!",
-                        description=f"Tebrikler! Seviye {profile.level}'e yükseldin."
-                    )
-                
-                profile.save()
-            
             return redirect('quiz_result', quiz_id=quiz.id)
         else:
             # Sonraki soruya geç
@@ -961,57 +845,32 @@ def dashboard(request):
     # Toplam kelime sayısı
     total_words = Word.objects.count()
     
+    # Kullanıcının ilerleme özeti (tek satır)
+    stats = get_user_stats(request.user)
+    
     # Öğrenilen kelime sayısı (ilerleme seviyesi 3 ve üzeri)
-    learned_words = UserProgress.objects.filter(
-        user=request.user, 
-        proficiency_level__gte=3
-    ).count()
+    learned_words = stats.learned_words
     
     # Tam öğrenilen kelimeler (ilerleme seviyesi 5)
-    mastered_words = UserProgress.objects.filter(
-        user=request.user, 
-        is_mastered=True
-    ).count()
+    mastered_words = stats.mastered_words
     
     # Çalışılması gereken kelimeler (ilerleme seviyesi 0-2)
-    to_review_words = UserProgress.objects.filter(
-        user=request.user, 
-        proficiency_level__lt=3
-    ).count()
+    to_review_words = stats.to_review_words
     
     # Hiç çalışılmamış kelimeler
-    studied_word_ids = UserProgress.objects.filter(
-        user=request.user
-    ).values_list('word_id', flat=True)
-    not_studied_words = Word.objects.exclude(id__in=studied_word_ids).count()
-    
-    # Kategori bazlı ilerleme
-    categories = Category.objects.all()
-    category_progress = []
-    
-    for category in categories:
-        category_words = Word.objects.filter(category=category).count()
-        learned_in_category = UserProgress.objects.filter(
-            user=request.user,
-            word__category=category,
-            proficiency_level__gte=3
-        ).count()
-        
-        percentage = int((learned_in_category / category_words * 100) if category_words > 0 else 0)
-        
-        category_progress.append({
-            'category': category,
-            'learned': learned_in_category,
-            'total': category_words,
-            'percentage': percentage
-        })
+    not_studied_words = max(total_words - stats.studied_words, 0)
+    
+    # Kategori bazlı ilerleme (tek sorgu)
+    category_progress = get_category_progress(request.user)
     
     # Son 7 günlük aktivite
     last_week_days = [(timezone.now() - timedelta(days=i)).date() for i in range(7, -1, -1)]
     
+    # Gün başlangıcıyla karşılaştırılır ki (user, last_reviewed) indeksi aralık taraması yapabilsin
+    week_start = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=7)
     daily_activity = UserProgress.objects.filter(
         user=request.user,
-        last_reviewed__date__gte=last_week_days[0]
+        last_reviewed__gte=week_start
     ).values('last_reviewed__date').annotate(
         count=Count('id')
     )
@@ -1041,63 +900,95 @@ def dashboard(request):
     
     return render(request, 'core/dashboard.html', context)
 
+PRONUNCIATION_CACHE_CONTROL = 'public, max-age=2592000, immutable'  # 30 gün
+RANGE_PATTERN = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+def _audio_file_response(request, path, etag, filename):
+    """Önbellekteki ses dosyasını ETag, Cache-Control ve Range desteğiyle sunar"""
+    quoted_etag = f'"{etag}"'
+    if quoted_etag in request.headers.get('If-None-Match', ''):
+        response = HttpResponse(status=304)
+        response['ETag'] = quoted_etag
+        response['Cache-Control'] = PRONUNCIATION_CACHE_CONTROL
+        return response
+    
+    size = path.stat().st_size
+    match = RANGE_PATTERN.match(request.headers.get('Range', '').strip())
+    if match and match.group(1) + match.group(2):
+        start, end = match.groups()
+        if start:
+            start = int(start)
+            end = min(int(end), size - 1) if end else size - 1
+        else:
+            # "bytes=-N" son N baytı ister
+            start = max(size - int(end), 0)
+            end = size - 1
+        
+        if start > end or start >= size:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+        
+        with open(path, 'rb') as f:
+            f.seek(start)
+            data = f.read(end - start + 1)
+        response = HttpResponse(data, status=206, content_type='audio/mpeg')
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    else:
+        response = FileResponse(open(path, 'rb'), content_type='audio/mpeg')
+    
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = quoted_etag
+    response['Cache-Control'] = PRONUNCIATION_CACHE_CONTROL
+    response['Content-Disposition'] = f'inline; filename="{filename}.mp3"'
+    return response
+
 def pronunciation_api(request):
     """
     Kelime telaffuzu için API endpoint'i
-    Google Text-to-Speech API kullanarak ses dosyası oluşturur
+    Ses dosyası (metin, dil, yavaş) anahtarıyla disk önbelleğinden sunulur,
+    önbellekte yoksa TTS arka ucuyla bir kez oluşturulur
     """
-    word = request.GET.get('word', '')
-    if not word:
+    word = normalize_text(request.GET.get('word', ''))
+    lang = request.GET.get('lang', DEFAULT_LANG)
+    slow = request.GET.get('slow', '').lower() in ('1', 'true')
+    if not word or len(word) > MAX_TEXT_LENGTH or not LANG_PATTERN.match(lang):
         return HttpResponse(status=400)
     
-    try:
-        # Geçici dosya oluştur
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as temp_file:
-            temp_filename = temp_file.name
-        
-        # Google TTS ile ses dosyası oluştur
-        tts = gTTS(text=word, lang='en', slow=False)
-        tts.save(temp_filename)
-        
-        # Dosyayı oku ve yanıt olarak gönder
-        with open(temp_filename, 'rb') as f:
-            audio_data = f.read()
-        
-        # Geçici dosyayı sil
-        os.unlink(temp_filename)
-        
-        # Ses dosyasını yanıt olarak gönder
-        response = HttpResponse(audio_data, content_type='audio/mpeg')
-        response['Content-Disposition'] = f'inline; filename="{word}.mp3"'
-        return response
-        
-    except Exception as e:
-        logger.error(f"Telaffuz oluşturulurken hata: {str(e)}")
-        return HttpResponse(status=500)
+    # İçerik adresli anahtar ETag olarak kullanılır; önbellek dosyasına dokunmadan 304 dönebilir
+    etag = audio_key(word, lang, slow)
+    if f'"{etag}"' not in request.headers.get('If-None-Match', ''):
+        try:
+            get_audio(word, lang, slow)
+        except Exception as e:
+            logger.error(f"Telaffuz oluşturulurken hata: {str(e)}")
+            return HttpResponse(status=500)
+    
+    filename = re.sub(r'[^\w\-]+', '_', word)
+    return _audio_file_response(request, audio_path(etag), etag, filename)
 
 @login_required
 def learning_paths(request):
     """Tüm öğrenme yollarını göster"""
-    learning_paths = LearningPath.objects.all().order_by('name')
+    # Öğrenme yolları ve kategorileri paylaşımlı önbellekten gelir
+    learning_paths = get_learning_paths()
     
     # Kullanıcının mevcut öğrenme yolu
     user_profile = request.user.profile
-    current_path = user_profile.current_learning_path
+    current_path_id = user_profile.current_learning_path_id
+    
+    # Kullanıcının tamamladığı kategoriler tek sorguda alınır
+    completed_ids = set(UserCategoryProgress.objects.filter(
+        user=request.user,
+        completed=True
+    ).values_list('category_id', flat=True))
     
     # Her öğrenme yolu için ilerleme durumunu hesapla
     paths_progress = []
     
-    for path in learning_paths:
-        # Öğrenme yolundaki kategorileri al
-        path_categories = LearningPathCategory.objects.filter(learning_path=path).order_by('order')
-        total_categories = path_categories.count()
-        
-        # Tamamlanan kategorileri say
-        completed_categories = UserCategoryProgress.objects.filter(
-            user=request.user,
-            category__in=[pc.category for pc in path_categories],
-            completed=True
-        ).count()
+    for path, category_ids in learning_paths:
+        total_categories = len(category_ids)
+        completed_categories = len(completed_ids.intersection(category_ids))
         
         # İlerleme yüzdesi
         percentage = int((completed_categories / total_categories * 100) if total_categories > 0 else 0)
@@ -1107,7 +998,7 @@ def learning_paths(request):
             'total_categories': total_categories,
             'completed_categories': completed_categories,
             'percentage': percentage,
-            'is_current': current_path == path
+            'is_current': current_path_id == path.id
         })
     
     context = {
@@ -1130,61 +1021,47 @@ def learning_path(request, path_id):
         user_profile.save()
     
     # Öğrenme yolundaki kategorileri al
-    path_categories = LearningPathCategory.objects.filter(learning_path=learning_path).order_by('order')
+    path_categories = list(LearningPathCategory.objects.filter(learning_path=learning_path).order_by('order'))
+    category_ids = [pc.category_id for pc in path_categories]
+    
+    # Kelime sayıları ve kullanıcının kategori durumları toplu sorgularla alınır
+    categories = {
+        category.id: category
+        for category in annotate_category_progress(Category.objects.filter(id__in=category_ids), request.user)
+    }
+    states = get_category_states(request.user, category_ids)
     
     # Kategorilerin ilerleme durumunu hesapla
     categories_progress = []
+    newly_unlocked = []
     unlocked = True  # İlk kategori her zaman açık
     
     for pc in path_categories:
-        category = pc.category
+        category = categories[pc.category_id]
+        category_progress = category_state(request.user, category, states)
         
-        # Kategori ilerlemesi
-        try:
-            category_progress = UserCategoryProgress.objects.get(user=request.user, category=category)
-        except UserCategoryProgress.DoesNotExist:
-            # İlk kategori için veya henüz ilerleme kaydı yoksa
-            category_progress = UserCategoryProgress.objects.create(
-                user=request.user,
-                category=category,
-                unlocked=unlocked,
-                completed=False
-            )
-        
-        # Kategori kelimelerini al
-        words = Word.objects.filter(category=category)
-        total_words = words.count()
-        
-        # Öğrenilen kelime sayısını hesapla
-        learned_words = UserProgress.objects.filter(
-            user=request.user,
-            word__category=category,
-            proficiency_level__gte=3
-        ).count()
-        
-        # İlerleme yüzdesi
-        percentage = int((learned_words / total_words * 100) if total_words > 0 else 0)
+        # Yoldaki sıraya göre kilidi açılan kategori kalıcı olarak açılır (yalnızca durum değişiminde yazılır)
+        if unlocked and not category_progress.unlocked:
+            newly_unlocked.append(category.id)
         
         categories_progress.append({
             'category': category,
-            'unlocked': category_progress.unlocked,
+            'unlocked': unlocked or category_progress.unlocked,
             'completed': category_progress.completed,
-            'learned': learned_words,
-            'total': total_words,
-            'percentage': percentage,
+            'learned': category.learned_words,
+            'total': category.total_words,
+            'percentage': calculate_percentage(category.learned_words, category.total_words),
             'required_score': pc.required_score
         })
         
         # Bir sonraki kategorinin kilidinin açık olup olmadığını belirle
         unlocked = category_progress.completed
     
+    unlock_categories(request.user, newly_unlocked)
+    
     # Genel ilerleme
-    total_categories = path_categories.count()
-    completed_categories = UserCategoryProgress.objects.filter(
-        user=request.user,
-        category__in=[pc.category for pc in path_categories],
-        completed=True
-    ).count()
+    total_categories = len(path_categories)
+    completed_categories = sum(1 for item in categories_progress if item['completed'])
     
     overall_progress = int((completed_categories / total_categories * 100) if total_categories > 0 else 0)
     
@@ -1202,74 +1079,35 @@ def learning_category(request, category_id):
     category = get_object_or_404(Category, id=category_id)
     
     # Kullanıcının bu kategoriye erişim izni olup olmadığını kontrol et
-    try:
-        category_progress = UserCategoryProgress.objects.get(user=request.user, category=category)
-        if not category_progress.unlocked:
-            messages.error(request, "Bu kategorinin kilidini açmak için önceki kategorileri tamamlamanız gerekiyor.")
-            return redirect('learning_paths')
-    except UserCategoryProgress.DoesNotExist:
-        messages.error(request, "Bu kategoriye erişim izniniz yok.")
+    unlocked, category_progress = get_category_access(request.user, category)
+    if not unlocked:
+        messages.error(request, "Bu kategorinin kilidini açmak için önceki kategorileri tamamlamanız gerekiyor.")
         return redirect('learning_paths')
     
-        # Kategorinin hangi öğrenme yoluna ait olduğunu bul
-    try:
-        path_category = LearningPathCategory.objects.get(category=category)
+    # Kategorinin hangi öğrenme yoluna ait olduğunu bul; yoksa kullanıcının mevcut yolunu, o da yoksa ilk yolu kullan
+    path_category = LearningPathCategory.objects.select_related('learning_path').filter(category=category).first()
+    if path_category:
         learning_path = path_category.learning_path
-    except LearningPathCategory.DoesNotExist:
-        # Eğer kategori bir öğrenme yoluna ait değilse
-        try:
-            # Kullanıcının mevcut öğrenme yolunu kullan
-            learning_path = request.user.profile.current_learning_path
-            # Eğer mevcut öğrenme yolu da yoksa, ilk öğrenme yolunu al
-            if not learning_path:
-                learning_path = LearningPath.objects.first()
-                if not learning_path:
-                    # Yine de yoksa varsayılan bir öğrenme yolu oluştur
-                    learning_path = LearningPath.objects.create(
-                        name="Temel İngilizce",
-                        description="Temel İngilizce öğrenme yolu"
-                    )
-        except Exception as e:
-            # Son çare olarak ilk öğrenme yolunu al veya oluştur
-            learning_path = LearningPath.objects.first()
-            if not learning_path:
-                learning_path = LearningPath.objects.create(
-                    name="Temel İngilizce",
-                    description="Temel İngilizce öğrenme yolu"
-                )
+    else:
+        profile = getattr(request.user, 'profile', None)
+        learning_path = (profile and profile.current_learning_path) or LearningPath.objects.first()
     
-    # Kategorinin öğrenme adımlarını al
-    learning_steps = LearningStep.objects.filter(category=category).order_by('order')
+    # Kategorinin öğrenme adımları ve kullanıcının adım durumları (tek sorgu)
+    learning_steps = get_learning_steps().get(category.id, [])
+    step_states = get_step_states(request.user, [step.id for step in learning_steps])
     
     # Adımların ilerleme durumunu hesapla
-    steps_progress = []
-    unlocked = True  # İlk adım her zaman açık
-    
-    for step in learning_steps:
-        # Adım ilerlemesi
-        try:
-            step_progress = UserStepProgress.objects.get(user=request.user, learning_step=step)
-        except UserStepProgress.DoesNotExist:
-            # Henüz ilerleme kaydı yoksa
-            step_progress = UserStepProgress.objects.create(
-                user=request.user,
-                learning_step=step,
-                completed=False,
-                score=0,
-                max_score=100
-            )
-        
-        steps_progress.append({
+    steps_progress = [
+        {
             'learning_step': step,
-            'unlocked': unlocked,
+            'unlocked': not locked,
             'completed': step_progress.completed,
             'score': step_progress.score,
             'max_score': step_progress.max_score,
             'percentage': int((step_progress.score / step_progress.max_score * 100) if step_progress.max_score > 0 else 0)
-        })
-        
-        # Bir sonraki adımın kilidinin açık olup olmadığını belirle
-        unlocked = step_progress.completed
+        }
+        for step, step_progress, locked in build_step_list(request.user, learning_steps, step_states)
+    ]
     
     # Kategori ilerleme durumu
     words = Word.objects.filter(category=category)
@@ -1277,7 +1115,7 @@ def learning_category(request, category_id):
     
     learned_words = UserProgress.objects.filter(
         user=request.user,
-        word__category=category,
+        category=category,
         proficiency_level__gte=3
     ).count()
     
@@ -1328,121 +1166,9 @@ def learning_step(request, category_id, step_id):
         
         template = template_map.get(step.step_type, 'core/learning/default.html')
         
-        # SQLite veritabanından kategoriye ait kelimeleri al
-        words = []
-        
-        # Django ORM'den kelimeleri al
-        django_words = Word.objects.filter(category=category)
-        
-        # Eğer kelime sayısı sınırlıysa ve adım türü hazine değilse
-        word_count = step.word_count if hasattr(step, 'word_count') and step.word_count > 0 else 10
-        
-        if django_words.exists():
-            # Word Count değeri 0'dan büyükse, belirtilen sayıda rastgele kelime seç
-            if word_count > 0 and step.step_type != 'final_quiz':
-                import random
-                # Yeterli sayıda kelime varsa rastgele seç, yoksa tümünü al
-                if django_words.count() > word_count:
-                    django_words = random.sample(list(django_words), word_count)
-            
-            # Django modellerini dict'e dönüştür
-            for word in django_words:
-                words.append({
-                    "_id": str(word.id),
-                    "english": word.english,
-                    "turkish": word.turkish,
-                    "definition": word.definition or "",
-                    "example_sentence": word.example_sentence or ""
-                })
-            logger.info(f"Django ORM'den {len(words)} kelime alındı - Kategori: {category.name}")
-        else:
-            # Fallback: Kategori için en az 10 kelime sağla
-            logger.warning(f"Kategori {category.name} için kelime bulunamadı. Manuel kelimeler eklenecek.")
-            
-            # Kategori adına göre birkaç örnek kelime sağla
-            if "yiyecek" in category.name.lower() or "food" in category.name.lower():
-                words = [
-                    {"_id": f"manual_{i}", "english": f"{food[0]}", "turkish": f"{food[1]}", "definition": ""}
-                    for i, food in enumerate([
-                        ("apple", "elma"), ("bread", "ekmek"), ("water", "su"), 
-                        ("milk", "süt"), ("coffee", "kahve"), ("tea", "çay"),
-                        ("egg", "yumurta"), ("cheese", "peynir"), ("meat", "et"),
-                        ("chicken", "tavuk"), ("fish", "balık"), ("rice", "pirinç")
-                    ])
-                ]
-            elif "hayvan" in category.name.lower() or "animal" in category.name.lower():
-                words = [
-                    {"_id": f"manual_{i}", "english": f"{animal[0]}", "turkish": f"{animal[1]}", "definition": ""}
-                    for i, animal in enumerate([
-                        ("dog", "köpek"), ("cat", "kedi"), ("bird", "kuş"), 
-                        ("fish", "balık"), ("rabbit", "tavşan"), ("horse", "at"),
-                        ("cow", "inek"), ("pig", "domuz"), ("sheep", "koyun"), 
-                        ("lion", "aslan"), ("tiger", "kaplan"), ("elephant", "fil")
-                    ])
-                ]
-            else:
-                # Genel kategori için genel kelimeler
-                words = [
-                    {"_id": f"manual_{i}", "english": f"{item[0]}", "turkish": f"{item[1]}", "definition": ""}
-                    for i, item in enumerate([
-                        ("hello", "merhaba"), ("goodbye", "hoşçakal"), ("yes", "evet"), 
-                        ("no", "hayır"), ("thank you", "teşekkür ederim"), ("please", "lütfen"),
-                        ("good", "iyi"), ("bad", "kötü"), ("big", "büyük"),
-                        ("small", "küçük"), ("today", "bugün"), ("tomorrow", "yarın")
-                    ])
-                ]
-            
-            logger.info(f"Manuel {len(words)} kelime eklendi")
-        
-        # Hazine adımı için hariç tutuyoruz
-        if step.step_type == 'treasure':
-            # Hazine adımında kelimeye gerek yok
-            words = []
-        
-        # Kelime formatını düzenle
-        processed_words = []
-        for word in words:
-            word_data = {
-                'id': str(word.get('_id', '')),
-                'english': word.get('english', ''),
-                'turkish': word.get('turkish', ''),
-                'definition': word.get('definition', ''),
-                'example_sentence': word.get('example_sentence', '')
-            }
-            
-            # Çoktan seçmeli sorular için seçenekler ekle
-            if step.step_type in ['multiple_choice', 'final_quiz']:
-                # Yanlış seçenekler için diğer kelimelerden 3 tane seç
-                options = [word_data['turkish']]
-                
-                # Diğer kelimelerden rastgele seç
-                other_words = [w for w in words if w.get('english') != word_data['english']]
-                
-                if len(other_words) >= 3:
-                    import random
-                    
-                    for other_word in random.sample(other_words, 3):
-                        turkish = other_word.get('turkish', '')
-                        
-                        if turkish and turkish not in options:
-                            options.append(turkish)
-                
-                # Yeterli seçenek yoksa, eksik kalan kısmı doldur
-                while len(options) < 4:
-                    fake_option = f"Seçenek {len(options)}"
-                    if fake_option not in options:
-                        options.append(fake_option)
-                
-                # Seçenekleri karıştır
-                random.shuffle(options)
-                word_data['options'] = options
-            
-            processed_words.append(word_data)
-        
-        # Kelime bilgilerini log ile yazdır
+        # Alıştırma (kelimeler ve seçenekler) önbellekteki varyasyonlardan biri olarak gelir
+        processed_words = get_exercise(category, step)
         logger.info(f"Öğrenme adımı için toplam kelime sayısı: {len(processed_words)} - Kategori: {category.name}")
-        if processed_words:
-            logger.info(f"İlk kelime örneği: {processed_words[0]['english']}-{processed_words[0]['turkish']}")
         
         # Adım tipine göre gerekli verileri hazırla
         context = {
@@ -1461,7 +1187,7 @@ def learning_step(request, category_id, step_id):
 @login_required
 def complete_learning_step(request, step_id):
     """Öğrenme adımını tamamla"""
-    learning_step = get_object_or_404(LearningStep, id=step_id)
+    learning_step = get_object_or_404(LearningStep.objects.select_related('category'), id=step_id)
     
     if request.method == 'POST':
         try:
@@ -1469,92 +1195,30 @@ def complete_learning_step(request, step_id):
             score = int(data.get('score', 0))
             max_score = int(data.get('max_score', 100))
             
-            # Adım ilerleme kaydını güncelle
-            step_progress, created = UserStepProgress.objects.get_or_create(
-                user=request.user,
-                learning_step=learning_step,
-                defaults={'completed': False, 'score': 0, 'max_score': max_score}
-            )
-            
-            step_progress.completed = True
-            step_progress.score = score
-            step_progress.max_score = max_score
-            step_progress.completed_at = timezone.now()
-            step_progress.save()
-            
-            # Kategorideki tüm adımların tamamlanıp tamamlanmadığını kontrol et
+            # Adımı tamamla; kategori sayacı artırılır ve tamamlanma sayaçtan anlaşılır
             category = learning_step.category
-            total_steps = LearningStep.objects.filter(category=category).count()
-            completed_steps = UserStepProgress.objects.filter(
-                user=request.user,
-                learning_step__category=category,
-                completed=True
-            ).count()
-            
-            # Tüm adımlar tamamlandıysa kategoriyi tamamla
-            if total_steps == completed_steps:
-                category_progress, created = UserCategoryProgress.objects.get_or_create(
-                    user=request.user,
-                    category=category,
-                    defaults={'unlocked': True}
-                )
-                
-                category_progress.completed = True
-                category_progress.completed_at = timezone.now()
-                category_progress.save()
-                
-                # Bir sonraki kategorinin kilidini aç
-                try:
-                    # Kategorinin hangi öğrenme yoluna ait olduğunu bul
-                    path_category = LearningPathCategory.objects.get(category=category)
-                    learning_path = path_category.learning_path
-                    
-                    # Bir sonraki kategoriyi bul
-                    next_path_category = LearningPathCategory.objects.filter(
-                        learning_path=learning_path,
-                        order__gt=path_category.order
-                    ).order_by('order').first()
-                    
-                    if next_path_category:
-                        next_category_progress, created = UserCategoryProgress.objects.get_or_create(
-                            user=request.user,
-                            category=next_path_category.category,
-                            defaults={'completed': False}
-                        )
-                        
-                        next_category_progress.unlocked = True
-                        next_category_progress.save()
-                        
-                        messages.success(request, f"Tebrikler! {category.name} kategorisini tamamladınız. {next_path_category.category.name} kategorisinin kilidi açıldı.")
-                    else:
-                        messages.success(request, f"Tebrikler! {category.name} kategorisini ve bu öğrenme yolundaki tüm kategorileri tamamladınız.")
-                        
-                except LearningPathCategory.DoesNotExist:
+            if complete_step(request.user, learning_step, score, max_score):
+                # Bir sonraki kategorinin kilidini önbellekteki yol grafiğiyle aç
+                successors = get_path_successors(category.id)
+                if successors is None:
                     messages.success(request, f"Tebrikler! {category.name} kategorisini tamamladınız.")
+                elif successors:
+                    unlock_categories(request.user, successors)
+                    categories = {item.id: item for item in get_categories()}
+                    names = ', '.join(categories[category_id].name for category_id in successors if category_id in categories)
+                    messages.success(request, f"Tebrikler! {category.name} kategorisini tamamladınız. {names} kategorisinin kilidi açıldı.")
+                else:
+                    messages.success(request, f"Tebrikler! {category.name} kategorisini ve bu öğrenme yolundaki tüm kategorileri tamamladınız.")
             
-            # Deneyim puanı ekle
-            user_profile = request.user.profile
-            user_profile.experience_points += score
-            
-            # Seviye atlama kontrolü
-            next_level_exp = user_profile.level * 100
-            if user_profile.experience_points >= next_level_exp:
-                user_profile.level += 1
-                messages.success(request, f"Tebrikler! Seviye {user_profile.level}'e yükseldiniz.")
-                
-                # Başarı ekle
-                UserAchievement.objects.create(
-                    user=request.user,
-                    title=f"Seviye {user_profile.level}",
-                    description=f"Tebrikler! Seviye {user_profile.level}'e yükseldin."
-                )
-            
-            user_profile.save()
+            # Deneyim puanı ekle (seviye atlama kontrolü dahil)
+            new_level = add_experience_points(request.user, score)
+            if new_level:
+                messages.success(request, f"Tebrikler! Seviye {new_level}'e yükseldiniz.")
             
             if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
                 return JsonResponse({'success': True})
             else:
-                return redirect('learning_step', step_id=step_id)
+                return redirect('learning_step', category_id=learning_step.category_id, step_id=step_id)
                 
         except Exception as e:
             logger.error(f"Adım tamamlanırken hata: {str(e)}")
@@ -1562,9 +1226,9 @@ def complete_learning_step(request, step_id):
                 return JsonResponse({'success': False, 'error': str(e)})
             else:
                 messages.error(request, f"Bir hata oluştu: {str(e)}")
-                return redirect('learning_step', step_id=step_id)
+                return redirect('learning_step', category_id=learning_step.category_id, step_id=step_id)
     
-    return redirect('learning_step', step_id=step_id)
+    return redirect('learning_step', category_id=learning_step.category_id, step_id=step_id)
 
 @login_required
 def learning_panel(request):
@@ -1573,53 +1237,8 @@ def learning_panel(request):
         return redirect('login')
     
     try:
-        # Kategorileri sıralı al
-        categories = Category.objects.all().order_by('order', 'difficulty_level', 'name')
-        logger.info(f"Toplam {categories.count()} kategori bulundu")
-        
-        # Kullanıcının ilerleme kayıtlarını al
-        user_progress = {p.category_id: p for p in UserCategoryProgress.objects.filter(user=request.user)}
-        
-        category_status = []
-        unlock_next = True  # İlk kategori her zaman açık
-        for idx, category in enumerate(categories):
-            progress = user_progress.get(category.id)
-            if not progress:
-                progress = UserCategoryProgress.objects.create(user=request.user, category=category, completed=False, unlocked=False)
-            # Sadece ilk kategori veya bir önceki kategori tamamlandıysa açık olsun
-            if idx == 0 or (idx > 0 and categories[idx-1].id in user_progress and user_progress[categories[idx-1].id].completed):
-                progress.unlocked = True
-                progress.save()
-                is_locked = False
-            else:
-                progress.unlocked = False
-                progress.save()
-                is_locked = True
-            # Öğrenme adımlarını al veya oluştur
-            steps = list(LearningStep.objects.filter(category=category).order_by('order'))
-            if not steps:
-                steps = create_default_learning_steps(category)
-            # Adımların tamamlanma ve kilit durumlarını hazırla
-            step_progress_list = []
-            prev_step_completed = True
-            for step in steps:
-                step_progress, _ = UserStepProgress.objects.get_or_create(user=request.user, learning_step=step, defaults={'completed': False})
-                step_data = {
-                    'id': step.id,
-                    'name': step.name,
-                    'type': step.step_type,
-                    'completed': step_progress.completed,
-                    'locked': not prev_step_completed
-                }
-                step_progress_list.append(step_data)
-                prev_step_completed = step_progress.completed
-            category_item = {
-                'category': category,
-                'is_locked': is_locked,
-                'steps': step_progress_list,
-                'progress': progress
-            }
-            category_status.append(category_item)
+        # Kayıt yazmadan, iki toplu sorguyla tüm paneli hesapla
+        category_status = build_learning_panel(request.user)
         return render(request, 'core/learning_panel.html', {
             'category_status': category_status
         })
@@ -1627,62 +1246,6 @@ def learning_panel(request):
         logger.error(f"Öğrenme paneli yüklenirken hata: {str(e)}")
         return render(request, 'core/learning_panel.html', {'category_status': []})
 
-def create_default_learning_steps(category):
-    """Kategori için varsayılan öğrenme adımlarını oluşturur."""
-    
-    # Adım 1: Eşleştirme
-    matching_step = LearningStep.objects.create(
-        category=category,
-        name=f"{category.name} Kelimelerini Öğren",
-        description="Bu adımda kelimeleri ve anlamlarını eşleştirerek öğreneceksiniz.",
-        step_type="matching",
-        order=0,
-        word_count=10
-    )
-    
-    # Adım 2: Yazma alıştırması
-    writing_step = LearningStep.objects.create(
-        category=category,
-        name=f"{category.name} Yazma Alıştırması",
-        description="Bu adımda Türkçe kelimelerin İngilizce karşılıklarını yazacaksınız.",
-        step_type="writing",
-        order=1,
-        word_count=10
-    )
-    
-    # Adım 3: Çoktan seçmeli quiz
-    multiple_choice_step = LearningStep.objects.create(
-        category=category,
-        name=f"{category.name} Çoktan Seçmeli Quiz",
-        description="Bu adımda öğrendiğiniz kelimelerin anlamlarını çoktan seçmeli sorularla pekiştirin.",
-        step_type="multiple_choice",
-        order=2,
-        word_count=10
-    )
-    
-    # Adım 4: Final Quiz
-    final_quiz_step = LearningStep.objects.create(
-        category=category,
-        name=f"{category.name} Final Quiz",
-        description="Bu adımda öğrendiğiniz tüm kelimelerin final sınavını yapacaksınız. 3 yanlış hakkınız var!",
-        step_type="final_quiz",
-        order=3,
-        word_count=0,  # Tüm kelimeler
-        max_mistakes=3  # Maksimum 3 yanlış hakkı
-    )
-    
-    # Hazine sandığı (ödül)
-    treasure_step = LearningStep.objects.create(
-        category=category,
-        name=f"{category.name} Hazinesi",
-        description="Bu kategoriyi tamamlayarak bir hazine kazandınız!",
-        step_type="treasure",
-        order=4,
-        word_count=0
-    )
-    
-    return [matching_step, writing_step, multiple_choice_step, final_quiz_step, treasure_step]
-
 @login_required
 def check_step_completion(request, category_id, step_id):
     """Öğrenme adımının tamamlanma durumunu kontrol eder."""
@@ -1757,52 +1320,25 @@ def check_step_completion(request, category_id, step_id):
         logger.info(f"Başarı yüzdesi: {success_percentage}%, Doğru: {correct_count}, Toplam: {total_questions}")
         
         # Kullanıcı ilerlemesini güncelle
-        # UserProgress yerine UserCategoryProgress kullanıyoruz
-        progress, created = UserCategoryProgress.objects.get_or_create(
-            user=request.user,
-            category=category,
-            defaults={'unlocked': True, 'score': 0, 'max_score': 100}
-        )
-        
-        # İlerlemeyi güncelle
-        step_progress = (step.order + 1) * 25  # Her adım %25
+        step_score = (step.order + 1) * 25  # Her adım %25
         if success_percentage >= success_threshold:  # Başarı şartı
-            progress.score = max(progress.score, step_progress)
-            progress.save()
+            # Adım ve kategori sayacı güncellenir; tüm adımlar tamamlandıysa kategori tamamlanır
+            category_completed = complete_step(request.user, step)
+            progress_score = raise_category_score(request.user, category.id, step_score)
             
-            # Tüm adımlar tamamlandı mı kontrol et
-            total_steps = LearningStep.objects.filter(category=category).count()
-            if step_progress >= (total_steps * 25):
-                progress.completed = True
-                progress.save()
-                
-                # Sonraki kategoriyi aç
-                next_category = Category.objects.filter(difficulty_level__gt=category.difficulty_level).order_by('difficulty_level').first()
+            if category_completed:
+                # Sonraki kategoriyi aç (önbellekteki kategori listesinden)
+                next_category = get_next_category_by_difficulty(category)
                 if next_category:
-                    next_progress, _ = UserCategoryProgress.objects.get_or_create(
-                        user=request.user,
-                        category=next_category,
-                        defaults={'completed': False}
-                    )
-                    next_progress.unlocked = True
-                    next_progress.save()
+                    unlock_categories(request.user, [next_category.id])
                     messages.success(request, f"Tebrikler! {next_category.name} kategorisi açıldı!")
             
-            # Adım tamamlanma durumunu kaydet
-            step_progress, _ = UserStepProgress.objects.get_or_create(
-                user=request.user,
-                learning_step=step,
-                defaults={'completed': False}
-            )
-            step_progress.completed = True
-            step_progress.save()
-            
             return JsonResponse({
                 'success': True,
                 'message': 'Adım başarıyla tamamlandı!',
                 'correct_count': correct_count,
                 'total_questions': total_questions,
-                'progress': progress.score
+                'progress': progress_score
             })
         else:
             return JsonResponse({
@@ -1825,8 +1361,8 @@ def check_step_completion(request, category_id, step_id):
 def quiz_categories(request):
     """Kategorilere göre quiz seçenekleri gösterimi"""
     try:
-        # Tüm kategorileri getir
-        categories = Category.objects.all().order_by('difficulty_level', 'name')
+        # Tüm kategoriler paylaşımlı önbellekten gelir
+        categories = get_categories_by_difficulty()
         
         # Kategori bazında quiz istatistikleri
         category_stats = {}
@@ -1864,11 +1400,8 @@ def quiz_categories(request):
 def game_menu(request):
     """Oyun menüsünü görüntüler"""
     try:
-        # Kullanıcının öğrendiği kelime sayısını al
-        learned_words_count = UserProgress.objects.filter(
-            user=request.user,
-            proficiency_level__gte=3
-        ).count()
+        # Kullanıcının öğrendiği kelime sayısını özet tablodan al
+        learned_words_count = get_user_stats(request.user).learned_words
         
         # Kullanıcının en yüksek skorlarını al
         best_scores = {
@@ -1900,22 +1433,19 @@ def word_guess_game(request):
     """Kelime Tahmin Oyunu (Adam Asmaca)"""
     try:
         # Orta seviye kelimelerden rastgele bir kelime seç
-        words = Word.objects.all()
-        
-        if words.exists():
+        if get_word_ids():
             # Kullanıcının öğrendiği kelimelere öncelik ver
-            learned_words = UserProgress.objects.filter(
+            learned_word_ids = list(UserProgress.objects.filter(
                 user=request.user,
                 proficiency_level__gte=2
-            ).values_list('word_id', flat=True)
+            ).values_list('word_id', flat=True))
             
-            if learned_words.exists():
-                game_words = Word.objects.filter(id__in=learned_words)
-                if game_words.count() < 10:  # Yeterli kelime yoksa
-                    additional_words = words.order_by('?')[:10-game_words.count()]
-                    game_words = list(game_words) + list(additional_words)
+            if learned_word_ids:
+                game_words = list(Word.objects.filter(id__in=learned_word_ids))
+                if len(game_words) < 10:  # Yeterli kelime yoksa
+                    game_words += sample_words(10 - len(game_words), exclude_ids=learned_word_ids)
             else:
-                game_words = words.order_by('?')[:10]
+                game_words = sample_words(10)
         else:
             game_words = []
             messages.warning(request, "Kelime veritabanında hiç kelime bulunamadı.")
@@ -1937,7 +1467,7 @@ def word_hunt_game(request):
     """Kelime Avı Oyunu"""
     try:
         # Tüm kelimelerden rastgele kelimeler seç
-        words = Word.objects.all().order_by('?')[:20]
+        words = sample_words(20)
         
         # Kullanıcının en yüksek skorunu al
         best_score = 0
@@ -1962,23 +1492,12 @@ def word_hunt_game(request):
 def word_puzzle_game(request):
     """Kelime Yapbozu Oyunu"""
     try:
-        # Tüm kelimeleri al
-        all_words = Word.objects.all()
-        
-        # Python ile filtreleme yaparak kısa kelimeleri seç (8 harf veya daha az)
-        short_words = []
-        for word in all_words:
-            if len(word.english) <= 8:
-                short_words.append(word)
-        
-        # Eğer yeterli kısa kelime varsa onlardan rastgele 10 tane seç, yoksa tüm kelimelerden al
-        if len(short_words) >= 10:
-            # Rastgele 10 kelime seç
-            import random
-            words = random.sample(short_words, 10)
+        # Eğer yeterli kısa kelime (8 harf veya daha az) varsa onlardan rastgele 10 tane seç, yoksa tüm kelimelerden al
+        if len(get_word_ids(max_length=8)) >= 10:
+            words = sample_words(10, max_length=8)
         else:
             # Yeterli kısa kelime yoksa tüm kelimelerden rastgele seç
-            words = list(all_words.order_by('?')[:10])
+            words = sample_words(10)
         
         # Kullanıcının en yüksek skorunu al
         best_score = 0
@@ -2003,22 +1522,21 @@ def word_puzzle_game(request):
 def speed_quiz_game(request):
     """Zamana Karşı Çoktan Seçmeli Test"""
     try:
-        # Tüm kelimelerden rastgele kelimeler seç
-        all_words = Word.objects.all()
+        # Tüm kelimelerden rastgele 10 kelime seç
+        quiz_words = sample_words(10)
         
-        if all_words.exists():
-            # Rastgele 10 kelime seç
-            quiz_words = all_words.order_by('?')[:10]
+        if quiz_words:
+            # Her kelime için önceden seçilmiş 3 yanlış seçeneği al
+            distractors = get_distractors(quiz_words)
             
-            # Her kelime için 3 yanlış seçenek oluştur
             quiz_data = []
             
             for word in quiz_words:
                 # Doğru cevap
                 correct_option = word.turkish
                 
-                # Yanlış seçenekler (başka kelimelerden)
-                wrong_options = list(all_words.exclude(id=word.id).values_list('turkish', flat=True).order_by('?')[:3])
+                # Yanlış seçenekler
+                wrong_options = [option['turkish'] for option in distractors[word.id]]
                 
                 # Tüm seçenekleri birleştir ve karıştır
                 options = [correct_option] + wrong_options
@@ -2066,35 +1584,20 @@ def update_game_score(request):
             if game_type not in valid_game_types:
                 return JsonResponse({'error': 'Geçersiz oyun türü'}, status=400)
             
-            # Kullanıcının mevcut en yüksek skorunu kontrol et
-            game_score, created = GameScore.objects.get_or_create(
-                user=request.user,
-                game_type=game_type,
-                defaults={'best_score': score}
-            )
-            
-            # Mevcut skor, en yüksek skordan büyükse güncelle
-            if not created and score > game_score.best_score:
-                game_score.best_score = score
-                game_score.save()
-                
-                return JsonResponse({
-                    'success': True,
-                    'message': 'En yüksek puanınız güncellendi!',
-                    'best_score': score
-                })
+            # En yüksek skor ve günlük/haftalık liderlik satırları tek seferde güncellenir
+            best_score, improved, created = record_score(request.user, game_type, int(score))
+
+            if improved:
+                message = 'En yüksek puanınız güncellendi!'
             elif created:
-                return JsonResponse({
-                    'success': True,
-                    'message': 'İlk puanınız kaydedildi!',
-                    'best_score': score
-                })
+                message = 'İlk puanınız kaydedildi!'
             else:
-                return JsonResponse({
-                    'success': True,
-                    'message': 'Puanınız kaydedildi ama en yüksek puanınızı geçemediniz.',
-                    'best_score': game_score.best_score
-                })
+                message = 'Puanınız kaydedildi ama en yüksek puanınızı geçemediniz.'
+            return JsonResponse({
+                'success': True,
+                'message': message,
+                'best_score': best_score
+            })
         else:
             return JsonResponse({'error': 'Sadece POST metodu desteklenir'}, status=405)
     except Exception as e:
@@ -2136,7 +1639,7 @@ def chat_practice(request):
 @login_required
 @csrf_exempt
 def chat_practice_send_message(request):
-    """Kullanıcı mesajını alır ve yapay zeka yanıtı döner"""
+    """Kullanıcı mesajını alır ve yapay zeka yanıtı için iş kimliği döner"""
     if request.method != 'POST':
         return JsonResponse({'error': 'Sadece POST metodu desteklenir'}, status=405)
     
@@ -2147,60 +1650,23 @@ def chat_practice_send_message(request):
         if not user_message:
             return JsonResponse({'error': 'Mesaj boş olamaz'}, status=400)
         
-        # Kullanıcı mesajını veritabanına kaydet
-        ChatMessage.objects.create(
-            user=request.user,
-            text=user_message,
-            sender='user'
-        )
-        
-        # Kullanıcının ilerleme bilgilerini al
-        progress = ChatPracticeProgress.objects.get(user=request.user)
-        
-        # Son mesajları al (bağlam için)
-        recent_messages = ChatMessage.objects.filter(user=request.user).order_by('-timestamp')[:6]
-        conversation_history = []
-        
-        for msg in reversed(list(recent_messages)):
-            conversation_history.append({
-                'role': 'user' if msg.sender == 'user' else 'model',
-                'content': msg.text
-            })
-        
-        # Yapay zeka yanıtı al
-        ai_response = get_ai_response(user_message, conversation_history, progress)
-        
-        # Yapay zeka yanıtını veritabanına kaydet
-        ChatMessage.objects.create(
-            user=request.user,
-            text=ai_response,
-            sender='ai'
-        )
-        
-        # Doğru/Yanlış değerlendirmesini kontrol et
-        is_correct = '[DOĞRU]' in ai_response or '[CORRECT]' in ai_response
-        is_wrong = '[YANLIŞ]' in ai_response or '[INCORRECT]' in ai_response
+        # Kullanıcı mesajını kaydet ve önbellekteki sohbet bağlamına ekle
+        state = start_chat_turn(request.user.id, user_message)
         
-        # İlerlemeyi güncelle
-        if is_correct or is_wrong:
-            progress.total_attempts += 1
-            if is_correct:
-                progress.correct_answers += 1
-            progress.save()
-        
-        # Etiketleri kaldır
-        ai_response = ai_response.replace('[DOĞRU]', '').replace('[YANLIŞ]', '')
-        ai_response = ai_response.replace('[CORRECT]', '').replace('[INCORRECT]', '')
+        # Yapay zeka yanıtı arka planda hazırlanır; istemci iş kimliğiyle sonucu sorgular
+        try:
+            job_id = submit_job(
+                request.user.id, complete_chat_turn,
+                request.user.id, user_message, list(state.history), state.prompt_prefix
+            )
+        except QueueFull:
+            return JsonResponse({'error': 'Yapay zeka servisi şu anda çok yoğun. Lütfen biraz sonra tekrar deneyin.'}, status=503)
         
         return JsonResponse({
             'success': True,
-            'response': ai_response,
-            'progress': {
-                'correct_answers': progress.correct_answers,
-                'total_attempts': progress.total_attempts,
-                'streak': progress.streak
-            }
-        })
+            'job_id': job_id,
+            'status': 'pending'
+        }, status=202)
         
     except Exception as e:
         logger.error(f"Chat Practice mesaj gönderilirken hata: {str(e)}")
@@ -2235,7 +1701,11 @@ def chat_practice_settings(request):
         if not created:
             progress.english_level = english_level
             progress.practice_mode = practice_mode
-            progress.save()
+            # Sayaçlar F() ile artırıldığı için yalnızca ayar alanları yazılır
+            progress.save(update_fields=['english_level', 'practice_mode'])
+        
+        # Önbellekteki sohbet bağlamını sil; yeni ayarlarla veritabanından yeniden oluşturulur
+        reset_conversation(request.user.id)
         
         return JsonResponse({'success': True})
         
@@ -2243,15 +1713,61 @@ def chat_practice_settings(request):
         logger.error(f"Chat Practice ayarları güncellenirken hata: {str(e)}")
         return JsonResponse({'error': str(e)}, status=500)
 
-@login_required
-def chat_practice_api(request):
-    """ChatPractice API endpoint'i"""
+def async_login_required(view_func):
+    """login_required'ın async görünümler için sürümü (Django 4.2'deki decorator async görünümleri sarmalayamaz)"""
+    @wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        is_authenticated = await sync_to_async(lambda: request.user.is_authenticated)()
+        if not is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        return await view_func(request, *args, **kwargs)
+    return wrapper
+
+@async_login_required
+async def chat_practice_stream(request):
+    """
+    Kullanıcı mesajını alır ve yapay zeka yanıtını Server-Sent Events olarak akıtır.
+    ASGI altında bekleme olay döngüsünde yapılır; tek işçi çok sayıda sohbeti taşıyabilir.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Sadece POST metodu desteklenir'}, status=405)
+    
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({'error': 'Geçersiz istek'}, status=400)
+    
+    user_message = data.get('message', '').strip()
+    if not user_message:
+        return JsonResponse({'error': 'Mesaj boş olamaz'}, status=400)
+    
+    user = request.user
+    
+    async def event_stream():
+        try:
+            async for event, payload in astream_chat_turn(user.id, user_message):
+                if event == 'delta':
+                    yield f"data: {json.dumps({'delta': payload})}\n\n"
+                else:
+                    yield f"event: done\ndata: {json.dumps({'progress': payload})}\n\n"
+        except Exception as e:
+            logger.error(f"Chat Practice akışı sırasında hata: {str(e)}")
+            yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+    
+    response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # nginx tamponlamasını kapat
+    return response
+
+@async_login_required
+async def chat_practice_api(request):
+    """ChatPractice API endpoint'i (async)"""
     try:
         action = request.GET.get('action')
         
         if action == 'initial_message':
-            # İlk karşılama mesajı
-            progress = ChatPracticeProgress.objects.get(user=request.user)
+            # İlk karşılama mesajı (seviye ve mod önbellekteki sohbet bağlamından okunur)
+            state = await sync_to_async(load_conversation)(request.user.id)
             
             # Seviyeye göre farklı karşılama mesajları
             welcome_messages = {
@@ -2264,23 +1780,19 @@ def chat_practice_api(request):
             }
             
             # Moda göre farklı başlangıç mesajları
-            mode_message = "konuşma" if progress.practice_mode == "konuşma" else "kelime"
+            mode_message = "konuşma" if state.practice_mode == "konuşma" else "kelime"
             mode_specific = {
                 'konuşma': "Şu anda konuşma modundasın. Seninle sohbet ederek İngilizce pratik yapacağız. Cevaplarını değerlendirip geri bildirim vereceğim.",
                 'kelime': "Şu anda kelime modundasın. Sana İngilizce kelimeler soracağım ve anlamlarını bilip bilmediğini kontrol edeceğim. Doğru cevaplarında o kelimeyle ilgili daha fazla bilgi sunacağım."
             }
             
-            welcome_message = welcome_messages.get(progress.english_level, welcome_messages['B1'])
-            mode_info = mode_specific.get(progress.practice_mode, mode_specific['konuşma'])
+            welcome_message = welcome_messages.get(state.english_level, welcome_messages['B1'])
+            mode_info = mode_specific.get(state.practice_mode, mode_specific['konuşma'])
             
             initial_message = f"{welcome_message}\n\n{mode_info}"
             
-            # Mesajı veritabanına kaydet
-            ChatMessage.objects.create(
-                user=request.user,
-                text=initial_message,
-                sender='ai'
-            )
+            # Mesajı kaydet ve bağlama ekle
+            await sync_to_async(add_ai_message)(request.user.id, initial_message)
             
             return JsonResponse({
                 'success': True,
@@ -2289,23 +1801,38 @@ def chat_practice_api(request):
             
         elif action == 'hint':
             # İpucu iste
-            # Son AI mesajını al
-            last_ai_message = ChatMessage.objects.filter(
-                user=request.user,
-                sender='ai'
-            ).order_by('-timestamp').first()
+            # Son AI mesajını bağlamdan al
+            state = await sync_to_async(load_conversation)(request.user.id)
             
-            if not last_ai_message:
+            if not state.last_ai_message:
                 return JsonResponse({'error': 'İpucu istenecek bir soru bulunamadı'}, status=404)
             
             # İpucu oluştur
-            hint = generate_hint(last_ai_message.text)
+            hint = await agenerate_hint(state.last_ai_message, state.english_level, state.practice_mode)
             
             return JsonResponse({
                 'success': True,
                 'hint': hint
             })
             
+        elif action == 'hint_stats':
+            # İpucu önbelleği isabet/ıskalama sayaçları (bu işçi süreci için, sadece yöneticiler)
+            if not request.user.is_staff:
+                return JsonResponse({'error': 'Yetkisiz erişim'}, status=403)
+            return JsonResponse({'success': True, 'stats': hint_cache.stats()})
+            
+        elif action == 'job_status':
+            # Arka planda hazırlanan yapay zeka yanıtının durumu
+            job = await sync_to_async(get_job)(request.GET.get('job_id', ''), request.user.id)
+            if job is None:
+                return JsonResponse({'error': 'İş bulunamadı'}, status=404)
+            
+            if job['status'] == 'done':
+                return JsonResponse({'success': True, 'status': 'done', **job['result']})
+            if job['status'] == 'error':
+                return JsonResponse({'error': job['error'], 'status': 'error'}, status=500)
+            return JsonResponse({'success': True, 'status': 'pending'})
+            
         else:
             return JsonResponse({'error': 'Geçersiz eylem'}, status=400)
             
@@ -2313,193 +1840,6 @@ def chat_practice_api(request):
         logger.error(f"Chat Practice API hatası: {str(e)}")
         return JsonResponse({'error': str(e)}, status=500)
 
-def get_ai_response(user_message, conversation_history, progress):
-    """Yapay zeka API'sinden yanıt al"""
-    global last_request_time
-    
-    # API anahtarı kontrolü
-    if not GEMINI_API_KEY:
-        return "API anahtarı eksik. Lütfen sistem yöneticisiyle iletişime geçin."
-    
-    # İki istek arasında minimum süre kontrolü
-    current_time = time.time() * 1000  # milisaniye cinsinden
-    time_elapsed = current_time - last_request_time
-    
-    if time_elapsed < REQUEST_THROTTLE_MS:
-        wait_time = REQUEST_THROTTLE_MS - time_elapsed
-        time.sleep(wait_time / 1000)  # saniye cinsinden bekle
-    
-    # Son istek zamanını güncelle
-    last_request_time = time.time() * 1000
-    
-    # Seviye açıklamaları
-    level_descriptions = {
-        'A1': 'başlangıç - temel kelimeler ve basit cümleler',
-        'A2': 'temel - günlük konuşmalar ve basit ifadeler',
-        'B1': 'orta - günlük konuşma ve genel konular',
-        'B2': 'orta-üst - akıcı konuşma ve soyut konular',
-        'C1': 'ileri - karmaşık konular ve akademik dil',
-        'C2': 'profesyonel - anadil seviyesine yakın akıcılık'
-    }
-    
-    # Kelime modu için örnek kelimeler (seviyeye göre)
-    example_words = {
-        'A1': ['cat', 'dog', 'house', 'book', 'friend', 'school', 'water', 'food'],
-        'A2': ['weather', 'hobby', 'holiday', 'travel', 'restaurant', 'shopping', 'email'],
-        'B1': ['environment', 'experience', 'technology', 'culture', 'education'],
-        'B2': ['controversy', 'perspective', 'sustainability', 'innovation', 'consequence'],
-        'C1': ['ambiguity', 'phenomenon', 'paradigm', 'discourse', 'ideology'],
-        'C2': ['nuance', 'dichotomy', 'juxtaposition', 'quintessential', 'idiosyncrasy']
-    }
-    
-    # Kullanıcı cevabını değerlendirmek için ek prompt
-    evaluation_prompt = "kelime" if progress.practice_mode == 'kelime' else "konuşma"
-    eval_prompts = {
-        "kelime": "Kullanıcının cevabı doğru mu değerlendir. Kelimenin SADECE Türkçe anlamını sorduğunda, kullanıcı sadece Türkçe anlamını yazmışsa kabul et, cümle kurmasını ASLA isteme. Örneğin \"cat\" için \"kedi\" cevabı yeterlidir. Cevabın başında [DOĞRU] veya [YANLIŞ] etiketi kullan, ardından açıklama yap. Doğru cevaptan sonra MUTLAKA YENİ BİR KELİME sor, aynı kelime üzerinde durmaya devam etme.",
-        "konuşma": "Kullanıcının İngilizce cevabını değerlendir. Değerlendirmeni İNGİLİZCE olarak yap. Cevabın başında [CORRECT] veya [INCORRECT] etiketi kullan, ardından varsa hataları düzelt. Sonra konuşmaya İNGİLİZCE olarak devam et ve yeni bir soru sor. Kullanıcı konuşmayı bitirmek isterse o zaman Türkçe konuş."
-    }
-    
-    # Prompt oluştur
-    prompt = f"""Sen profesyonel bir İngilizce öğretmeni ve dil arkadaşısın. Kullanıcı Türk ve İngilizce pratik yapmak istiyor.
-
-Kullanıcının İngilizce seviyesi: {progress.english_level} ({level_descriptions.get(progress.english_level, 'orta seviye')}).
-Uygulama modu: {progress.practice_mode}.
-
-ÇOK ÖNEMLİ KURALLAR:
-
-1. Eğer mod "kelime" ise:
-   - İngilizce seviyeye uygun bir kelime seç. İşte {progress.english_level} seviyesi için örnek kelimeler: {', '.join(example_words.get(progress.english_level, example_words['B1'])[:5])}
-   - Kullanıcıya kelimenin Türkçesini sor (örnek: "What is the meaning of 'cat' in Turkish?")
-   - Kullanıcı sadece Türkçe anlamını yazdıysa (örn. "kedi") bu cevabı kabul et ve DOĞRU olarak değerlendir.
-   - ASLA kullanıcıdan cümle kurmasını isteme, sadece kelimenin anlamını sor.
-   - Doğruysa tebrik et ve HEMEN YENİ BİR KELİME sor. Aynı kelime üzerinde durmaya devam etme.
-   - Yanlışsa doğru cevabı açıkla ve yeni bir kelime sor.
-   - Her seferinde farklı kelimeler kullan, tekrar etme.
-   - Çok kısa ve öz cevaplar ver.
-
-2. Eğer mod "konuşma" ise:
-   - Seviyeye uygun günlük bir konuşma sorusu sor (İNGİLİZCE olarak).
-   - Kullanıcının verdiği İngilizce cevabı İNGİLİZCE olarak değerlendir. Değerlendirmen kısa olsun (maksimum 2 cümle).
-   - Değerlendirmeden sonra konuşmaya İNGİLİZCE olarak devam et ve yeni bir soru sor.
-   - KESİNLİKLE ŞART: Eğer kullanıcı sana bir soru sorarsa (örneğin "What about you?", "And you?", "What is your favorite color?", "peki ya sen?", "sen ne düşünüyorsun?", "senin favori rengin ne?"), MUTLAKA bu soruya İNGİLİZCE olarak cevap ver. Soruyu ASLA görmezden gelme.
-   - Kullanıcı senin favori rengin, hayvanın, yemeğin, vb. sorduğunda kesinlikle bir cevap ver. Örneğin "My favorite color is blue." gibi.
-   - Her seferinde farklı konular sor, tekrar etme.
-   - Gerçek bir konuşma gibi akıcı bir diyalog kur, sadece soru soran bir robot gibi davranma.
-   - Kullanıcı "konuşmayı bitir", "görüşürüz", "bye" gibi ifadeler kullanırsa, o zaman Türkçe konuşmaya geç ve vedalaş.
-
-{eval_prompts[evaluation_prompt]}
-
-Şimdi kullanıcının şu mesajına yanıt ver: "{user_message}"
-Cevabın 50 kelimeden az olsun."""
-    
-    # API'ye istek gönder
-    for attempt in range(3):  # 3 deneme hakkı
-        try:
-            # Her denemede kullanılacak model adını belirle
-            model_to_use = ALTERNATIVE_MODELS[attempt % len(ALTERNATIVE_MODELS)]
-            
-            api_url = f"https://generativelanguage.googleapis.com/v1beta/models/{model_to_use}:generateContent"
-            response = requests.post(
-                f"{api_url}?key={GEMINI_API_KEY}",
-                json={
-                    "contents": [
-                        {
-                            "parts": [
-                                {
-                                    "text": prompt
-                                }
-                            ]
-                        }
-                    ],
-                    "generationConfig": {
-                        "temperature": 0.7,
-                        "topK": 40,
-                        "topP": 0.95,
-                        "maxOutputTokens": 1024,
-                    }
-                }
-            )
-            
-            # Yanıt kontrolü
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('candidates') and data['candidates'][0].get('content'):
-                    parts = data['candidates'][0]['content'].get('parts', [])
-                    if parts and 'text' in parts[0]:
-                        return parts[0]['text'].strip()
-                
-                # Geçerli yanıt alınamadıysa
-                logger.error(f"API yanıtı geçersiz format: {response.text}")
-                
-            elif response.status_code == 404:
-                # Model bulunamadı, bir sonraki denemeye geç
-                logger.warning(f"Model bulunamadı: {model_to_use}, bir sonraki model deneniyor...")
-                continue  # Tekrar dene
-                
-            elif response.status_code == 429:
-                # Rate limit aşıldı, bekle ve tekrar dene
-                wait_time = (2 ** attempt) * 2  # Exponential backoff
-                logger.warning(f"API rate limit aşıldı. {wait_time} saniye bekleniyor...")
-                time.sleep(wait_time)
-                continue  # Tekrar dene
-                
-            else:
-                logger.error(f"API hatası: {response.status_code} - {response.text}")
-                
-        except Exception as e:
-            logger.error(f"API isteği başarısız: {str(e)}")
-        
-    # Tüm denemeler başarısız olursa
-    return "Üzgünüm, şu anda yapay zeka servisine erişemiyorum. Lütfen daha sonra tekrar deneyin."
-
-def generate_hint(last_message):
-    """Son mesaja göre ipucu oluştur"""
-    if not GEMINI_API_KEY:
-        return "İpucu oluşturulamadı. API anahtarı eksik."
-    
-    prompt = f"""Son sorduğum soru şu: "{last_message}"
-    
-Bu soru için kullanıcıya yardımcı olacak kısa bir ipucu ver. İpucu 1-2 cümle olsun ve çok fazla bilgi vermesin, sadece yönlendirici olsun. Cevabı direkt söyleme.
-
-İpucu şöyle başlamalı: "İpucu: "
-"""
-    
-    try:
-        # Kullanılacak model
-        model_to_use = ALTERNATIVE_MODELS[0]  # İlk modeli kullan
-        
-        api_url = f"https://generativelanguage.googleapis.com/v1beta/models/{model_to_use}:generateContent"
-        response = requests.post(
-            f"{api_url}?key={GEMINI_API_KEY}",
-            json={
-                "contents": [
-                    {
-                        "parts": [
-                            {
-                                "text": prompt
-                            }
-                        ]
-                    }
-                ],
-                "generationConfig": {
-                    "temperature": 0.7,
-                    "maxOutputTokens": 256,
-                }
-            }
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('candidates') and data['candidates'][0].get('content'):
-                parts = data['candidates'][0]['content'].get('parts', [])
-                if parts and 'text' in parts[0]:
-                    return parts[0]['text'].strip()
-    
-    except Exception as e:
-        logger.error(f"İpucu oluşturulurken hata: {str(e)}")
-    
-    return "İpucu: Soruyu dikkatlice okuyup, anahtar kelimelere odaklanın."
-
 def account_lockout(request):
     """
     Hesap kilitleme sayfasını göster
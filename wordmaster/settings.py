@@ -11,8 +11,10 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
 import os
+import sys
 from pathlib import Path
 from dotenv import load_dotenv
+from django.core.exceptions import ImproperlyConfigured
 
 # .env dosyasını yükle
 load_dotenv()
@@ -123,6 +125,48 @@ DATABASES = {
 
 # MongoDB ayarları kaldırıldı
 
+# Önbellek
+# file (varsayılan): tek sunuculu kurulumlar için disk üzerinde, işçiler arasında paylaşımlı önbellek
+# redis: Redis protokolünü konuşan herhangi bir sunucu (Redis, Valkey, KeyDB...); `redis` paketi gerekir
+# locmem: yalnızca tek süreçli geliştirme/test için (süreç içi, işçiler arasında paylaşılmaz)
+# Katalog sürümleri, sohbet durumu, yapay zeka iş deposu ve hız sınırı sayacı da bu önbellekte tutulur;
+# locmem ile birden fazla işçi çalıştırılırsa diğer işçiler eski veriyi göstermeye devam eder.
+# Yapay zeka hız sınırı kovasının kilidi (cache.add) yalnızca redis'te süreçler arasında atomiktir;
+# çok işçili üretim kurulumlarında redis kullanın (file arka ucunda limit nadiren aşılabilir).
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'file')
+if CACHE_BACKEND == 'locmem' and int(os.environ.get('WEB_CONCURRENCY', 1)) > 1:
+    raise ImproperlyConfigured(
+        'CACHE_BACKEND=locmem birden fazla işçi süreciyle (WEB_CONCURRENCY > 1) kullanılamaz; file veya redis seçin'
+    )
+# manage.py test geliştirme sunucusunun kalıcı önbelleğini (aynı anahtar öneki ve sürüm anahtarlarıyla)
+# paylaşmasın; testler her çalıştırmada boş bir süreç içi önbellekle başlar
+TESTING = len(sys.argv) > 1 and sys.argv[1] == 'test'
+if TESTING:
+    CACHE_BACKEND = 'locmem'
+CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'wordmaster',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('CACHE_LOCATION') or str(BASE_DIR / 'cache'),
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('CACHE_LOCATION') or 'redis://127.0.0.1:6379/1',
+    },
+}
+CACHES = {
+    'default': {
+        **CACHE_BACKENDS[CACHE_BACKEND],
+        'TIMEOUT': int(os.environ.get('CACHE_TIMEOUT', 300)),
+        'KEY_PREFIX': 'wordmaster',
+        'OPTIONS': {'MAX_ENTRIES': 10000} if CACHE_BACKEND != 'redis' else {},
+    }
+}
+CATALOG_CACHE_TIMEOUT = 60 * 60  # Sürümlü katalog anahtarları; değişiklikte anahtar zaten değişir
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -172,6 +216,10 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Telaffuz ses önbelleği ve TTS arka ucu (çevrimdışı testler için core.services.pronunciation.StubBackend)
+PRONUNCIATION_CACHE_DIR = Path(os.environ.get('PRONUNCIATION_CACHE_DIR', MEDIA_ROOT / 'pronunciation'))
+PRONUNCIATION_TTS_BACKEND = os.environ.get('PRONUNCIATION_TTS_BACKEND', 'core.services.pronunciation.GTTSBackend')
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -241,6 +289,28 @@ REST_FRAMEWORK = {
     }
 }
 
+# Yapay zeka (Gemini) istemcisi
+# GEMINI_API_BASE_URL yerel bir sahte sunucuya yönlendirilebilir (manage.py fake_gemini)
+GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY', '')
+GEMINI_API_BASE_URL = os.environ.get('GEMINI_API_BASE_URL', 'https://generativelanguage.googleapis.com/v1beta')
+AI_RATE_LIMIT = int(os.environ.get('AI_RATE_LIMIT', 20))  # Pencere başına istek hakkı (tüm işçiler için)
+AI_RATE_WINDOW = 60  # saniye
+AI_WORKERS = int(os.environ.get('AI_WORKERS', 4))  # Süreç başına eşzamanlı yapay zeka isteği
+AI_QUEUE_SIZE = int(os.environ.get('AI_QUEUE_SIZE', 32))  # Süreç başına bekleyen + çalışan iş sınırı
+AI_REQUEST_TIMEOUT = 30  # saniye
+AI_RETRY_BACKOFF = 1.0  # saniye, jitter'lı üstel bekleme tabanı
+
+# Sohbet mesajı saklama (manage.py archive_chat_messages)
+CHAT_RETENTION_DAYS = 30  # Bu günden eski mesajlar arşivlenir
+CHAT_LIVE_MESSAGE_LIMIT = 500  # Kullanıcı başına canlı tabloda tutulan en fazla mesaj
+CHAT_ARCHIVE_DIR = Path(os.environ.get('CHAT_ARCHIVE_DIR', BASE_DIR / 'chat_archive'))
+
+# Mobil delta senkronizasyonu (manage.py prune_sync_tombstones)
+SYNC_TOMBSTONE_RETENTION_DAYS = 30  # Daha eski since imleçleri 410 ile tam senkronizasyona döner
+
+# Liderlik tablosu (manage.py prune_leaderboard_periods)
+LEADERBOARD_PERIOD_RETENTION_DAYS = 14  # Bu günden önce başlayan günlük/haftalık satırlar silinir
+
 # CORS ayarları
 if DEBUG:
     CORS_ALLOW_ALL_ORIGINS = True